@@ -0,0 +1,44 @@
+from typing import Optional
+from fastapi import Request
+from app.repositories.destination_repository import DestinationRepository
+from app.services.destination_service import DestinationService
+from app.services.scoring_executor import ScoringExecutor
+from app.services.sharded_ranking import ShardedRanker
+
+
+def get_destination_service(request: Request) -> DestinationService:
+    """
+    Get the application-wide destination service.
+
+    The service is created once per worker at startup (see the lifespan
+    handler in ``app.main``) and shared by every router.
+    """
+    return request.app.state.destination_service
+
+
+def get_destination_repository(request: Request) -> DestinationRepository:
+    """
+    Get the application-wide destination repository.
+
+    The repository matches ``settings.DESTINATION_BACKEND`` and is created,
+    together with its connection pool, by the lifespan handler.
+    """
+    return request.app.state.destination_repository
+
+
+def get_scoring_executor(request: Request) -> ScoringExecutor:
+    """
+    Get the application-wide executor for CPU-bound scoring.
+
+    Created by the lifespan handler from the ``SCORING_*`` settings.
+    """
+    return request.app.state.scoring_executor
+
+
+def get_sharded_ranker(request: Request) -> Optional[ShardedRanker]:
+    """
+    Get the process-pool ranker for large candidate sets.
+
+    None unless ``SHARDED_RANKING_MIN_ROWS`` enables sharded ranking.
+    """
+    return request.app.state.sharded_ranker
@@ -1,99 +1,285 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-from app.models.destination import Destination
+import base64
+import binascii
+from bisect import bisect_right
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from app.models.destination import Destination, BulkDestinationRequest
+from app.api.deps import get_destination_service
+from app.services.catalog import Catalog
+from app.services.destination_json import DESTINATION_FIELDS, NDJSON_MEDIA_TYPE, ndjson_chunks
 from app.services.destination_service import DestinationService
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Initialize service
-destination_service = DestinationService()
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+FIELDS_DESCRIPTION = "Comma-separated destination fields to return (e.g. id,latitude,longitude)"
+LIMIT_DESCRIPTION = "Maximum number of destinations per page (all if omitted)"
+CURSOR_DESCRIPTION = f"Resume after the page that returned this {NEXT_CURSOR_HEADER} header"
+
+def _json_response(body: bytes, next_cursor: Optional[str] = None) -> Response:
+    """
+    Wrap pre-encoded destination JSON.
+
+    The records were validated when the catalog was loaded and are encoded
+    from the catalog's fragment cache, so the response skips FastAPI's
+    response model validation and re-encoding.
+    """
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a ``fields=`` projection, rejecting unknown fields with a 400."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in DESTINATION_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown destination fields: {', '.join(unknown)}")
+    return requested
+
+def _encode_cursor(catalog: Catalog, row: int) -> str:
+    """
+    Build the opaque cursor that resumes a listing after a catalog row.
+
+    The cursor holds the row, which stays unambiguous when destination IDs
+    repeat, and the destination ID, which ties it to the catalog content.
+    """
+    token = f"{row}:{catalog.destinations[row].id}"
+    return base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+
+def _decode_cursor(catalog: Catalog, cursor: str) -> int:
+    """
+    Resolve a cursor to the catalog row it resumes after, or fail with a 400.
+
+    A cursor whose row no longer holds the same destination (the catalog
+    was reloaded with different data) is rejected as expired.
+    """
+    try:
+        token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        row_text, _, destination_id = token.partition(":")
+        row = int(row_text)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        row = None
+    if row is None or not 0 <= row < len(catalog) or catalog.destinations[row].id != destination_id:
+        raise HTTPException(status_code=400, detail="Invalid or expired cursor")
+    return row
+
+def _paginate(catalog: Catalog, rows: Sequence[int], cursor: Optional[str],
+              limit: Optional[int]) -> Tuple[Sequence[int], Optional[str]]:
+    """
+    Select one page of a listing in catalog order.
+
+    Keyset pagination: the cursor names the last row of the previous page
+    and the page starts at the first row after it, found by binary search,
+    so deep pages cost the same as the first one.
+
+    Args:
+        catalog: Catalog the rows belong to
+        rows: Ascending catalog rows of the whole listing
+        cursor: Cursor of the previous page, or None for the first page
+        limit: Page size, or None for the rest of the listing
+
+    Returns:
+        Tuple of (page rows, cursor of the next page or None on the last page)
+    """
+    start = bisect_right(rows, _decode_cursor(catalog, cursor)) if cursor else 0
+    if limit is None or start + limit >= len(rows):
+        return rows[start:], None
+    page = rows[start:start + limit]
+    return page, _encode_cursor(catalog, int(page[-1]))
 
 @router.get("/", response_model=List[Destination])
-async def get_all_destinations():
+async def get_all_destinations(
+    limit: Optional[int] = Query(None, ge=1, description=LIMIT_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
-    Get all available destinations.
+    Get all available destinations, optionally paginated and projected.
     """
     try:
-        destinations = destination_service.get_all_destinations()
-        return destinations
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        rows, next_cursor = _paginate(catalog, range(len(catalog)), cursor, limit)
+        return _json_response(catalog.rows_to_json(rows, projection), next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting all destinations: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/export/", response_class=StreamingResponse)
+async def export_destinations(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
+    """
+    Stream the whole catalog as newline-delimited JSON, one destination per line.
+
+    Records are encoded while the response is sent, so the first byte goes
+    out immediately and memory use does not grow with the catalog size.
+    """
+    try:
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        lines = catalog.json_cache.iter_fragments(range(len(catalog)), projection)
+        return StreamingResponse(ndjson_chunks(lines), media_type=NDJSON_MEDIA_TYPE)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting destinations: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/{destination_id}", response_model=Destination)
-async def get_destination_by_id(destination_id: str):
+async def get_destination_by_id(
+    destination_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
     Get a specific destination by ID.
     """
     try:
-        destination = destination_service.get_destination_by_id(destination_id)
-        if not destination:
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        row = catalog.id_index.get(destination_id)
+        if row is None:
             raise HTTPException(status_code=404, detail="Destination not found")
-        return destination
+        if projection is not None:
+            return _json_response(catalog.json_cache.projection(row, projection))
+        return _json_response(catalog.json_cache.fragment(row))
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting destination {destination_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/bulk", response_model=List[Destination])
+async def get_destinations_bulk(
+    request: BulkDestinationRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
+    """
+    Get several destinations by ID in one call (unknown IDs are skipped).
+    """
+    try:
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        return _json_response(catalog.rows_to_json(catalog.id_rows(request.ids), projection))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting destinations in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/search/", response_model=List[Destination])
-async def search_destinations(query: str = Query(..., min_length=1)):
+async def search_destinations(
+    query: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
-    Search destinations by name or country.
+    Search destinations by name, country, description or best time to visit.
     """
     try:
-        destinations = destination_service.search_destinations(query)
-        return destinations
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        return _json_response(catalog.rows_to_json(catalog.search_rows(query, limit), projection))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching destinations: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/continent/{continent}", response_model=List[Destination])
-async def get_destinations_by_continent(continent: str):
+async def get_destinations_by_continent(
+    continent: str,
+    limit: Optional[int] = Query(None, ge=1, description=LIMIT_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
-    Get destinations by continent.
+    Get destinations by continent, optionally paginated and projected.
     """
     try:
-        destinations = destination_service.get_destinations_by_continent(continent)
-        return destinations
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        rows, next_cursor = _paginate(catalog, catalog.field_rows("continent", continent), cursor, limit)
+        return _json_response(catalog.rows_to_json(rows, projection), next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting destinations by continent: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/country/{country}", response_model=List[Destination])
-async def get_destinations_by_country(country: str):
+async def get_destinations_by_country(
+    country: str,
+    limit: Optional[int] = Query(None, ge=1, description=LIMIT_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
-    Get destinations by country.
+    Get destinations by country, optionally paginated and projected.
     """
     try:
-        destinations = destination_service.get_destinations_by_country(country)
-        return destinations
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        rows, next_cursor = _paginate(catalog, catalog.field_rows("country", country), cursor, limit)
+        return _json_response(catalog.rows_to_json(rows, projection), next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting destinations by country: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/popular/", response_model=List[Destination])
-async def get_popular_destinations(limit: int = Query(10, ge=1, le=50)):
+async def get_popular_destinations(
+    limit: int = Query(10, ge=1, le=50),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
     Get top popular destinations.
     """
     try:
-        destinations = destination_service.get_popular_destinations(limit)
-        return destinations
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        rows = catalog.top_popular_rows(np.arange(len(catalog)), limit)
+        return _json_response(catalog.rows_to_json(rows, projection))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting popular destinations: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/budget-friendly/", response_model=List[Destination])
-async def get_budget_friendly_destinations(limit: int = Query(10, ge=1, le=50)):
+async def get_budget_friendly_destinations(
+    limit: int = Query(10, ge=1, le=50),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
     Get budget-friendly destinations.
     """
     try:
-        destinations = destination_service.get_budget_friendly_destinations(limit)
-        return destinations
+        catalog = destination_service.catalog
+        projection = _parse_fields(fields)
+        rows = catalog.top_popular_rows(catalog.budget_friendly_rows(), limit)
+        return _json_response(catalog.rows_to_json(rows, projection))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting budget-friendly destinations: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,22 +1,45 @@
-from fastapi import APIRouter, HTTPException
-from app.models.destination import FilterOptions
+from fastapi import APIRouter, Depends, HTTPException, Response
+from app.models.destination import FilterOptions, FacetCounts, UserFilters
+from app.api.deps import get_destination_service
 from app.services.destination_service import DestinationService
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Initialize service
-destination_service = DestinationService()
-
 @router.get("/options", response_model=FilterOptions)
-async def get_filter_options():
+async def get_filter_options(
+    destination_service: DestinationService = Depends(get_destination_service)
+):
     """
     Get all available filter options for the frontend.
+    
+    Options and their destination counts are computed once per catalog
+    version. The catalog ETag and 304 revalidations are handled by
+    ``ConditionalGetMiddleware``.
     """
     try:
-        filter_options = destination_service.get_filter_options()
-        return filter_options
+        body = destination_service.catalog.get_filter_options_json()
+        headers = {"Cache-Control": f"public, max-age={settings.FILTER_OPTIONS_MAX_AGE_SECONDS}"}
+        return Response(content=body, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error getting filter options: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/facets", response_model=FacetCounts)
+async def get_facet_counts(
+    filters: UserFilters,
+    destination_service: DestinationService = Depends(get_destination_service)
+):
+    """
+    Count how many destinations each filter option would match.
+    
+    Counts of a field apply all the other chosen filters, so the frontend can
+    show the number of results next to every remaining option.
+    """
+    try:
+        return destination_service.get_facet_counts(filters)
+    except Exception as e:
+        logger.error(f"Error getting facet counts: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import CONTENT_TYPE, metrics
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Export request and ranking stage histograms in the Prometheus text format.
+    """
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
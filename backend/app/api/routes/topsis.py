@@ -1,81 +1,486 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+import numpy as np
 from app.models.destination import (
     Destination, UserFilters, TOPSISWeights, 
-    RecommendationRequest, RecommendationResponse
+    RecommendationRequest, RecommendationResponse, RecommendationExportRequest,
+    BatchRecommendationRequest, BatchRecommendationResponse,
+    SessionRankRequest, RankingSessionResponse
 )
+from app.api.deps import (
+    get_destination_service, get_destination_repository, get_scoring_executor, get_sharded_ranker
+)
+from app.repositories.destination_repository import DestinationRepository
+from app.services.catalog import Catalog
+from app.services.destination_json import NDJSON_MEDIA_TYPE, ndjson_chunks
+from app.services.mcdm_engines import MCDMEngine, EngineCapacityError, available_engines, get_engine
 from app.services.destination_service import DestinationService
 from app.services.topsis_service import TOPSISService
+from app.services.ranking_session import RankingSession, RankingSessionStore
+from app.services.recommendation_cache import RecommendationCache
+from app.services.scoring_executor import ScoringExecutor, ScoringQueueFullError
+from app.services.sharded_ranking import ShardedRanker
 from app.core.config import settings
+from app.core.metrics import observe_candidates, span
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Initialize services
-destination_service = DestinationService()
 topsis_service = TOPSISService()
+recommendation_cache = RecommendationCache(
+    max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RECOMMENDATION_CACHE_MAX_BYTES,
+    ttl_seconds=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+    float_quantum=settings.RECOMMENDATION_CACHE_FLOAT_QUANTUM
+)
+ranking_sessions = RankingSessionStore(
+    max_sessions=settings.RANKING_SESSION_MAX_SESSIONS,
+    max_bytes=settings.RANKING_SESSION_MAX_BYTES,
+    ttl_seconds=settings.RANKING_SESSION_TTL_SECONDS
+)
+
+def _weights_dict(weights: Optional[TOPSISWeights]) -> Optional[Dict[str, float]]:
+    """Convert request weights to the dictionary form used by TOPSISService."""
+    if not weights:
+        return None
+    return {
+        "popularity_score": weights.popularity_score,
+        "budget_score": weights.budget_score,
+        "climate_score": weights.climate_score,
+        "activity_score": weights.activity_score,
+        "terrain_score": weights.terrain_score,
+        "safety_score": weights.safety_score,
+        "accessibility_score": weights.accessibility_score
+    }
+
+def _get_engine(name: str) -> MCDMEngine:
+    """Look up the MCDM engine selected by a request."""
+    try:
+        return get_engine(name)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown MCDM engine: {name}")
+
+def _encode_response(response: RecommendationResponse) -> bytes:
+    """Serialize a recommendation response, timed as the serialize stage."""
+    with span("serialize"):
+        return response.model_dump_json().encode()
+
+def _json_response(response: RecommendationResponse) -> Response:
+    """Serialize a recommendation response into an HTTP response."""
+    return Response(content=_encode_response(response), media_type="application/json")
+
+async def _rank_candidates(request: Union[RecommendationRequest, RecommendationExportRequest],
+                           catalog: Catalog, engine: MCDMEngine, scoring_executor: ScoringExecutor,
+                           sharded_ranker: Optional[ShardedRanker] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Filter and rank the catalog for one request.
+    
+    Returns:
+        Tuple of (catalog rows, scores) of the top ``request.max_results``
+        destinations (all matches if None), best first
+    """
+    # Filter destinations based on user preferences
+    candidate_rows = catalog.filter_indices(request.filters)
+    observe_candidates(len(candidate_rows), engine.name)
+    
+    if len(candidate_rows) == 0:
+        return candidate_rows, np.empty(0)
+    
+    k = request.max_results or len(candidate_rows)
+    
+    # Rank the precomputed criteria rows of the candidates, off the event loop
+    if (engine.name == "topsis" and sharded_ranker is not None
+            and len(candidate_rows) >= settings.SHARDED_RANKING_MIN_ROWS):
+        # A sharded ranking holds one scoring slot, so it queues and is rejected like any other
+        async with scoring_executor.admit():
+            top_rows, top_scores = await sharded_ranker.rank_top_k(
+                catalog, candidate_rows, k, _weights_dict(request.weights)
+            )
+    else:
+        with span("matrix_build"):
+            decision_matrix = catalog.decision_matrix[candidate_rows]
+        top_rows, top_scores = await scoring_executor.run(
+            engine.rank_top_k,
+            decision_matrix,
+            k,
+            _weights_dict(request.weights)
+        )
+    return candidate_rows[top_rows], top_scores
+
+async def _recommend(request: RecommendationRequest, catalog: Catalog, engine: MCDMEngine,
+                     scoring_executor: ScoringExecutor,
+                     sharded_ranker: Optional[ShardedRanker] = None) -> RecommendationResponse:
+    """Filter and rank destinations for a single recommendation request."""
+    rows, top_scores = await _rank_candidates(request, catalog, engine, scoring_executor, sharded_ranker)
+    
+    # Extract destinations and scores
+    destinations = [catalog.destinations[row] for row in rows]
+    scores = top_scores.tolist()
+    
+    # Use default weights if none provided
+    weights_used = request.weights or TOPSISWeights()
+    
+    logger.info(f"Generated {len(destinations)} recommendations using {engine.name}")
+    
+    return RecommendationResponse(
+        destinations=destinations,
+        scores=scores,
+        total_results=len(destinations),
+        filters_applied=request.filters,
+        weights_used=weights_used,
+        engine=engine.name
+    )
+
+async def _recommend_from_repository(request: RecommendationRequest,
+                                     repository: DestinationRepository, engine: MCDMEngine,
+                                     scoring_executor: ScoringExecutor) -> RecommendationResponse:
+    """
+    Filter and rank destinations through the configured repository.
+    
+    Only the scoring fields of the candidates are fetched for ranking; full
+    documents are loaded for the top results alone.
+    """
+    with span("matrix_build"):
+        candidate_ids, decision_matrix = await repository.scoring_candidates(request.filters)
+    observe_candidates(len(candidate_ids), engine.name)
+    
+    top_rows, top_scores = await scoring_executor.run(
+        engine.rank_top_k, decision_matrix, request.max_results, _weights_dict(request.weights)
+    )
+    
+    # Skip results deleted between the two reads
+    found = {
+        destination.id: destination
+        for destination in await repository.get_many([candidate_ids[row] for row in top_rows])
+    }
+    results = [
+        (found[candidate_ids[row]], score) for row, score in zip(top_rows, top_scores.tolist())
+        if candidate_ids[row] in found
+    ]
+    
+    logger.info(f"Generated {len(results)} recommendations using {engine.name} from the repository")
+    
+    return RecommendationResponse(
+        destinations=[destination for destination, _ in results],
+        scores=[score for _, score in results],
+        total_results=len(results),
+        filters_applied=request.filters,
+        weights_used=request.weights or TOPSISWeights(),
+        engine=engine.name
+    )
 
 @router.post("/recommendations", response_model=RecommendationResponse)
-async def get_recommendations(request: RecommendationRequest):
+async def get_recommendations(
+    request: RecommendationRequest,
+    destination_service: DestinationService = Depends(get_destination_service),
+    repository: DestinationRepository = Depends(get_destination_repository),
+    scoring_executor: ScoringExecutor = Depends(get_scoring_executor),
+    sharded_ranker: Optional[ShardedRanker] = Depends(get_sharded_ranker)
+):
     """
-    Get destination recommendations using TOPSIS algorithm.
+    Get destination recommendations using TOPSIS or another MCDM engine.
     """
     try:
-        # Filter destinations based on user preferences
-        filtered_destinations = destination_service.filter_destinations(request.filters)
-        
-        if not filtered_destinations:
-            return RecommendationResponse(
-                destinations=[],
-                scores=[],
-                total_results=0,
-                filters_applied=request.filters,
-                weights_used=request.weights or TOPSISWeights()
+        engine = _get_engine(request.engine)
+        if settings.DESTINATION_BACKEND != "file":
+            return _json_response(
+                await _recommend_from_repository(request, repository, engine, scoring_executor)
             )
         
-        # Convert weights to dictionary if provided
-        weights_dict = None
-        if request.weights:
-            weights_dict = {
-                "popularity_score": request.weights.popularity_score,
-                "budget_score": request.weights.budget_score,
-                "climate_score": request.weights.climate_score,
-                "activity_score": request.weights.activity_score,
-                "terrain_score": request.weights.terrain_score,
-                "safety_score": request.weights.safety_score,
-                "accessibility_score": request.weights.accessibility_score
-            }
-        
-        # Rank destinations using TOPSIS
-        ranked_results = topsis_service.rank_destinations(
-            filtered_destinations, 
-            weights_dict
+        # Use one catalog version for the whole request, even if a reload swaps it meanwhile
+        catalog = destination_service.catalog
+        
+        # Serve repeated filter/weight combinations from the result cache
+        catalog_version = catalog.version
+        cache_key = recommendation_cache.make_key(request)
+        weights_used = request.weights or TOPSISWeights()
+        cached = recommendation_cache.get(cache_key, catalog_version)
+        if cached is not None:
+            cached_response, body = cached
+            # Equivalent requests share an entry but echo their own filters and weights
+            if cached_response.filters_applied != request.filters or cached_response.weights_used != weights_used:
+                return _json_response(cached_response.model_copy(update={
+                    "filters_applied": request.filters,
+                    "weights_used": weights_used
+                }))
+            return Response(content=body, media_type="application/json")
+        
+        response = await _recommend(request, catalog, engine, scoring_executor, sharded_ranker)
+        body = _encode_response(response)
+        recommendation_cache.put(cache_key, catalog_version, response, body)
+        return Response(content=body, media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except EngineCapacityError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ScoringQueueFullError as e:
+        logger.warning(f"Rejected recommendation request: {e}")
+        raise HTTPException(status_code=503, detail="Too many ranking requests in progress")
+    except Exception as e:
+        logger.error(f"Error generating recommendations: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def _ranked_lines(catalog: Catalog, rows: np.ndarray, scores: np.ndarray) -> Iterator[bytes]:
+    """Yield one ``{"rank", "score", "destination"}`` JSON document per ranked row."""
+    fragments = catalog.json_cache.iter_fragments(rows.tolist())
+    for rank, (score, fragment) in enumerate(zip(scores.tolist(), fragments), start=1):
+        yield b'{"rank":%d,"score":%s,"destination":%s}' % (rank, repr(score).encode(), fragment)
+
+@router.post("/recommendations/stream", response_class=StreamingResponse)
+async def stream_recommendations(
+    request: RecommendationExportRequest,
+    destination_service: DestinationService = Depends(get_destination_service),
+    scoring_executor: ScoringExecutor = Depends(get_scoring_executor),
+    sharded_ranker: Optional[ShardedRanker] = Depends(get_sharded_ranker)
+):
+    """
+    Stream a ranked recommendation list as newline-delimited JSON.
+    
+    Unlike ``/recommendations``, ``max_results`` is unbounded (all matches by
+    default). Ranking completes before the first line is sent, but the
+    destinations are encoded while streaming, so the response never exists
+    as one document in memory.
+    """
+    try:
+        engine = _get_engine(request.engine)
+        catalog = destination_service.catalog
+        rows, scores = await _rank_candidates(request, catalog, engine, scoring_executor, sharded_ranker)
+        logger.info(f"Streaming {len(rows)} recommendations using {engine.name}")
+        return StreamingResponse(
+            ndjson_chunks(_ranked_lines(catalog, rows, scores)), media_type=NDJSON_MEDIA_TYPE
         )
+    except HTTPException:
+        raise
+    except EngineCapacityError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ScoringQueueFullError as e:
+        logger.warning(f"Rejected recommendation stream: {e}")
+        raise HTTPException(status_code=503, detail="Too many ranking requests in progress")
+    except Exception as e:
+        logger.error(f"Error streaming recommendations: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/recommendations/batch", response_model=BatchRecommendationResponse)
+async def get_batch_recommendations(
+    request: BatchRecommendationRequest,
+    destination_service: DestinationService = Depends(get_destination_service),
+    scoring_executor: ScoringExecutor = Depends(get_scoring_executor)
+):
+    """
+    Get destination recommendations for many requests in one pass.
+    
+    Requests that resolve to the same candidate set and engine are scored
+    together; for TOPSIS the candidates' decision matrix is normalized once
+    and all weight profiles are ranked in a single stacked computation.
+    """
+    try:
+        catalog = destination_service.catalog
+        results: List[Optional[RecommendationResponse]] = [None] * len(request.requests)
         
-        # Limit results
-        max_results = min(request.max_results, len(ranked_results))
-        limited_results = ranked_results[:max_results]
+        # Group requests by their filtered candidate set and engine
+        rows_by_filters: Dict[str, np.ndarray] = {}
+        groups: Dict[Tuple[bytes, str], Tuple[np.ndarray, MCDMEngine, List[int]]] = {}
+        for position, item in enumerate(request.requests):
+            engine = _get_engine(item.engine)
+            filters_key = item.filters.model_dump_json()
+            if filters_key not in rows_by_filters:
+                rows_by_filters[filters_key] = catalog.filter_indices(item.filters)
+            candidate_rows = rows_by_filters[filters_key]
+            groups.setdefault(
+                (candidate_rows.tobytes(), engine.name), (candidate_rows, engine, [])
+            )[2].append(position)
         
-        # Extract destinations and scores
-        destinations = [dest for dest, score in limited_results]
-        scores = [score for dest, score in limited_results]
+        for candidate_rows, engine, positions in groups.values():
+            weights_used = [request.requests[p].weights or TOPSISWeights() for p in positions]
+            weight_matrix = np.array([
+                topsis_service.weight_vector(weights.model_dump()) for weights in weights_used
+            ])
+            ranked = await scoring_executor.run(
+                engine.rank_top_k_batch,
+                catalog.decision_matrix[candidate_rows],
+                weight_matrix,
+                [request.requests[p].max_results for p in positions]
+            )
+            
+            for i, position in enumerate(positions):
+                item = request.requests[position]
+                top_rows, top_scores = ranked[i]
+                
+                results[position] = RecommendationResponse(
+                    destinations=[
+                        catalog.destinations[candidate_rows[row]] for row in top_rows
+                    ],
+                    scores=top_scores.tolist(),
+                    total_results=len(top_rows),
+                    filters_applied=item.filters,
+                    weights_used=weights_used[i],
+                    engine=engine.name
+                )
         
-        # Use default weights if none provided
-        weights_used = request.weights or TOPSISWeights()
+        logger.info(
+            f"Generated batch recommendations for {len(results)} requests "
+            f"across {len(groups)} candidate sets"
+        )
         
-        logger.info(f"Generated {len(destinations)} recommendations using TOPSIS")
+        return BatchRecommendationResponse(results=results)
         
-        return RecommendationResponse(
-            destinations=destinations,
-            scores=scores,
-            total_results=len(destinations),
-            filters_applied=request.filters,
-            weights_used=weights_used
+    except HTTPException:
+        raise
+    except EngineCapacityError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ScoringQueueFullError as e:
+        logger.warning(f"Rejected batch recommendation request: {e}")
+        raise HTTPException(status_code=503, detail="Too many ranking requests in progress")
+    except Exception as e:
+        logger.error(f"Error generating batch recommendations: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def _rank_session(session: RankingSession, max_results: int,
+                  weights: Optional[TOPSISWeights]) -> RecommendationResponse:
+    """Re-rank the candidates of a session with the given weights."""
+    top_rows, top_scores = session.rank(max_results, _weights_dict(weights))
+    destinations = session.catalog.rows_to_destinations(top_rows)
+    
+    return RecommendationResponse(
+        destinations=destinations,
+        scores=top_scores.tolist(),
+        total_results=len(destinations),
+        filters_applied=session.filters,
+        weights_used=weights or TOPSISWeights()
+    )
+
+@router.post("/sessions", response_model=RankingSessionResponse)
+async def create_ranking_session(
+    request: RecommendationRequest,
+    destination_service: DestinationService = Depends(get_destination_service)
+):
+    """
+    Start a ranking session for a filter set.
+    
+    The candidates are filtered and normalized once, and their ideal
+    solutions are cached, so ``POST /sessions/{session_id}/rank`` can re-rank
+    them with new weights without repeating that work. Sessions use TOPSIS.
+    
+    The session ID encodes the filters and the catalog content, so any
+    worker can serve it (rebuilding the session if it has not cached it),
+    until the catalog is reloaded.
+    """
+    try:
+        if request.engine != "topsis":
+            raise HTTPException(status_code=400, detail="Ranking sessions support the topsis engine only")
+        
+        # The session data lives in this process, so build and rank it in a thread
+        session = await run_in_threadpool(
+            RankingSession, destination_service.catalog, request.filters, topsis_service
+        )
+        session_id = ranking_sessions.add(session)
+        recommendations = await run_in_threadpool(
+            _rank_session, session, request.max_results, request.weights
+        )
+        
+        return RankingSessionResponse(
+            session_id=session_id,
+            total_candidates=len(session.candidate_rows),
+            recommendations=recommendations
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error generating recommendations: {e}")
+        logger.error(f"Error creating ranking session: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/sessions/{session_id}/rank", response_model=RecommendationResponse)
+async def rank_ranking_session(
+    session_id: str,
+    request: SessionRankRequest,
+    destination_service: DestinationService = Depends(get_destination_service)
+):
+    """
+    Re-rank the candidates of a ranking session with new weights.
+    
+    Returns 404 for unknown IDs and for sessions of a catalog that has since
+    been reloaded; start a new session then.
+    """
+    try:
+        session = await run_in_threadpool(
+            ranking_sessions.get_or_rebuild, session_id, destination_service.catalog, topsis_service
+        )
+        if session is None:
+            raise HTTPException(status_code=404, detail="Ranking session not found or expired")
+        return await run_in_threadpool(_rank_session, session, request.max_results, request.weights)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ranking session {session_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/sessions/{session_id}")
+async def delete_ranking_session(session_id: str):
+    """
+    Free the cached data of a ranking session in this worker.
+    
+    The ID stays usable: a later re-rank rebuilds the session.
+    """
+    try:
+        if not ranking_sessions.delete(session_id):
+            raise HTTPException(status_code=404, detail="Ranking session not found or expired")
+        return {"message": "Ranking session deleted"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting ranking session {session_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/sessions/stats", response_model=Dict[str, Any])
+async def get_session_stats():
+    """
+    Get ranking session counters.
+    """
+    try:
+        return ranking_sessions.stats()
+    except Exception as e:
+        logger.error(f"Error getting session stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """
+    Get recommendation cache counters.
+    """
+    try:
+        return recommendation_cache.stats()
+    except Exception as e:
+        logger.error(f"Error getting cache stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/executor/stats", response_model=Dict[str, Any])
+async def get_executor_stats(
+    scoring_executor: ScoringExecutor = Depends(get_scoring_executor)
+):
+    """
+    Get scoring executor queue depth and job counters.
+    """
+    try:
+        return scoring_executor.stats()
+    except Exception as e:
+        logger.error(f"Error getting executor stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/engines", response_model=Dict[str, str])
+async def get_engines():
+    """
+    Get the available MCDM engines and their descriptions.
+    """
+    try:
+        return available_engines()
+    except Exception as e:
+        logger.error(f"Error getting engines: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/weights", response_model=Dict[str, float])
@@ -91,22 +496,28 @@ async def get_default_weights():
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/test-ranking")
-async def test_topsis_ranking():
+async def test_topsis_ranking(
+    destination_service: DestinationService = Depends(get_destination_service),
+    scoring_executor: ScoringExecutor = Depends(get_scoring_executor)
+):
     """
     Test endpoint to verify TOPSIS algorithm with sample data.
     """
     try:
         # Get all destinations for testing
-        all_destinations = destination_service.get_all_destinations()
+        catalog = destination_service.catalog
+        all_destinations = catalog.get_all_destinations()
         
         if not all_destinations:
             raise HTTPException(status_code=404, detail="No destinations available for testing")
         
-        # Test ranking with default weights
-        ranked_results = topsis_service.rank_destinations(all_destinations)
-        
-        # Return top 5 results for testing
-        test_results = ranked_results[:5]
+        # Test ranking with default weights and return top 5 results
+        top_rows, top_scores = await scoring_executor.run(
+            topsis_service.rank_top_k, catalog.decision_matrix, 5
+        )
+        test_results = [
+            (all_destinations[row], score) for row, score in zip(top_rows, top_scores)
+        ]
         
         return {
             "message": "TOPSIS ranking test successful",
@@ -0,0 +1,171 @@
+import zlib
+from typing import Any, Callable, Dict, Optional, Sequence
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Media types worth compressing; everything served here is JSON or text
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# Body chunks at least this large are compressed in a worker thread rather
+# than on the event loop
+THREAD_MIN_SIZE = 64 * 1024
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Sequence[str]) -> Optional[str]:
+    """
+    Pick the content coding to use for a response.
+
+    Args:
+        accept_encoding: Accept-Encoding request header, if any
+        available: Supported codings, most preferred first
+
+    Returns:
+        The acceptable coding with the highest q-value (ties go to the
+        earlier entry of ``available``), or None to send the body as is
+    """
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _GzipEncoder:
+    """Incremental gzip stream; each chunk is flushed so clients can decode it right away."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+class _BrotliEncoder:
+    """Incremental brotli stream; each chunk is flushed so clients can decode it right away."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip.
+
+    The coding is negotiated from Accept-Encoding, preferring brotli when
+    the package is installed. Complete bodies smaller than ``minimum_size``
+    are sent as is, since compression would not pay for itself; streamed
+    bodies are compressed chunk by chunk. Responses that are already
+    encoded, empty (204/304) or not JSON/text pass through untouched.
+
+    A strong ETag of a compressed response gets a ``-gzip``/``-br``
+    suffix, since its bytes differ from the identity representation;
+    ``ConditionalGetMiddleware`` strips it again when comparing.
+    """
+
+    def __init__(self, app: Callable[..., Any], minimum_size: int = 1024,
+                 gzip_level: int = 6, brotli_quality: int = 4):
+        """
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest complete body that is compressed, in bytes
+            gzip_level: zlib compression level (1-9)
+            brotli_quality: Brotli quality (0-11)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def _encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Dict[str, Any]] = None
+        encoder = None
+
+        async def encode(data: bytes, final: bool) -> bytes:
+            if len(data) >= THREAD_MIN_SIZE:
+                return await anyio.to_thread.run_sync(encoder.encode, data, final)
+            return encoder.encode(data, final)
+
+        async def compress_send(message):
+            nonlocal start_message, encoder
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is None:
+                if encoder is not None:
+                    message = {"type": "http.response.body", "body": await encode(body, not more_body),
+                               "more_body": more_body}
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if (start["status"] in (204, 304) or "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)):
+                await send(start)
+                await send(message)
+                return
+
+            encoder = self._encoder(encoding)
+            body = await encode(body, not more_body)
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                if "content-length" in headers:
+                    del headers["content-length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            etag = headers.get("etag")
+            if etag and etag.endswith('"') and not etag.startswith("W/"):
+                headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, compress_send)
@@ -13,9 +13,19 @@ class Settings(BaseSettings):
     # Database Settings
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "travel_recommendation"
+    MONGODB_COLLECTION: str = "destinations"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_BATCH_SIZE: int = 1000
+    # Where recommendations read destinations from: "file", "memory" or "mongodb"
+    DESTINATION_BACKEND: str = "file"
     
     # File Settings
     DATA_FILE_PATH: str = "data/destinations.json"
+    CATALOG_LOAD_CHUNK_SIZE: int = 10000
+    CATALOG_SNAPSHOT_PATH: str = ""
+    CATALOG_RELOAD_INTERVAL_SECONDS: float = 0.0  # poll the catalog source for changes; 0 disables hot reload
+    DESTINATION_JSON_CACHE_MAX_ROWS: int = 2000000  # keep per-destination JSON for catalogs up to this size
     
     # TOPSIS Settings
     DEFAULT_WEIGHTS: dict = {
@@ -32,6 +42,43 @@ class Settings(BaseSettings):
     MAX_RECOMMENDATIONS: int = 20
     MIN_RECOMMENDATIONS: int = 5
     
+    # Scoring Executor Settings
+    SCORING_EXECUTOR: str = "thread"  # "thread" or "process"
+    SCORING_MAX_WORKERS: int = 4
+    SCORING_MAX_QUEUE: int = 256  # waiting scoring jobs before rejecting with 503; 0 for unbounded
+    
+    # Largest candidate set for engines with O(n^2) pairwise steps (ELECTRE)
+    MCDM_PAIRWISE_MAX_ALTERNATIVES: int = 10000
+    
+    # Rank candidate sets of at least this many rows across a process pool; 0 disables
+    SHARDED_RANKING_MIN_ROWS: int = 0
+    SHARDED_RANKING_WORKERS: int = 0  # 0 for the CPU count
+    
+    # Ranking Session Settings
+    RANKING_SESSION_MAX_SESSIONS: int = 256
+    RANKING_SESSION_MAX_BYTES: int = 256 * 1024 * 1024
+    RANKING_SESSION_TTL_SECONDS: float = 900.0
+    
+    # Browser cache lifetime of the filter options (revalidated with their ETag afterwards)
+    FILTER_OPTIONS_MAX_AGE_SECONDS: int = 60
+    
+    # HTTP Caching and Compression Settings
+    CONDITIONAL_GET_ENABLED: bool = True  # catalog ETags and 304s on the read-only routes
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # smaller responses are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # brotli is used only if the package is installed
+    
+    # Metrics Settings
+    METRICS_ENABLED: bool = True
+    METRICS_SAMPLE_RATE: float = 1.0  # share of requests whose stage timings are recorded
+    
+    # Recommendation Cache Settings
+    RECOMMENDATION_CACHE_MAX_ENTRIES: int = 1024
+    RECOMMENDATION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RECOMMENDATION_CACHE_TTL_SECONDS: float = 300.0
+    RECOMMENDATION_CACHE_FLOAT_QUANTUM: float = 1e-6
+    
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Dict, Optional, Sequence
+from starlette.routing import Match
+
+# Suffixes the compression middleware appends to the ETags of encoded responses
+ENCODING_ETAG_SUFFIXES = ("-gzip", "-br")
+
+# ETag of the catalog currently served, published by DestinationService
+_catalog_etag: Optional[str] = None
+
+
+def make_catalog_etag(digest: Optional[str]) -> Optional[str]:
+    """
+    Derive a strong ETag from the content digest of a catalog.
+
+    The digest hashes the catalog data itself, so every worker, replica or
+    restored copy serving the same data agrees on the ETag, unlike the
+    process-local version counter. Catalogs without a digest get no ETag.
+    """
+    return f'"{digest}"' if digest else None
+
+
+def set_catalog_etag(etag: Optional[str]):
+    """Publish the ETag of the catalog version now being served."""
+    global _catalog_etag
+    _catalog_etag = etag
+
+
+def get_catalog_etag() -> Optional[str]:
+    """Get the ETag of the catalog version now being served, if any."""
+    return _catalog_etag
+
+
+def _strip_encoding(tag: str) -> str:
+    """Map the ETag of a compressed representation back to the uncompressed one."""
+    for suffix in ENCODING_ETAG_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def match_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses the weak comparison required for If-None-Match, and treats the
+    compressed variants of a representation as matching it.
+
+    Returns:
+        The matching tag the client holds (e.g. the ``-br`` variant), to be
+        sent back on the 304, or None if nothing matches
+    """
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if _strip_encoding(tag) == etag:
+            return tag
+    return None
+
+
+class ConditionalGetMiddleware:
+    """
+    ASGI middleware adding catalog ETags and answering revalidations with 304.
+
+    Applies to GET requests under the given path prefixes, whose responses
+    depend only on the URL and the catalog content. A matching
+    If-None-Match is answered before routing, so revalidations never reach
+    the route or ``DestinationService``; the matching route is still looked
+    up and stored in the scope, so ``MetricsMiddleware`` labels the 304 with
+    its route template. Successful responses get the catalog ETag read when
+    the request arrived: if the catalog is swapped meanwhile, the client at
+    worst re-downloads on its next request.
+    """
+
+    def __init__(self, app: Callable[..., Any], paths: Sequence[str]):
+        """
+        Args:
+            app: Wrapped ASGI application
+            paths: Path prefixes of the read-only, catalog-derived routes
+        """
+        self.app = app
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]):
+        etag = _catalog_etag
+        if (scope["type"] != "http" or etag is None or scope["method"] != "GET"
+                or not scope["path"].startswith(self.paths)):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        matched = match_etag(if_none_match, etag)
+        if matched is not None:
+            self._set_route(scope)
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", matched.encode("latin-1")), (b"vary", b"Accept-Encoding")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def etag_send(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = list(message.get("headers", []))
+                if not any(name.lower() == b"etag" for name, _ in headers):
+                    headers.append((b"etag", etag.encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, etag_send)
+
+    @staticmethod
+    def _set_route(scope: Dict[str, Any]):
+        """Record the route a short-circuited request would have reached."""
+        app = scope.get("app")
+        for route in getattr(getattr(app, "router", None), "routes", ()):
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                scope["route"] = child_scope.get("route", route)
+                return
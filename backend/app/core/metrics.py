@@ -0,0 +1,271 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from app.core.config import settings
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the candidate count and request size histogram buckets
+COUNT_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000, 10000000)
+SIZE_BUCKETS = (0, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Whether the current request is sampled; copied into worker threads with the context
+_sampled: ContextVar[bool] = ContextVar("metrics_sampled", default=False)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value or bucket bound for the text exposition format."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Cumulative histogram in the Prometheus data model.
+
+    Each distinct combination of label values keeps its own bucket counts,
+    sum and count. Observations take a lock, so one histogram can be shared
+    by the event loop and worker threads.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float],
+                 label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            *label_values: One value per label name, in order
+        """
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Bucket counts, then the +Inf bucket, sum and count
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[bucket] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        """Render the histogram in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+
+        for label_values, values in sorted(series.items()):
+            labels = [f'{name}="{value}"' for name, value in zip(self.label_names, label_values)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                bucket_labels = ",".join(labels + [f'le="{_format_value(bound)}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = "{" + ",".join(labels) + "}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{suffix} {values[-1]}")
+        return lines
+
+    def clear(self):
+        """Drop all observations."""
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics with request-level sampling.
+
+    ``start_request`` decides once per request whether it is sampled;
+    spans and observations made while handling an unsampled request (or
+    with metrics disabled) return immediately, so the cost of
+    instrumentation is one context variable lookup.
+    """
+
+    def __init__(self, enabled: bool = True, sample_rate: float = 1.0):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self._histograms: Dict[str, Histogram] = {}
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float],
+                  label_names: Sequence[str] = ()) -> Histogram:
+        """Create and register a histogram (or return the one registered under ``name``)."""
+        if name not in self._histograms:
+            self._histograms[name] = Histogram(name, documentation, buckets, label_names)
+        return self._histograms[name]
+
+    def start_request(self) -> bool:
+        """
+        Decide whether the current request is sampled.
+
+        Returns:
+            True if metrics are recorded for the request
+        """
+        sampled = self.enabled and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+        _sampled.set(sampled)
+        return sampled
+
+    @staticmethod
+    def is_sampled() -> bool:
+        """Whether metrics are recorded for the current request."""
+        return _sampled.get()
+
+    def render(self) -> str:
+        """Render all registered metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for histogram in self._histograms.values():
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Drop the observations of all registered metrics."""
+        for histogram in self._histograms.values():
+            histogram.clear()
+
+
+class _Span:
+    """Times a block of code into the stage latency histogram."""
+
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stage_seconds.observe(time.perf_counter() - self.started, self.stage)
+        return False
+
+
+class _NullSpan:
+    """Span used for unsampled requests."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED, sample_rate=settings.METRICS_SAMPLE_RATE)
+
+stage_seconds = metrics.histogram(
+    "travel_stage_duration_seconds",
+    "Time spent in each filter and ranking stage.",
+    LATENCY_BUCKETS,
+    ("stage",)
+)
+request_seconds = metrics.histogram(
+    "travel_request_duration_seconds",
+    "HTTP request latency by route.",
+    LATENCY_BUCKETS,
+    ("method", "route", "status")
+)
+request_size_bytes = metrics.histogram(
+    "travel_request_size_bytes",
+    "HTTP request body size by route.",
+    SIZE_BUCKETS,
+    ("method", "route")
+)
+candidate_count = metrics.histogram(
+    "travel_ranking_candidates",
+    "Destinations left after filtering, per ranked request.",
+    COUNT_BUCKETS,
+    ("engine",)
+)
+
+
+def span(stage: str):
+    """
+    Time a block as one stage of the current request.
+
+    Usage::
+
+        with span("filter"):
+            rows = catalog.filter_indices(filters)
+
+    Args:
+        stage: Stage label (e.g. "filter", "normalize", "serialize")
+    """
+    if _sampled.get():
+        return _Span(stage)
+    return _NULL_SPAN
+
+
+def observe_stage(stage: str, seconds: float):
+    """Record a stage duration measured elsewhere, if the current request is sampled."""
+    if _sampled.get():
+        stage_seconds.observe(seconds, stage)
+
+
+def observe_candidates(count: int, engine: str):
+    """Record the candidate count of a ranked request, if it is sampled."""
+    if _sampled.get():
+        candidate_count.observe(count, engine)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that samples requests and records their latency and body size.
+
+    Requests are labelled with their route template (e.g.
+    ``/api/v1/destinations/{destination_id}``) so path parameters do not
+    create a series per value.
+    """
+
+    def __init__(self, app: Callable[..., Any]):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]):
+        if scope["type"] != "http" or not metrics.start_request():
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        received = 0
+        status = 500
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        async def status_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, status_send)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            request_seconds.observe(time.perf_counter() - started, method, path, str(status))
+            request_size_bytes.observe(received, method, path)
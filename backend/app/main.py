@@ -1,19 +1,79 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
-from app.api.routes import destinations, filters, topsis
+from app.api.routes import destinations, filters, metrics, topsis
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.http_cache import ConditionalGetMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.repositories.destination_repository import InMemoryDestinationRepository
+from app.repositories.mongo_destination_repository import MongoDestinationRepository, create_mongo_client
+from app.services.destination_service import DestinationService
+from app.services.scoring_executor import ScoringExecutor
+from app.services.sharded_ranking import ShardedRanker
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the catalog once per worker and share it across all routers
+    destination_service = DestinationService()
+    app.state.destination_service = destination_service
+    # Ranking sessions of a replaced catalog would keep it in memory
+    destination_service.add_swap_listener(lambda catalog: topsis.ranking_sessions.invalidate(catalog.version))
+    if settings.CATALOG_RELOAD_INTERVAL_SECONDS > 0:
+        destination_service.start_watcher(settings.CATALOG_RELOAD_INTERVAL_SECONDS)
+    
+    # Keep CPU-bound ranking off the event loop
+    app.state.scoring_executor = ScoringExecutor(
+        settings.SCORING_EXECUTOR,
+        settings.SCORING_MAX_WORKERS,
+        settings.SCORING_MAX_QUEUE
+    )
+    
+    app.state.sharded_ranker = None
+    if settings.SHARDED_RANKING_MIN_ROWS > 0:
+        app.state.sharded_ranker = ShardedRanker(settings.SHARDED_RANKING_WORKERS or None)
+    
+    # Pooled database client for the repository backend, shared by all requests
+    mongo_client = None
+    if settings.DESTINATION_BACKEND == "mongodb":
+        mongo_client = create_mongo_client()
+        repository = MongoDestinationRepository(
+            mongo_client[settings.DATABASE_NAME][settings.MONGODB_COLLECTION],
+            settings.MONGODB_BATCH_SIZE
+        )
+        await repository.ensure_indexes()
+        app.state.destination_repository = repository
+    else:
+        app.state.destination_repository = InMemoryDestinationRepository(destination_service)
+    
+    yield
+    destination_service.stop_watcher()
+    app.state.scoring_executor.shutdown()
+    if app.state.sharded_ranker is not None:
+        app.state.sharded_ranker.shutdown()
+    if mongo_client is not None:
+        mongo_client.close()
 
 app = FastAPI(
     title="Travel Destination Recommendation System",
     description="A smart travel recommendation system using TOPSIS algorithm",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Catalog ETags on the read-only catalog routes; matching revalidations get
+# a 304 before routing (inside CORS so 304s carry its headers)
+if settings.CONDITIONAL_GET_ENABLED:
+    app.add_middleware(
+        ConditionalGetMiddleware,
+        paths=[f"{settings.API_V1_STR}/destinations", f"{settings.API_V1_STR}/filters/options"]
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,10 +83,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated brotli/gzip compression of response bodies
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+    )
+
+# Request latency, body size and per-stage timing histograms, served on /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(destinations.router, prefix="/api/v1/destinations", tags=["destinations"])
 app.include_router(filters.router, prefix="/api/v1/filters", tags=["filters"])
 app.include_router(topsis.router, prefix="/api/v1/topsis", tags=["topsis"])
+app.include_router(metrics.router, tags=["metrics"])
 
 # Health check endpoint
 @app.get("/")
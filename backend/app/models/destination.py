@@ -72,6 +72,9 @@ class Destination(BaseModel):
     description: Optional[str] = None
     best_time_to_visit: Optional[str] = None
 
+class BulkDestinationRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=500)
+
 class UserFilters(BaseModel):
     continents: Optional[List[Continent]] = None
     countries: Optional[List[str]] = None
@@ -99,6 +102,13 @@ class RecommendationRequest(BaseModel):
     filters: UserFilters
     weights: Optional[TOPSISWeights] = None
     max_results: Optional[int] = Field(20, ge=1, le=50)
+    engine: str = "topsis"
+
+class RecommendationExportRequest(BaseModel):
+    filters: UserFilters
+    weights: Optional[TOPSISWeights] = None
+    max_results: Optional[int] = Field(None, ge=1)  # None streams every matching destination
+    engine: str = "topsis"
 
 class RecommendationResponse(BaseModel):
     destinations: List[Destination]
@@ -106,6 +116,22 @@ class RecommendationResponse(BaseModel):
     total_results: int
     filters_applied: UserFilters
     weights_used: TOPSISWeights
+    engine: str = "topsis"
+
+class BatchRecommendationRequest(BaseModel):
+    requests: List[RecommendationRequest] = Field(..., min_length=1)
+
+class BatchRecommendationResponse(BaseModel):
+    results: List[RecommendationResponse]
+
+class SessionRankRequest(BaseModel):
+    weights: Optional[TOPSISWeights] = None
+    max_results: Optional[int] = Field(20, ge=1, le=50)
+
+class RankingSessionResponse(BaseModel):
+    session_id: str
+    total_candidates: int
+    recommendations: RecommendationResponse
 
 class FilterOptions(BaseModel):
     continents: List[Continent]
@@ -115,4 +141,11 @@ class FilterOptions(BaseModel):
     activities: List[ActivityType]
     budget_ranges: List[BudgetRange]
     package_types: List[PackageType]
-    weather_types: List[str] 
\ No newline at end of file
+    weather_types: List[str]
+    # Filter field -> option -> number of destinations holding it
+    counts: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+
+class FacetCounts(BaseModel):
+    total: int
+    # Filter field -> option -> matching destinations with the other fields' filters applied
+    counts: Dict[str, Dict[str, int]]
@@ -0,0 +1 @@
+# Data Repositories Package 
@@ -0,0 +1,98 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import List, Optional, Tuple
+from app.models.destination import Destination, UserFilters
+from app.services.destination_service import DestinationService
+
+
+class DestinationRepository(ABC):
+    """
+    Storage-agnostic access to the destination catalog.
+
+    Implementations resolve ``UserFilters`` in their own store and return
+    either full destinations or just the decision matrix needed for ranking,
+    so callers can rank a catalog that does not fit in memory.
+    """
+
+    @abstractmethod
+    async def get_by_id(self, destination_id: str) -> Optional[Destination]:
+        """Get destination by ID."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many(self, destination_ids: List[str]) -> List[Destination]:
+        """
+        Get several destinations by ID.
+
+        Args:
+            destination_ids: Destination IDs to look up
+
+        Returns:
+            The destinations found, in request order (unknown IDs are skipped)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find(self, filters: UserFilters, limit: Optional[int] = None) -> List[Destination]:
+        """
+        Get the destinations matching user filters.
+
+        Args:
+            filters: User filter preferences
+            limit: Maximum number of destinations, or None for all
+
+        Returns:
+            Matching destinations
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count(self, filters: UserFilters) -> int:
+        """Count the destinations matching user filters."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def scoring_candidates(self, filters: UserFilters) -> Tuple[List[str], np.ndarray]:
+        """
+        Get the ranking input of the destinations matching user filters.
+
+        Args:
+            filters: User filter preferences
+
+        Returns:
+            Tuple of (destination IDs, decision matrix) where row ``i`` of the
+            matrix holds the criteria scores of ``ids[i]`` in
+            ``settings.DEFAULT_WEIGHTS`` column order
+        """
+        raise NotImplementedError
+
+
+class InMemoryDestinationRepository(DestinationRepository):
+    """
+    Repository over the in-process catalog of a ``DestinationService``.
+
+    Serves the file and snapshot backed catalog through the repository
+    interface (following hot reloads), and stands in for a database in tests.
+    """
+
+    def __init__(self, destination_service: DestinationService):
+        self.destination_service = destination_service
+
+    async def get_by_id(self, destination_id: str) -> Optional[Destination]:
+        return self.destination_service.get_destination_by_id(destination_id)
+
+    async def get_many(self, destination_ids: List[str]) -> List[Destination]:
+        return self.destination_service.get_many(destination_ids)
+
+    async def find(self, filters: UserFilters, limit: Optional[int] = None) -> List[Destination]:
+        catalog = self.destination_service.catalog
+        return catalog.rows_to_destinations(catalog.filter_indices(filters)[:limit])
+
+    async def count(self, filters: UserFilters) -> int:
+        return len(self.destination_service.filter_indices(filters))
+
+    async def scoring_candidates(self, filters: UserFilters) -> Tuple[List[str], np.ndarray]:
+        catalog = self.destination_service.catalog
+        rows = catalog.filter_indices(filters)
+        ids = [destination.id for destination in catalog.rows_to_destinations(rows)]
+        return ids, catalog.decision_matrix[rows]
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.models.destination import Destination, UserFilters
+from app.repositories.destination_repository import DestinationRepository
+from app.services.filter_index import CATEGORICAL_FILTERS, RANGE_FILTERS, value_key
+from app.services.topsis_service import TOPSISService
+from app.utils.catalog_loader import load_destinations
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Destination fields the decision matrix is derived from (see
+# ``TOPSISService.prepare_decision_matrix``); ranking fetches only these
+SCORING_FIELDS = (
+    "popularity_score",
+    "budget_range",
+    "climate",
+    "activities",
+    "terrain",
+    "safety_score",
+    "accessibility_score",
+)
+
+SCORING_PROJECTION: Dict[str, int] = {"_id": 0, "id": 1, **{field: 1 for field in SCORING_FIELDS}}
+DOCUMENT_PROJECTION: Dict[str, int] = {"_id": 0}
+
+
+def create_mongo_client(url: Optional[str] = None):
+    """
+    Create the pooled async MongoDB client.
+
+    Create one client per process and share it: it owns the connection pool
+    (``MONGODB_MIN_POOL_SIZE`` to ``MONGODB_MAX_POOL_SIZE`` connections).
+
+    Args:
+        url: MongoDB connection string (defaults to ``MONGODB_URL``)
+
+    Returns:
+        AsyncIOMotorClient instance
+
+    Raises:
+        RuntimeError: If the motor driver is not installed
+    """
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient
+    except ImportError as e:
+        raise RuntimeError("The MongoDB backend requires the 'motor' package") from e
+
+    return AsyncIOMotorClient(
+        url or settings.MONGODB_URL,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE
+    )
+
+
+def build_filter_query(filters: UserFilters) -> Dict[str, Any]:
+    """
+    Translate user filters to a MongoDB query.
+
+    Uses the same semantics as the in-memory ``FilterIndex``: values within a
+    field are OR-ed (``$in``, which also matches any element of an array
+    field), fields are AND-ed, and numeric bounds are inclusive.
+
+    Args:
+        filters: User filter preferences
+
+    Returns:
+        Query document (empty when no filter is set)
+    """
+    query: Dict[str, Any] = {}
+
+    for filter_name, field in CATEGORICAL_FILTERS.items():
+        selected = getattr(filters, filter_name)
+        if selected:
+            query[field] = {"$in": [value_key(value) for value in selected]}
+
+    for field, (low_name, high_name) in RANGE_FILTERS.items():
+        bounds = {}
+        low, high = getattr(filters, low_name), getattr(filters, high_name)
+        if low is not None:
+            bounds["$gte"] = low
+        if high is not None:
+            bounds["$lte"] = high
+        if bounds:
+            query[field] = bounds
+
+    return query
+
+
+class MongoDestinationRepository(DestinationRepository):
+    """
+    Repository over a MongoDB collection of destination documents.
+
+    Filters are pushed down as indexed queries (see ``ensure_indexes``),
+    ranking reads project only the scoring fields, and every read streams
+    through a cursor in batches of ``batch_size`` documents, so memory use
+    depends on the matching documents rather than the catalog size.
+
+    The collection is any motor-compatible async collection; tests can pass
+    one from ``mongomock_motor.AsyncMongoMockClient`` instead of a live mongod.
+    """
+
+    def __init__(self, collection, batch_size: int = 1000):
+        """
+        Args:
+            collection: Async collection holding one document per destination
+            batch_size: Documents fetched per cursor round trip
+        """
+        self.collection = collection
+        self.batch_size = batch_size
+        self.topsis_service = TOPSISService()
+
+    async def ensure_indexes(self):
+        """Create the unique ID index and one index per filterable field."""
+        await self.collection.create_index("id", unique=True)
+        for field in list(CATEGORICAL_FILTERS.values()) + list(RANGE_FILTERS):
+            await self.collection.create_index(field)
+
+    async def insert_destinations(self, destinations: Iterable[Destination]) -> int:
+        """
+        Insert destinations in batches of ``batch_size`` documents.
+
+        Args:
+            destinations: Destinations to store
+
+        Returns:
+            Number of inserted documents
+        """
+        inserted = 0
+        batch: List[Dict[str, Any]] = []
+        for destination in destinations:
+            batch.append(destination.model_dump(mode="json"))
+            if len(batch) == self.batch_size:
+                inserted += len((await self.collection.insert_many(batch, ordered=False)).inserted_ids)
+                batch = []
+        if batch:
+            inserted += len((await self.collection.insert_many(batch, ordered=False)).inserted_ids)
+        return inserted
+
+    async def get_by_id(self, destination_id: str) -> Optional[Destination]:
+        document = await self.collection.find_one({"id": destination_id}, DOCUMENT_PROJECTION)
+        return None if document is None else Destination.model_validate(document)
+
+    async def get_many(self, destination_ids: List[str]) -> List[Destination]:
+        cursor = self.collection.find(
+            {"id": {"$in": list(destination_ids)}},
+            DOCUMENT_PROJECTION,
+            batch_size=self.batch_size
+        )
+        found = {}
+        async for document in cursor:
+            found[document["id"]] = document
+        return [
+            Destination.model_validate(found[destination_id])
+            for destination_id in destination_ids if destination_id in found
+        ]
+
+    async def find(self, filters: UserFilters, limit: Optional[int] = None) -> List[Destination]:
+        cursor = self.collection.find(
+            build_filter_query(filters),
+            DOCUMENT_PROJECTION,
+            batch_size=self.batch_size,
+            limit=limit or 0
+        )
+        return [Destination.model_validate(document) async for document in cursor]
+
+    async def count(self, filters: UserFilters) -> int:
+        return await self.collection.count_documents(build_filter_query(filters))
+
+    async def scoring_candidates(self, filters: UserFilters) -> Tuple[List[str], np.ndarray]:
+        cursor = self.collection.find(
+            build_filter_query(filters),
+            SCORING_PROJECTION,
+            batch_size=self.batch_size
+        )
+
+        # Only collect the projected documents on the event loop; the matrix
+        # is built in one pass on a worker thread
+        documents = [document async for document in cursor]
+        ids = [document["id"] for document in documents]
+        decision_matrix = await asyncio.to_thread(self._decision_matrix, documents)
+
+        logger.info(f"Fetched {len(ids)} scoring candidates from MongoDB")
+        return ids, decision_matrix
+
+    def _decision_matrix(self, documents: List[Dict[str, Any]]) -> np.ndarray:
+        """Build the decision matrix of projected scoring documents."""
+        return self.topsis_service.prepare_decision_matrix(
+            [Destination.model_construct(**document) for document in documents]
+        )
+
+
+async def import_catalog(source_path: str, url: Optional[str] = None) -> int:
+    """
+    Load a catalog file into the configured MongoDB collection.
+
+    Args:
+        source_path: Catalog file (JSON array or NDJSON, optionally gzip compressed)
+        url: MongoDB connection string (defaults to ``MONGODB_URL``)
+
+    Returns:
+        Number of imported destinations
+    """
+    client = create_mongo_client(url)
+    try:
+        repository = MongoDestinationRepository(
+            client[settings.DATABASE_NAME][settings.MONGODB_COLLECTION],
+            settings.MONGODB_BATCH_SIZE
+        )
+        await repository.ensure_indexes()
+        destinations = load_destinations(source_path, settings.CATALOG_LOAD_CHUNK_SIZE)
+        inserted = await repository.insert_destinations(destinations)
+        logger.info(f"Imported {inserted} destinations into MongoDB")
+        return inserted
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a destination catalog into MongoDB.")
+    parser.add_argument("source", help="JSON or NDJSON catalog file (optionally gzip compressed)")
+    parser.add_argument("--url", help="MongoDB connection string (defaults to MONGODB_URL)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(import_catalog(args.source, args.url))
@@ -0,0 +1,212 @@
+import numpy as np
+from typing import Dict, List, Mapping, Optional, Sequence
+from app.models.destination import Destination, UserFilters, FilterOptions, FacetCounts
+from app.services.catalog_snapshot import CatalogSnapshot
+from app.services.destination_json import DestinationJSONCache
+from app.services.filter_index import FilterIndex
+from app.services.search_index import SearchIndex
+from app.services.topsis_service import TOPSISService
+from app.core.config import settings
+from app.core.metrics import span
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Catalog:
+    """
+    One immutable, fully indexed version of the destination catalog.
+
+    A catalog bundles the destinations with everything derived from them: the
+    TOPSIS decision matrix, and the filter, ID and search indexes. It is never
+    modified after construction; a reload builds a new catalog and swaps it in,
+    so a request that holds a reference always sees one consistent version.
+    Row ``i`` of every structure refers to ``destinations[i]``.
+
+    ``version`` numbers the catalogs loaded by this process; ``digest``, when
+    known, is a hash of the catalog source's content and identifies the same
+    data across processes and hosts.
+    """
+
+    def __init__(self, destinations: Sequence[Destination], decision_matrix: np.ndarray,
+                 filter_index: FilterIndex, id_index: Mapping[str, int],
+                 search_index: SearchIndex, version: int, digest: Optional[str] = None):
+        self.destinations = destinations
+        self.decision_matrix = decision_matrix
+        self.filter_index = filter_index
+        self.id_index = id_index
+        self.search_index = search_index
+        self.version = version
+        self.digest = digest
+        self._filter_options: Optional[FilterOptions] = None
+        self._filter_options_json: Optional[bytes] = None
+        self._json_cache: Optional[DestinationJSONCache] = None
+
+    @classmethod
+    def build(cls, destinations: List[Destination], version: int, digest: Optional[str] = None) -> "Catalog":
+        """
+        Build a catalog and all its indexes from validated destinations.
+
+        The decision matrix holds the criteria scores of each destination in
+        ``settings.DEFAULT_WEIGHTS`` column order, so ranking requests only
+        need to slice it by row index.
+        """
+        id_index: Dict[str, int] = {}
+        for row, destination in enumerate(destinations):
+            id_index.setdefault(destination.id, row)
+
+        return cls(
+            destinations,
+            TOPSISService().prepare_decision_matrix(destinations),
+            FilterIndex.from_destinations(destinations),
+            id_index,
+            SearchIndex.from_destinations(destinations),
+            version,
+            digest
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CatalogSnapshot, version: int) -> "Catalog":
+        """Wrap the data and prebuilt indexes of a compiled catalog snapshot."""
+        return cls(
+            snapshot.destinations,
+            snapshot.decision_matrix,
+            snapshot.filter_index,
+            snapshot.id_index,
+            snapshot.search_index,
+            version,
+            snapshot.digest
+        )
+
+    def __len__(self) -> int:
+        return len(self.destinations)
+
+    def get_all_destinations(self) -> List[Destination]:
+        """Get all destinations."""
+        return list(self.destinations)
+
+    def get_destination_by_id(self, destination_id: str) -> Optional[Destination]:
+        """Get destination by ID."""
+        row = self.id_index.get(destination_id)
+        return None if row is None else self.destinations[row]
+
+    def get_many(self, destination_ids: List[str]) -> List[Destination]:
+        """
+        Get several destinations by ID.
+
+        Args:
+            destination_ids: Destination IDs to look up
+
+        Returns:
+            The destinations found, in request order (unknown IDs are skipped)
+        """
+        return [self.destinations[row] for row in self.id_rows(destination_ids)]
+
+    def id_rows(self, destination_ids: List[str]) -> List[int]:
+        """Get the rows of several destination IDs, in request order (unknown IDs are skipped)."""
+        rows = (self.id_index.get(destination_id) for destination_id in destination_ids)
+        return [row for row in rows if row is not None]
+
+    def filter_indices(self, filters: UserFilters) -> np.ndarray:
+        """
+        Filter destinations based on user preferences.
+
+        Filters are resolved against the bitmap index: values within a field
+        are OR-ed and fields are AND-ed together.
+
+        Args:
+            filters: User filter preferences
+
+        Returns:
+            Row indices (into ``destinations`` and ``decision_matrix``) of the
+            matching destinations, in catalog order
+        """
+        with span("filter"):
+            indices = self.filter_index.indices(filters)
+        logger.info(f"Filtered destinations: {len(indices)} results")
+        return indices
+
+    def get_filter_options(self) -> FilterOptions:
+        """
+        Get all available filter options from the destination data.
+
+        Built from the filter index on first use and kept for the lifetime of
+        this catalog version; callers must not modify the result.
+
+        Returns:
+            FilterOptions object with all available options and their
+            destination counts
+        """
+        if self._filter_options is None:
+            bitmaps = self.filter_index.bitmaps
+            self._filter_options = FilterOptions(
+                continents=list(bitmaps["continent"]),
+                countries=list(bitmaps["country"]),
+                climates=list(bitmaps["climate"]),
+                terrains=list(bitmaps["terrain"]),
+                activities=list(bitmaps["activities"]),
+                budget_ranges=list(bitmaps["budget_range"]),
+                package_types=list(bitmaps["package_type"]),
+                weather_types=list(bitmaps["weather_type"]),
+                counts=self.filter_index.value_counts()
+            )
+        return self._filter_options
+
+    def get_filter_options_json(self) -> bytes:
+        """Get the filter options encoded as JSON, encoded once per catalog version."""
+        if self._filter_options_json is None:
+            self._filter_options_json = self.get_filter_options().model_dump_json().encode()
+        return self._filter_options_json
+
+    def get_facet_counts(self, filters: UserFilters) -> FacetCounts:
+        """
+        Count the destinations each filter option would match.
+
+        Args:
+            filters: Filters already chosen (possibly none)
+
+        Returns:
+            Total matches of ``filters`` and per-option counts (see
+            ``FilterIndex.facet_counts``)
+        """
+        with span("facets"):
+            return FacetCounts(
+                total=self.filter_index.count(self.filter_index.resolve(filters)),
+                counts=self.filter_index.facet_counts(filters)
+            )
+
+    def search_rows(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """Get the rows matching a search query, most relevant first."""
+        rows, _ = self.search_index.search(query, limit)
+        return rows
+
+    def rows_to_destinations(self, rows: np.ndarray) -> List[Destination]:
+        """Look up the destinations of a set of rows."""
+        return [self.destinations[row] for row in rows]
+
+    def rows_to_json(self, rows: Sequence[int], fields: Optional[Sequence[str]] = None) -> bytes:
+        """Encode the destinations of a set of rows as a JSON array (see ``DestinationJSONCache``)."""
+        return self.json_cache.encode_rows(rows, fields)
+
+    @property
+    def json_cache(self) -> DestinationJSONCache:
+        """Cached JSON encoding of this catalog version's destinations, created on first use."""
+        if self._json_cache is None:
+            self._json_cache = DestinationJSONCache(
+                self.destinations, settings.DESTINATION_JSON_CACHE_MAX_ROWS
+            )
+        return self._json_cache
+
+    def field_rows(self, field: str, value: str) -> np.ndarray:
+        """Get the rows holding a value of a categorical field, in catalog order."""
+        return self.filter_index.rows(self.filter_index.field_bitmap(field, [value]))
+
+    def top_popular_rows(self, rows: np.ndarray, limit: int) -> np.ndarray:
+        """Get the ``limit`` most popular of the given rows, most popular first."""
+        popularity = self.decision_matrix[rows, list(settings.DEFAULT_WEIGHTS).index("popularity_score")]
+        return rows[TOPSISService().select_top_k(popularity, limit)]
+
+    def budget_friendly_rows(self) -> np.ndarray:
+        """Get the rows with a low or medium budget range, in catalog order."""
+        bitmap = self.filter_index.field_bitmap("budget_range", ['low', 'medium'])
+        return self.filter_index.rows(bitmap)
@@ -0,0 +1,433 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+import numpy as np
+from app.models.destination import (
+    Destination, Continent, ClimateType, TerrainType, ActivityType, BudgetRange, PackageType
+)
+from app.services.filter_index import FilterIndex, value_key
+from app.services.search_index import SearchIndex
+from app.services.topsis_service import TOPSISService
+from app.core.config import settings
+from app.utils.catalog_loader import DIGEST_SIZE, load_destinations
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+
+# Single-valued categorical fields and the enum their values decode to (None for plain strings)
+CATEGORICAL_FIELDS = {
+    "continent": Continent,
+    "country": None,
+    "climate": ClimateType,
+    "terrain": TerrainType,
+    "budget_range": BudgetRange,
+    "weather_type": None,
+}
+
+# Ordered list-valued categorical fields
+MULTI_VALUED_FIELDS = {
+    "activities": ActivityType,
+    "package_type": PackageType,
+}
+
+NUMERIC_FIELDS = ["popularity_score", "safety_score", "accessibility_score", "latitude", "longitude"]
+
+# String fields; list-valued ones are stored JSON-encoded
+STRING_FIELDS = ["id", "name", "booking_url", "images", "description", "best_time_to_visit"]
+JSON_STRING_FIELDS = {"images"}
+
+
+def _load_array(path: str) -> np.ndarray:
+    """Memory-map an ``.npy`` file (empty arrays cannot be mapped and are read)."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path)
+
+
+def _directory_digest(directory: str) -> str:
+    """Hash the names and bytes of every file in a snapshot directory."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for name in sorted(os.listdir(directory)):
+        digest.update(name.encode("utf-8") + b"\0")
+        with open(os.path.join(directory, name), "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class StringTable(Sequence):
+    """Read-only sequence of strings stored as UTF-8 bytes plus offsets."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, nulls: Optional[np.ndarray] = None):
+        self.data = data
+        self.offsets = offsets
+        self.nulls = nulls
+
+    @staticmethod
+    def write(directory: str, name: str, values: Sequence[Optional[str]]):
+        """Write a string table under ``directory``."""
+        encoded = [b"" if value is None else value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+        with open(os.path.join(directory, f"{name}.bytes"), "wb") as f:
+            f.write(b"".join(encoded))
+        if any(value is None for value in values):
+            nulls = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+            np.save(os.path.join(directory, f"{name}.nulls.npy"), nulls)
+
+    @classmethod
+    def open(cls, directory: str, name: str) -> "StringTable":
+        """Memory-map a string table written by ``write``."""
+        data_path = os.path.join(directory, f"{name}.bytes")
+        if os.path.getsize(data_path):
+            data = np.memmap(data_path, dtype=np.uint8, mode="r")
+        else:
+            data = np.empty(0, dtype=np.uint8)
+        nulls_path = os.path.join(directory, f"{name}.nulls.npy")
+        nulls = _load_array(nulls_path) if os.path.exists(nulls_path) else None
+        return cls(data, _load_array(os.path.join(directory, f"{name}.offsets.npy")), nulls)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+
+class SortedIdIndex:
+    """ID -> row lookup by binary search over the rows sorted by ID."""
+
+    def __init__(self, ids: StringTable, order: np.ndarray):
+        self.ids = ids
+        self.order = order
+
+    def get(self, destination_id: str, default: Optional[int] = None) -> Optional[int]:
+        """Get the row of a destination ID (the first one on duplicates)."""
+        low, high = 0, len(self.order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.ids[self.order[middle]] < destination_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.order) and self.ids[self.order[low]] == destination_id:
+            return int(self.order[low])
+        return default
+
+    def __contains__(self, destination_id: str) -> bool:
+        return self.get(destination_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+
+class SnapshotDestinations(Sequence):
+    """Lazy, read-only sequence of the destinations stored in a snapshot."""
+
+    def __init__(self, directory: str, manifest: Dict):
+        self.size = manifest["rows"]
+        self.strings = {field: StringTable.open(directory, field) for field in STRING_FIELDS}
+        self.numeric = {
+            field: _load_array(os.path.join(directory, f"{field}.npy")) for field in NUMERIC_FIELDS
+        }
+        self.categorical = {
+            field: (
+                _load_array(os.path.join(directory, f"{field}.codes.npy")),
+                [enum(value) if enum else value for value in manifest["categorical"][field]],
+            )
+            for field, enum in CATEGORICAL_FIELDS.items()
+        }
+        self.multi_valued = {
+            field: (
+                _load_array(os.path.join(directory, f"{field}.offsets.npy")),
+                _load_array(os.path.join(directory, f"{field}.codes.npy")),
+                [enum(value) for value in manifest["multi_valued"][field]],
+            )
+            for field, enum in MULTI_VALUED_FIELDS.items()
+        }
+
+    def _materialize(self, row: int) -> Destination:
+        """Build the Destination of a row (already validated when compiled)."""
+        fields = {}
+        for field, table in self.strings.items():
+            value = table[row]
+            fields[field] = json.loads(value) if field in JSON_STRING_FIELDS else value
+        for field, column in self.numeric.items():
+            value = float(column[row])
+            fields[field] = None if np.isnan(value) else value
+        for field, (codes, values) in self.categorical.items():
+            fields[field] = values[codes[row]]
+        for field, (offsets, codes, values) in self.multi_valued.items():
+            fields[field] = [values[code] for code in codes[offsets[row]:offsets[row + 1]]]
+        return Destination.model_construct(**fields)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Destination, List[Destination]]:
+        if isinstance(index, slice):
+            return [self._materialize(row) for row in range(*index.indices(self.size))]
+        index = int(index)
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("destination index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[Destination]:
+        for row in range(self.size):
+            yield self._materialize(row)
+
+
+class CatalogSnapshot:
+    """
+    Compiled binary snapshot of the destination catalog.
+
+    A snapshot is a directory of ``.npy`` columns and raw string tables that is
+    opened with ``mmap_mode="r"``: nothing is parsed or validated at startup,
+    and forked workers share the pages through the OS page cache. Besides the
+    record columns it stores the decision matrix and the prebuilt filter and
+    search indexes, so opening a snapshot builds nothing. Records are
+    materialised into ``Destination`` objects only when accessed.
+
+    Layout::
+
+        manifest.json                   format version, row count, dictionaries, content digest
+        criteria.npy                    TOPSIS decision matrix (rows x criteria)
+        <field>.npy                     numeric columns
+        <field>.codes.npy               dictionary-encoded categorical columns
+        <field>.offsets.npy/.codes.npy  ordered multi-valued columns
+        <field>.offsets.npy/.bytes      UTF-8 string tables (+ .nulls.npy)
+        ids.order.npy                   rows sorted by destination ID
+        filter.<field>.npy              packed bitmaps, one row per value
+        filter.<field>.sorted_*.npy     sorted numeric range arrays
+        search.*                        CSR postings and vocabulary
+
+    The snapshot path is a symbolic link to a versioned sibling directory
+    (``<path>.v<timestamp>``), which ``write_snapshot`` swaps atomically.
+    Snapshots compiled with a different list of criteria are rejected.
+
+    Compile one from a JSON/NDJSON catalog with::
+
+        python -m app.services.catalog_snapshot data/destinations.json data/destinations.snapshot
+    """
+
+    def __init__(self, directory: str):
+        # Resolve the snapshot link once, so a concurrent swap cannot mix two versions
+        directory = os.path.realpath(directory)
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {manifest.get('format')}")
+        criteria = list(settings.DEFAULT_WEIGHTS)
+        if manifest.get("criteria") != criteria:
+            raise ValueError(
+                f"Snapshot criteria {manifest.get('criteria')} do not match the configured criteria {criteria}"
+            )
+
+        self.directory = directory
+        self.manifest = manifest
+        # Digest of the snapshot files, written at compile time (absent in older snapshots)
+        self.digest: Optional[str] = manifest.get("digest")
+        self.destinations = SnapshotDestinations(directory, manifest)
+        self.decision_matrix = _load_array(os.path.join(directory, "criteria.npy"))
+        if self.decision_matrix.shape != (manifest["rows"], len(criteria)):
+            raise ValueError(f"Snapshot decision matrix has shape {self.decision_matrix.shape}, "
+                             f"expected {(manifest['rows'], len(criteria))}")
+        self.id_index = SortedIdIndex(
+            self.destinations.strings["id"], _load_array(os.path.join(directory, "ids.order.npy"))
+        )
+
+        bitmaps = {}
+        for field, values in manifest["filter_values"].items():
+            packed = _load_array(os.path.join(directory, f"filter.{field}.npy"))
+            bitmaps[field] = {value: packed[i] for i, value in enumerate(values)}
+        self.filter_index = FilterIndex(
+            manifest["rows"],
+            bitmaps,
+            {
+                field: _load_array(os.path.join(directory, f"filter.{field}.sorted_values.npy"))
+                for field in manifest["filter_ranges"]
+            },
+            {
+                field: _load_array(os.path.join(directory, f"filter.{field}.sorted_rows.npy"))
+                for field in manifest["filter_ranges"]
+            },
+        )
+
+        self.search_index = SearchIndex(
+            StringTable.open(directory, "search.vocabulary"),
+            _load_array(os.path.join(directory, "search.offsets.npy")),
+            _load_array(os.path.join(directory, "search.rows.npy")),
+            _load_array(os.path.join(directory, "search.weights.npy")),
+        )
+
+
+def write_snapshot(directory: str, destinations: Sequence[Destination],
+                   decision_matrix: np.ndarray, filter_index: FilterIndex,
+                   search_index: SearchIndex):
+    """
+    Write a snapshot of a loaded catalog.
+
+    The snapshot is written to a new versioned directory next to
+    ``directory``, and ``directory`` is then pointed at it by replacing a
+    symbolic link with ``os.replace``. The path therefore always names a
+    complete snapshot, old or new, and is never missing. The previous version
+    is kept for readers still opening it; older ones are removed.
+
+    Args:
+        directory: Snapshot directory to create or replace
+        destinations: Validated destinations
+        decision_matrix: Their TOPSIS decision matrix
+        filter_index: Their filter index
+        search_index: Their search index
+    """
+    directory = os.path.abspath(directory)
+    staging = f"{directory}.v{time.time_ns()}"
+    os.makedirs(staging)
+
+    def path(name: str) -> str:
+        return os.path.join(staging, name)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "rows": len(destinations),
+        "criteria": list(settings.DEFAULT_WEIGHTS),
+        "categorical": {},
+        "multi_valued": {},
+        "filter_values": {},
+        "filter_ranges": list(filter_index.sorted_values),
+    }
+
+    np.save(path("criteria.npy"), np.ascontiguousarray(decision_matrix, dtype=np.float64))
+
+    for field in STRING_FIELDS:
+        values = [getattr(destination, field) for destination in destinations]
+        if field in JSON_STRING_FIELDS:
+            values = [json.dumps(value) for value in values]
+        StringTable.write(staging, field, values)
+    ids = [destination.id for destination in destinations]
+    np.save(path("ids.order.npy"), np.array(sorted(range(len(ids)), key=ids.__getitem__), dtype=np.int64))
+
+    for field in NUMERIC_FIELDS:
+        values = [getattr(destination, field) for destination in destinations]
+        column = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        np.save(path(f"{field}.npy"), column)
+
+    for field in CATEGORICAL_FIELDS:
+        dictionary: Dict[str, int] = {}
+        codes = np.array(
+            [dictionary.setdefault(value_key(getattr(d, field)), len(dictionary)) for d in destinations],
+            dtype=np.int32
+        )
+        np.save(path(f"{field}.codes.npy"), codes)
+        manifest["categorical"][field] = list(dictionary)
+
+    for field in MULTI_VALUED_FIELDS:
+        dictionary = {}
+        lists = [getattr(destination, field) for destination in destinations]
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(items) for items in lists], out=offsets[1:])
+        codes = np.array(
+            [dictionary.setdefault(value_key(item), len(dictionary)) for items in lists for item in items],
+            dtype=np.uint8
+        )
+        np.save(path(f"{field}.offsets.npy"), offsets)
+        np.save(path(f"{field}.codes.npy"), codes)
+        manifest["multi_valued"][field] = list(dictionary)
+
+    packed_width = (filter_index.size + 7) // 8
+    for field, bitmaps in filter_index.bitmaps.items():
+        values = list(bitmaps)
+        packed = np.zeros((len(values), packed_width), dtype=np.uint8)
+        for i, value in enumerate(values):
+            packed[i] = bitmaps[value]
+        np.save(path(f"filter.{field}.npy"), packed)
+        manifest["filter_values"][field] = values
+    for field in filter_index.sorted_values:
+        np.save(path(f"filter.{field}.sorted_values.npy"), filter_index.sorted_values[field])
+        np.save(path(f"filter.{field}.sorted_rows.npy"), filter_index.sorted_rows[field])
+
+    StringTable.write(staging, "search.vocabulary", list(search_index.vocabulary))
+    np.save(path("search.offsets.npy"), np.asarray(search_index.offsets, dtype=np.int64))
+    np.save(path("search.rows.npy"), np.asarray(search_index.rows, dtype=np.int64))
+    np.save(path("search.weights.npy"), np.asarray(search_index.weights, dtype=np.float64))
+
+    manifest["digest"] = _directory_digest(staging)
+
+    # The manifest goes last: a directory without one is never a valid snapshot
+    with open(path(MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    _publish_snapshot(directory, staging)
+
+    logger.info(f"Wrote catalog snapshot of {len(destinations)} destinations to {directory}")
+
+
+def _publish_snapshot(directory: str, version: str):
+    """Point the snapshot link at a complete version directory and prune old versions."""
+    previous = os.path.realpath(directory) if os.path.islink(directory) else None
+    if os.path.isdir(directory) and previous is None:
+        # Snapshot written as a plain directory by an older release: move it
+        # aside once (not atomic), after which every swap goes through the link
+        previous = f"{directory}.v0"
+        shutil.rmtree(previous, ignore_errors=True)
+        os.rename(directory, previous)
+        logger.warning(f"Converted catalog snapshot {directory} to a versioned link")
+
+    link = f"{directory}.link-{os.getpid()}"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(version), link)
+    os.replace(link, directory)
+
+    parent, name = os.path.split(directory)
+    version_pattern = re.compile(re.escape(name) + r"\.v\d+")
+    keep = {os.path.basename(version), os.path.basename(previous or "")}
+    for entry in os.listdir(parent):
+        if version_pattern.fullmatch(entry) and entry not in keep:
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+def compile_snapshot(source_path: str, directory: str):
+    """
+    Compile a JSON/NDJSON catalog file into a snapshot directory.
+
+    Args:
+        source_path: Catalog file (JSON array or NDJSON, optionally gzip compressed)
+        directory: Snapshot directory to create or replace
+    """
+    destinations = load_destinations(source_path, settings.CATALOG_LOAD_CHUNK_SIZE)
+    write_snapshot(
+        directory,
+        destinations,
+        TOPSISService().prepare_decision_matrix(destinations),
+        FilterIndex.from_destinations(destinations),
+        SearchIndex.from_destinations(destinations),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile a destination catalog into a binary snapshot.")
+    parser.add_argument("source", help="JSON or NDJSON catalog file (optionally gzip compressed)")
+    parser.add_argument("snapshot", help="Snapshot directory to write")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    compile_snapshot(args.source, args.snapshot)
@@ -0,0 +1,176 @@
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
+from pydantic_core import to_json
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.models.destination import Destination
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Compiled pydantic-core serializer of the model: encodes a validated
+# Destination straight to JSON bytes without re-validating it
+_encode_destination = Destination.__pydantic_serializer__.to_json
+
+# Destination fields in serialization order
+DESTINATION_FIELDS = list(Destination.model_fields)
+
+# Records per chunk of a streamed NDJSON response
+NDJSON_CHUNK_LINES = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _encode_projection(destination: Destination, fields: Sequence[str], keys: List[bytes]) -> bytes:
+    """Encode some fields of a destination as a JSON object (``keys`` holds each ``"field":``)."""
+    return b"{" + b",".join([
+        key + to_json(getattr(destination, field)) for key, field in zip(keys, fields)
+    ]) + b"}"
+
+
+def ndjson_chunks(lines: Iterable[bytes], chunk_lines: int = NDJSON_CHUNK_LINES) -> Iterator[bytes]:
+    """
+    Group JSON documents into newline-delimited chunks for a streaming response.
+
+    Args:
+        lines: One encoded JSON document per line, without the newline
+        chunk_lines: Lines per yielded chunk
+
+    Yields:
+        Chunks of at most ``chunk_lines`` newline-terminated lines
+    """
+    chunk: List[bytes] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_lines:
+            chunk.append(b"")
+            yield b"\n".join(chunk)
+            chunk = []
+    if chunk:
+        chunk.append(b"")
+        yield b"\n".join(chunk)
+
+
+class DestinationJSONCache:
+    """
+    JSON encoding of the destinations of one catalog version.
+
+    Each destination is encoded once, on first use, and its bytes are kept,
+    so a list response is a join of cached fragments instead of a
+    validation and encoding pass over every record. The fragments take
+    about as much memory as the catalog's JSON file; catalogs above
+    ``max_rows`` are encoded on every request instead.
+
+    Projections (a subset of the fields) are cached the same way, for the
+    ``max_projections`` most recently requested field sets.
+    """
+
+    def __init__(self, destinations: Sequence[Destination], max_rows: int, max_projections: int = 8):
+        """
+        Args:
+            destinations: Catalog destinations, by row
+            max_rows: Largest catalog whose fragments are kept
+            max_projections: Number of projected field sets whose fragments are kept
+        """
+        self.destinations = destinations
+        self.max_projections = max_projections
+        self._cached = len(destinations) <= max_rows
+        self._fragments: Optional[List[Optional[bytes]]] = [None] * len(destinations) if self._cached else None
+        self._projections: "OrderedDict[Tuple[str, ...], List[Optional[bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fragment(self, row: int) -> bytes:
+        """Get the JSON object of one destination."""
+        fragments = self._fragments
+        if fragments is None:
+            return _encode_destination(self.destinations[row])
+        fragment = fragments[row]
+        if fragment is None:
+            # Concurrent misses encode the same bytes, so the race is harmless
+            fragment = fragments[row] = _encode_destination(self.destinations[row])
+        return fragment
+
+    def _plan(self, fields: Sequence[str],
+              create: bool = True) -> Tuple[Tuple[str, ...], List[bytes], Optional[List[Optional[bytes]]]]:
+        """Order projected fields like the model and look up their keys and fragment cache."""
+        fields = tuple(field for field in DESTINATION_FIELDS if field in fields)
+        keys = [json.dumps(field).encode() + b":" for field in fields]
+        if not self._cached:
+            return fields, keys, None
+        with self._lock:
+            fragments = self._projections.pop(fields, None)
+            if fragments is None:
+                if not create:
+                    return fields, keys, None
+                fragments = [None] * len(self.destinations)
+            self._projections[fields] = fragments
+            while len(self._projections) > self.max_projections:
+                self._projections.popitem(last=False)
+        return fields, keys, fragments
+
+    def projection(self, row: int, fields: Sequence[str]) -> bytes:
+        """Get the JSON object of one destination, restricted to some fields."""
+        return self._project(row, *self._plan(fields))
+
+    def _project(self, row: int, fields: Tuple[str, ...], keys: List[bytes],
+                 fragments: Optional[List[Optional[bytes]]]) -> bytes:
+        """Get one projected JSON object, encoding and caching it on a miss."""
+        fragment = None if fragments is None else fragments[row]
+        if fragment is None:
+            fragment = _encode_projection(self.destinations[row], fields, keys)
+            if fragments is not None:
+                fragments[row] = fragment
+        return fragment
+
+    def iter_fragments(self, rows: Iterable[int], fields: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+        """
+        Yield the JSON object of each row, for streaming.
+
+        Cached fragments are reused, but misses are not added to the caches,
+        so memory stays constant however many rows are streamed.
+
+        Args:
+            rows: Catalog rows, in output order
+            fields: Destination fields to include, or None for all
+        """
+        destinations = self.destinations
+        if fields is None:
+            fragments = self._fragments
+            for row in rows:
+                fragment = None if fragments is None else fragments[row]
+                yield _encode_destination(destinations[row]) if fragment is None else fragment
+            return
+
+        fields, keys, fragments = self._plan(fields, create=False)
+        for row in rows:
+            fragment = None if fragments is None else fragments[row]
+            yield _encode_projection(destinations[row], fields, keys) if fragment is None else fragment
+
+    def encode_rows(self, rows: Sequence[int], fields: Optional[Sequence[str]] = None) -> bytes:
+        """
+        Encode the destinations of some rows as a JSON array.
+
+        Args:
+            rows: Catalog rows, in response order
+            fields: Destination fields to include (in model order), or None for all
+
+        Returns:
+            UTF-8 JSON array bytes
+        """
+        if isinstance(rows, np.ndarray):
+            rows = rows.tolist()
+        if fields is None:
+            if self._fragments is not None:
+                page = [self._fragments[row] for row in rows]
+                if None not in page:
+                    return b"[" + b",".join(page) + b"]"
+            fragment = self.fragment
+            return b"[" + b",".join([fragment(row) for row in rows]) + b"]"
+
+        fields, keys, fragments = self._plan(fields)
+        if fragments is not None:
+            page = [fragments[row] for row in rows]
+            if None not in page:
+                return b"[" + b",".join(page) + b"]"
+        project = self._project
+        return b"[" + b",".join([project(row, fields, keys, fragments) for row in rows]) + b"]"
@@ -1,8 +1,17 @@
+import hashlib
 import json
 import os
-from typing import List, Optional, Dict, Any
-from app.models.destination import Destination, UserFilters, FilterOptions
+import threading
+import numpy as np
+from typing import Callable, List, Optional, Dict, Any, Sequence, Tuple
+from app.models.destination import Destination, UserFilters, FilterOptions, FacetCounts
+from app.services.catalog import Catalog
+from app.services.catalog_snapshot import CatalogSnapshot, MANIFEST_FILE
+from app.services.filter_index import FilterIndex
+from app.services.search_index import SearchIndex
+from app.utils.catalog_loader import DIGEST_SIZE, file_digest, load_destinations
 from app.core.config import settings
+from app.core.http_cache import make_catalog_etag, set_catalog_etag
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,30 +19,195 @@ logger = logging.getLogger(__name__)
 class DestinationService:
     """
     Service for managing destination data, filtering, and data operations.
+    
+    The data lives in an immutable ``Catalog``. Reloading builds a complete new
+    catalog off the request path and then swaps the ``catalog`` reference in a
+    single assignment (copy-on-write), so readers never block and never see a
+    half-built catalog. Code that combines several lookups should read
+    ``catalog`` once and use that object throughout.
     """
     
     def __init__(self):
-        self.destinations: List[Destination] = []
         self.data_file_path = settings.DATA_FILE_PATH
-        self._load_destinations()
-    
-    def _load_destinations(self):
-        """Load destinations from JSON file."""
+        self.snapshot_path = settings.CATALOG_SNAPSHOT_PATH
+        self._version = 0
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._swap_listeners: List[Callable[[Catalog], None]] = []
+        self._source_signature = self._get_source_signature()
+        
         try:
-            # Try to load from the specified path
-            if os.path.exists(self.data_file_path):
-                with open(self.data_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                # Fallback to default data
-                data = self._get_default_destinations()
-            
-            self.destinations = [Destination(**dest) for dest in data]
-            logger.info(f"Loaded {len(self.destinations)} destinations")
-            
+            self.catalog: Catalog = self._load_catalog()
         except Exception as e:
             logger.error(f"Error loading destinations: {e}")
-            self.destinations = []
+            # The empty fallback has no digest, so it gets no ETag and is never cached
+            self.catalog = Catalog.build([], self._next_version())
+        set_catalog_etag(make_catalog_etag(self.catalog.digest))
+    
+    @property
+    def destinations(self) -> Sequence[Destination]:
+        return self.catalog.destinations
+    
+    @property
+    def decision_matrix(self) -> np.ndarray:
+        return self.catalog.decision_matrix
+    
+    @property
+    def filter_index(self) -> FilterIndex:
+        return self.catalog.filter_index
+    
+    @property
+    def search_index(self) -> SearchIndex:
+        return self.catalog.search_index
+    
+    @property
+    def version(self) -> int:
+        return self.catalog.version
+    
+    def _next_version(self) -> int:
+        self._version += 1
+        return self._version
+    
+    def _use_snapshot(self) -> bool:
+        return bool(self.snapshot_path) and os.path.exists(os.path.join(self.snapshot_path, MANIFEST_FILE))
+    
+    def _load_catalog(self) -> Catalog:
+        """
+        Load a new catalog from the catalog snapshot or file.
+        
+        A compiled snapshot (``CATALOG_SNAPSHOT_PATH``) is memory-mapped as is.
+        Otherwise the catalog file (JSON array or NDJSON, optionally gzip
+        compressed) is streamed and validated in chunks of
+        ``CATALOG_LOAD_CHUNK_SIZE`` records, so peak memory does not grow with
+        the size of the raw file, and the indexes are built from it.
+        
+        The catalog's content digest comes from the snapshot manifest, or
+        is a hash of the catalog file's bytes.
+        
+        Raises:
+            Exception: If the catalog file cannot be read
+            ValueError: If the catalog file holds no valid destinations (e.g.
+                it was caught while being rewritten)
+        """
+        if self._use_snapshot():
+            try:
+                catalog = Catalog.from_snapshot(CatalogSnapshot(self.snapshot_path), self._next_version())
+                logger.info(f"Opened catalog snapshot with {len(catalog)} destinations")
+                if catalog.digest is None:
+                    logger.warning("Catalog snapshot has no content digest, recompile it to enable ETags")
+                return catalog
+            except Exception as e:
+                logger.error(f"Error opening catalog snapshot, falling back to {self.data_file_path}: {e}")
+        
+        # Try to load from the specified path
+        if os.path.exists(self.data_file_path):
+            digest = file_digest(self.data_file_path)
+            destinations = load_destinations(self.data_file_path, settings.CATALOG_LOAD_CHUNK_SIZE)
+            if not destinations:
+                raise ValueError(f"No valid destinations in {self.data_file_path}")
+        else:
+            # Fallback to default data
+            default_destinations = self._get_default_destinations()
+            digest = hashlib.blake2b(
+                json.dumps(default_destinations, sort_keys=True).encode(), digest_size=DIGEST_SIZE
+            ).hexdigest()
+            destinations = [Destination(**dest) for dest in default_destinations]
+        
+        logger.info(f"Loaded {len(destinations)} destinations")
+        return Catalog.build(destinations, self._next_version(), digest)
+    
+    def add_swap_listener(self, listener: Callable[[Catalog], None]):
+        """
+        Call ``listener(catalog)`` after every reload that swaps in a new catalog.
+        
+        Listeners run on the reloading thread (e.g. the watcher) and should
+        only drop state tied to older catalogs.
+        """
+        self._swap_listeners.append(listener)
+    
+    def reload(self) -> bool:
+        """
+        Rebuild the catalog from its source and swap it in atomically.
+        
+        The current catalog stays in service while the new one is built, and
+        also if building it fails. The catalog ETag is published after the
+        swap, so a response is never tagged newer than its content.
+        
+        Returns:
+            True if a new catalog was swapped in
+        """
+        with self._reload_lock:
+            self._source_signature = self._get_source_signature()
+            try:
+                catalog = self._load_catalog()
+            except Exception as e:
+                logger.error(f"Error reloading destinations, keeping version {self.catalog.version}: {e}")
+                return False
+            self.catalog = catalog
+            set_catalog_etag(make_catalog_etag(catalog.digest))
+            logger.info(f"Swapped in catalog version {catalog.version}")
+            for listener in self._swap_listeners:
+                try:
+                    listener(catalog)
+                except Exception as e:
+                    logger.error(f"Error notifying catalog swap listener: {e}")
+            return True
+    
+    def _get_source_signature(self) -> Tuple:
+        """Identify the current state of the catalog source files."""
+        paths = [self.data_file_path]
+        if self.snapshot_path:
+            paths.append(os.path.join(self.snapshot_path, MANIFEST_FILE))
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append((path, None))
+        return tuple(signature)
+    
+    def check_for_changes(self) -> bool:
+        """
+        Reload the catalog if its source files changed since the last load.
+        
+        Returns:
+            True if a new catalog was swapped in
+        """
+        if self._get_source_signature() == self._source_signature:
+            return False
+        logger.info("Catalog source changed, reloading")
+        return self.reload()
+    
+    def start_watcher(self, interval_seconds: float):
+        """
+        Start a background thread that polls the catalog source for changes.
+        
+        Args:
+            interval_seconds: Seconds between polls
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        
+        def watch():
+            while not self._stop_watching.wait(interval_seconds):
+                try:
+                    self.check_for_changes()
+                except Exception as e:
+                    logger.error(f"Error checking catalog source: {e}")
+        
+        self._watcher = threading.Thread(target=watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+    
+    def stop_watcher(self):
+        """Stop the background watcher thread, if running."""
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
     
     def _get_default_destinations(self) -> List[Dict[str, Any]]:
         """Get default destination data if file doesn't exist."""
@@ -114,14 +288,15 @@ class DestinationService:
     
     def get_all_destinations(self) -> List[Destination]:
         """Get all destinations."""
-        return self.destinations.copy()
+        return self.catalog.get_all_destinations()
     
     def get_destination_by_id(self, destination_id: str) -> Optional[Destination]:
         """Get destination by ID."""
-        for destination in self.destinations:
-            if destination.id == destination_id:
-                return destination
-        return None
+        return self.catalog.get_destination_by_id(destination_id)
+    
+    def get_many(self, destination_ids: List[str]) -> List[Destination]:
+        """Get several destinations by ID, in request order (unknown IDs are skipped)."""
+        return self.catalog.get_many(destination_ids)
     
     def filter_destinations(self, filters: UserFilters) -> List[Destination]:
         """
@@ -133,92 +308,12 @@ class DestinationService:
         Returns:
             Filtered list of destinations
         """
-        filtered_destinations = self.destinations.copy()
-        
-        # Filter by continents
-        if filters.continents:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.continent in filters.continents
-            ]
-        
-        # Filter by countries
-        if filters.countries:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.country in filters.countries
-            ]
-        
-        # Filter by climates
-        if filters.climates:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.climate in filters.climates
-            ]
-        
-        # Filter by terrains
-        if filters.terrains:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.terrain in filters.terrains
-            ]
-        
-        # Filter by activities (at least one activity should match)
-        if filters.activities:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if any(activity in dest.activities for activity in filters.activities)
-            ]
-        
-        # Filter by budget ranges
-        if filters.budget_ranges:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.budget_range in filters.budget_ranges
-            ]
-        
-        # Filter by package types (at least one package type should match)
-        if filters.package_types:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if any(pkg_type in dest.package_type for pkg_type in filters.package_types)
-            ]
-        
-        # Filter by weather types
-        if filters.weather_types:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.weather_type in filters.weather_types
-            ]
-        
-        # Filter by popularity range
-        if filters.min_popularity is not None:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.popularity_score >= filters.min_popularity
-            ]
-        
-        if filters.max_popularity is not None:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.popularity_score <= filters.max_popularity
-            ]
-        
-        # Filter by safety range
-        if filters.min_safety is not None:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.safety_score >= filters.min_safety
-            ]
-        
-        if filters.max_safety is not None:
-            filtered_destinations = [
-                dest for dest in filtered_destinations 
-                if dest.safety_score <= filters.max_safety
-            ]
-        
-        logger.info(f"Filtered destinations: {len(filtered_destinations)} results")
-        return filtered_destinations
+        catalog = self.catalog
+        return catalog.rows_to_destinations(catalog.filter_indices(filters))
+    
+    def filter_indices(self, filters: UserFilters) -> np.ndarray:
+        """Get the catalog rows matching user filters (see ``Catalog.filter_indices``)."""
+        return self.catalog.filter_indices(filters)
     
     def get_filter_options(self) -> FilterOptions:
         """
@@ -227,84 +322,55 @@ class DestinationService:
         Returns:
             FilterOptions object with all available options
         """
-        continents = list(set(dest.continent for dest in self.destinations))
-        countries = list(set(dest.country for dest in self.destinations))
-        climates = list(set(dest.climate for dest in self.destinations))
-        terrains = list(set(dest.terrain for dest in self.destinations))
-        
-        # Get all unique activities
-        all_activities = set()
-        for dest in self.destinations:
-            all_activities.update(dest.activities)
-        activities = list(all_activities)
-        
-        budget_ranges = list(set(dest.budget_range for dest in self.destinations))
-        
-        # Get all unique package types
-        all_package_types = set()
-        for dest in self.destinations:
-            all_package_types.update(dest.package_type)
-        package_types = list(all_package_types)
-        
-        weather_types = list(set(dest.weather_type for dest in self.destinations))
-        
-        return FilterOptions(
-            continents=continents,
-            countries=countries,
-            climates=climates,
-            terrains=terrains,
-            activities=activities,
-            budget_ranges=budget_ranges,
-            package_types=package_types,
-            weather_types=weather_types
-        )
+        return self.catalog.get_filter_options()
     
-    def search_destinations(self, query: str) -> List[Destination]:
+    def get_facet_counts(self, filters: UserFilters) -> FacetCounts:
         """
-        Search destinations by name or country.
+        Count the destinations each filter option would match under partial filters.
         
         Args:
-            query: Search query string
+            filters: Filters already chosen
             
         Returns:
-            List of matching destinations
+            FacetCounts with the total and per-option counts
+        """
+        return self.catalog.get_facet_counts(filters)
+    
+    def search_destinations(self, query: str, limit: Optional[int] = None) -> List[Destination]:
         """
-        query_lower = query.lower()
-        matching_destinations = []
+        Search destinations by name, country, description and best time to visit.
         
-        for destination in self.destinations:
-            if (query_lower in destination.name.lower() or 
-                query_lower in destination.country.lower()):
-                matching_destinations.append(destination)
+        Every query term must match a word exactly, by prefix or inside it;
+        name and country matches rank above description matches.
         
-        return matching_destinations
+        Args:
+            query: Search query string
+            limit: Maximum number of results, or None for all
+            
+        Returns:
+            List of matching destinations, most relevant first
+        """
+        catalog = self.catalog
+        return catalog.rows_to_destinations(catalog.search_rows(query, limit))
     
     def get_destinations_by_continent(self, continent: str) -> List[Destination]:
         """Get destinations by continent."""
-        return [dest for dest in self.destinations if dest.continent == continent]
+        catalog = self.catalog
+        return catalog.rows_to_destinations(catalog.field_rows("continent", continent))
     
     def get_destinations_by_country(self, country: str) -> List[Destination]:
         """Get destinations by country."""
-        return [dest for dest in self.destinations if dest.country == country]
+        catalog = self.catalog
+        return catalog.rows_to_destinations(catalog.field_rows("country", country))
     
     def get_popular_destinations(self, limit: int = 10) -> List[Destination]:
         """Get top popular destinations."""
-        sorted_destinations = sorted(
-            self.destinations, 
-            key=lambda x: x.popularity_score, 
-            reverse=True
-        )
-        return sorted_destinations[:limit]
+        catalog = self.catalog
+        rows = np.arange(len(catalog))
+        return catalog.rows_to_destinations(catalog.top_popular_rows(rows, limit))
     
     def get_budget_friendly_destinations(self, limit: int = 10) -> List[Destination]:
         """Get budget-friendly destinations."""
-        budget_destinations = [
-            dest for dest in self.destinations 
-            if dest.budget_range in ['low', 'medium']
-        ]
-        sorted_destinations = sorted(
-            budget_destinations, 
-            key=lambda x: x.popularity_score, 
-            reverse=True
-        )
-        return sorted_destinations[:limit] 
\ No newline at end of file
+        catalog = self.catalog
+        rows = catalog.budget_friendly_rows()
+        return catalog.rows_to_destinations(catalog.top_popular_rows(rows, limit))
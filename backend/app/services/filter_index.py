@@ -0,0 +1,274 @@
+import numpy as np
+from collections import defaultdict
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+from app.models.destination import Destination, UserFilters
+
+# UserFilters list field -> indexed Destination field
+CATEGORICAL_FILTERS: Dict[str, str] = {
+    "continents": "continent",
+    "countries": "country",
+    "climates": "climate",
+    "terrains": "terrain",
+    "activities": "activities",
+    "budget_ranges": "budget_range",
+    "package_types": "package_type",
+    "weather_types": "weather_type",
+}
+
+# Indexed Destination numeric field -> (UserFilters lower bound, upper bound)
+RANGE_FILTERS: Dict[str, tuple] = {
+    "popularity_score": ("min_popularity", "max_popularity"),
+    "safety_score": ("min_safety", "max_safety"),
+}
+
+
+# Number of set bits of every byte value, for counting the rows of a packed bitset
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def value_key(value: Any) -> str:
+    """Return the index key of a categorical value (enum members use their value)."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def pack_rows(rows: np.ndarray, size: int) -> np.ndarray:
+    """Pack a set of row numbers into a bitset of ``size`` bits."""
+    mask = np.zeros(size, dtype=bool)
+    mask[rows] = True
+    return np.packbits(mask)
+
+
+class FilterIndex:
+    """
+    Bitmap index over the filterable destination fields.
+
+    Every value of a categorical field owns a packed bitset with one bit per
+    catalog row, and the numeric range fields keep their values sorted next to
+    the matching row numbers. A ``UserFilters`` resolves to OR within a field and
+    AND across fields, using vectorized bit operations only.
+    """
+
+    def __init__(self, size: int,
+                 bitmaps: Dict[str, Dict[str, np.ndarray]],
+                 sorted_values: Dict[str, np.ndarray],
+                 sorted_rows: Dict[str, np.ndarray]):
+        """
+        Wrap prebuilt index arrays (see ``from_postings`` to build them).
+
+        Args:
+            size: Number of catalog rows
+            bitmaps: Field -> value -> packed bitset of the rows holding it
+            sorted_values: Numeric field -> its values in ascending order
+            sorted_rows: Numeric field -> the row of each sorted value
+        """
+        self.size = size
+        self.bitmaps = bitmaps
+        self.sorted_values = sorted_values
+        self.sorted_rows = sorted_rows
+        self._all_rows = np.packbits(np.ones(size, dtype=bool))
+        self._value_counts: Optional[Dict[str, Dict[str, int]]] = None
+
+    @classmethod
+    def from_postings(cls, size: int,
+                      postings: Dict[str, Dict[str, np.ndarray]],
+                      numeric: Dict[str, np.ndarray]) -> "FilterIndex":
+        """
+        Build the index.
+
+        Args:
+            size: Number of catalog rows
+            postings: Field -> value -> row numbers holding that value
+            numeric: Field -> per-row values for the range filters
+        """
+        bitmaps = {
+            field: {value: pack_rows(rows, size) for value, rows in values.items()}
+            for field, values in postings.items()
+        }
+
+        sorted_values: Dict[str, np.ndarray] = {}
+        sorted_rows: Dict[str, np.ndarray] = {}
+        for field, values in numeric.items():
+            order = np.argsort(values, kind="stable")
+            sorted_rows[field] = order
+            sorted_values[field] = values[order]
+
+        return cls(size, bitmaps, sorted_values, sorted_rows)
+
+    @classmethod
+    def from_destinations(cls, destinations: List[Destination]) -> "FilterIndex":
+        """Build the index from a list of destination objects."""
+        postings: Dict[str, Dict[str, List[int]]] = {
+            field: defaultdict(list) for field in CATEGORICAL_FILTERS.values()
+        }
+        for row, destination in enumerate(destinations):
+            for field, values in postings.items():
+                value = getattr(destination, field)
+                for item in (value if isinstance(value, list) else [value]):
+                    values[value_key(item)].append(row)
+
+        numeric = {
+            field: np.fromiter(
+                (getattr(destination, field) for destination in destinations),
+                dtype=np.float64,
+                count=len(destinations)
+            )
+            for field in RANGE_FILTERS
+        }
+
+        return cls.from_postings(
+            len(destinations),
+            {
+                field: {value: np.asarray(rows, dtype=np.intp) for value, rows in values.items()}
+                for field, values in postings.items()
+            },
+            numeric
+        )
+
+    def field_bitmap(self, field: str, values: Iterable[Any]) -> np.ndarray:
+        """
+        Get the rows holding any of the given values of a categorical field.
+
+        Args:
+            field: Indexed destination field
+            values: Accepted values (OR semantics)
+
+        Returns:
+            Newly allocated packed bitset
+        """
+        result = np.zeros_like(self._all_rows)
+        field_bitmaps = self.bitmaps[field]
+        for value in values:
+            bitmap = field_bitmaps.get(value_key(value))
+            if bitmap is not None:
+                np.bitwise_or(result, bitmap, out=result)
+        return result
+
+    def range_bitmap(self, field: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """
+        Get the rows whose numeric field lies within ``[low, high]``.
+
+        Args:
+            field: Indexed numeric field
+            low: Inclusive lower bound, or None for unbounded
+            high: Inclusive upper bound, or None for unbounded
+
+        Returns:
+            Newly allocated packed bitset
+        """
+        values = self.sorted_values[field]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return pack_rows(self.sorted_rows[field][start:stop], self.size)
+
+    def resolve(self, filters: UserFilters) -> np.ndarray:
+        """
+        Resolve user filters to a packed bitset of matching rows.
+
+        Args:
+            filters: User filter preferences
+
+        Returns:
+            Newly allocated packed bitset
+        """
+        result = None
+
+        for filter_name, field in CATEGORICAL_FILTERS.items():
+            selected = getattr(filters, filter_name)
+            if selected:
+                bitmap = self.field_bitmap(field, selected)
+                result = bitmap if result is None else np.bitwise_and(result, bitmap, out=result)
+
+        for field, (low_name, high_name) in RANGE_FILTERS.items():
+            low, high = getattr(filters, low_name), getattr(filters, high_name)
+            if low is not None or high is not None:
+                bitmap = self.range_bitmap(field, low, high)
+                result = bitmap if result is None else np.bitwise_and(result, bitmap, out=result)
+
+        return self._all_rows.copy() if result is None else result
+
+    def indices(self, filters: UserFilters) -> np.ndarray:
+        """
+        Resolve user filters to matching row numbers.
+
+        Args:
+            filters: User filter preferences
+
+        Returns:
+            Sorted row numbers of the matching destinations
+        """
+        return self.rows(self.resolve(filters))
+
+    def rows(self, bitmap: np.ndarray) -> np.ndarray:
+        """Convert a packed bitset to sorted row numbers."""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+
+    def count(self, bitmap: np.ndarray) -> int:
+        """Count the rows of a packed bitset."""
+        return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    def value_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count the rows holding each value of every categorical field.
+
+        Computed on first use and kept, since the index never changes.
+
+        Returns:
+            UserFilters list field -> value -> number of rows
+        """
+        if self._value_counts is None:
+            self._value_counts = {
+                filter_name: {
+                    value: self.count(bitmap) for value, bitmap in self.bitmaps[field].items()
+                }
+                for filter_name, field in CATEGORICAL_FILTERS.items()
+            }
+        return self._value_counts
+
+    def facet_counts(self, filters: UserFilters) -> Dict[str, Dict[str, int]]:
+        """
+        Count the matching rows per value of every categorical field.
+
+        Facets are disjunctive, like the filters themselves: the counts of a
+        field apply every filter except the field's own, so they give the
+        number of matches each value contributes whether or not it is already
+        selected. Each count is one AND and one popcount over the bitsets.
+
+        Args:
+            filters: User filter preferences, possibly partial
+
+        Returns:
+            UserFilters list field -> value -> number of matching rows
+        """
+        # Bitset of each constrained field, plus one for all range filters
+        constraints: Dict[str, np.ndarray] = {}
+        for filter_name, field in CATEGORICAL_FILTERS.items():
+            selected = getattr(filters, filter_name)
+            if selected:
+                constraints[filter_name] = self.field_bitmap(field, selected)
+
+        ranges = None
+        for field, (low_name, high_name) in RANGE_FILTERS.items():
+            low, high = getattr(filters, low_name), getattr(filters, high_name)
+            if low is not None or high is not None:
+                bitmap = self.range_bitmap(field, low, high)
+                ranges = bitmap if ranges is None else np.bitwise_and(ranges, bitmap, out=ranges)
+
+        counts: Dict[str, Dict[str, int]] = {}
+        scratch = np.empty_like(self._all_rows)
+        for filter_name, field in CATEGORICAL_FILTERS.items():
+            others = [bitmap for name, bitmap in constraints.items() if name != filter_name]
+            if ranges is not None:
+                others.append(ranges)
+            if not others:
+                counts[filter_name] = dict(self.value_counts()[filter_name])
+                continue
+
+            base = others[0].copy()
+            for bitmap in others[1:]:
+                np.bitwise_and(base, bitmap, out=base)
+            counts[filter_name] = {
+                value: self.count(np.bitwise_and(base, bitmap, out=scratch))
+                for value, bitmap in self.bitmaps[field].items()
+            }
+        return counts
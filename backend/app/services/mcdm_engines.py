@@ -0,0 +1,400 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from app.services.topsis_service import TOPSISService
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the elements of one block of pairwise comparisons,
+# to keep its temporaries around 32 MB
+_PAIRWISE_CHUNK_ELEMENTS = 1 << 22
+
+
+class EngineCapacityError(ValueError):
+    """Raised when a candidate set is too large for an engine."""
+
+
+class MCDMEngine(ABC):
+    """
+    Multi-criteria ranking method over the shared decision matrix.
+
+    Engines take the precomputed decision matrix (one row per alternative,
+    one column per criterion in ``settings.DEFAULT_WEIGHTS`` order, see
+    ``TOPSISService.prepare_decision_matrix``) and return one score per row,
+    higher being better. Engines are stateless and picklable, so they can run
+    on the scoring executor.
+    """
+
+    name = ""
+    description = ""
+
+    def __init__(self):
+        self.topsis_service = TOPSISService()
+
+    def weight_vector(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Get the weights in criteria order, normalized to sum to one."""
+        vector = self.topsis_service.weight_vector(weights or self.topsis_service.default_weights)
+        total = vector.sum()
+        return vector / total if total > 0 else vector
+
+    def benefit_matrix(self, decision_matrix: np.ndarray) -> np.ndarray:
+        """Negate the cost criteria so that higher is better in every column."""
+        return np.where(self.topsis_service.is_cost, -decision_matrix, decision_matrix)
+
+    @abstractmethod
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Score every row of a decision matrix.
+
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            weights: Optional custom weights for criteria
+
+        Returns:
+            Score per row, higher is better
+        """
+        raise NotImplementedError
+
+    def rank_top_k(self, decision_matrix: np.ndarray, k: int,
+                   weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank the rows of a decision matrix and keep only the k best.
+
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            k: Number of rows to return
+            weights: Optional custom weights for criteria
+
+        Returns:
+            Tuple of (row indices, scores) for the top k rows in ranking order
+        """
+        if len(decision_matrix) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        scores = self.score_matrix(decision_matrix, weights)
+        top_rows = self.topsis_service.select_top_k(scores, k)
+
+        logger.info(f"Ranked {len(decision_matrix)} destinations using {self.name} (top {k})")
+
+        return top_rows, scores[top_rows]
+
+    def rank_top_k_batch(self, decision_matrix: np.ndarray, weight_matrix: np.ndarray,
+                         ks: List[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Rank the rows of one decision matrix for many weight profiles.
+
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            weight_matrix: One row of criteria weights per profile
+            ks: Number of rows to return for each profile
+
+        Returns:
+            One (row indices, scores) tuple per profile, as from ``rank_top_k``
+        """
+        criteria = self.topsis_service.criteria
+        return [
+            self.rank_top_k(decision_matrix, k, dict(zip(criteria, weights)))
+            for weights, k in zip(weight_matrix, ks)
+        ]
+
+
+class TOPSISEngine(MCDMEngine):
+    """TOPSIS: relative closeness to the ideal and anti-ideal solutions."""
+
+    name = "topsis"
+    description = "Technique for Order Preference by Similarity to an Ideal Solution"
+
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        return self.topsis_service.score_matrix(decision_matrix, weights)
+
+    def rank_top_k(self, decision_matrix: np.ndarray, k: int,
+                   weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self.topsis_service.rank_top_k(decision_matrix, k, weights)
+
+    def rank_top_k_batch(self, decision_matrix: np.ndarray, weight_matrix: np.ndarray,
+                         ks: List[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        return self.topsis_service.rank_top_k_batch(decision_matrix, weight_matrix, ks)
+
+
+class SAWEngine(MCDMEngine):
+    """
+    Simple Additive Weighting with linear ratio normalization.
+
+    Benefit criteria are scaled as ``x / max`` and cost criteria as
+    ``min / x``, so every criterion maps onto ``(0, 1]``.
+    """
+
+    name = "saw"
+    description = "Simple Additive Weighting (ratio normalization)"
+
+    def ratio_matrix(self, decision_matrix: np.ndarray) -> np.ndarray:
+        """Linear ratio normalization (columns with a zero denominator score 1)."""
+        is_cost = self.topsis_service.is_cost
+        numerator = np.where(is_cost, decision_matrix.min(axis=0), decision_matrix)
+        denominator = np.where(is_cost, decision_matrix, decision_matrix.max(axis=0))
+        return np.divide(numerator, denominator, out=np.ones_like(numerator), where=denominator != 0)
+
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        return self.ratio_matrix(decision_matrix) @ self.weight_vector(weights)
+
+
+class WSMEngine(MCDMEngine):
+    """
+    Weighted Sum Model with min-max normalization.
+
+    Each criterion is rescaled onto ``[0, 1]`` between its worst and best
+    value (constant criteria count as 1).
+    """
+
+    name = "wsm"
+    description = "Weighted Sum Model (min-max normalization)"
+
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        benefit = self.benefit_matrix(decision_matrix)
+        low = benefit.min(axis=0)
+        spread = benefit.max(axis=0) - low
+        normalized = np.divide(benefit - low, spread, out=np.ones_like(benefit), where=spread != 0)
+        return normalized @ self.weight_vector(weights)
+
+
+class WPMEngine(SAWEngine):
+    """
+    Weighted Product Model: the weighted geometric mean of the ratio scores.
+
+    Computed as ``exp(sum(w * log(r)))``, so a zero ratio yields a zero score.
+    """
+
+    name = "wpm"
+    description = "Weighted Product Model (ratio normalization)"
+
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            log_ratios = np.log(self.ratio_matrix(decision_matrix))
+        weight_vector = self.weight_vector(weights)
+        # Criteria with zero weight must not contribute, even with log(0)
+        log_ratios[:, weight_vector == 0] = 0.0
+        return np.exp(log_ratios @ weight_vector)
+
+
+class VIKOREngine(MCDMEngine):
+    """
+    VIKOR compromise ranking.
+
+    Combines the group utility ``S`` (weighted sum of normalized regrets) and
+    the individual regret ``R`` (largest weighted regret) into
+    ``Q = v * S' + (1 - v) * R'`` with both rescaled onto ``[0, 1]``. Lower
+    ``Q`` is better, so the score is ``1 - Q``.
+    """
+
+    name = "vikor"
+    description = "VIKOR compromise ranking (score = 1 - Q)"
+
+    def __init__(self, strategy_weight: float = 0.5):
+        """
+        Args:
+            strategy_weight: Weight ``v`` of the group utility against the regret
+        """
+        super().__init__()
+        self.strategy_weight = strategy_weight
+
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        benefit = self.benefit_matrix(decision_matrix)
+        best = benefit.max(axis=0)
+        spread = best - benefit.min(axis=0)
+        regrets = np.divide(best - benefit, spread, out=np.zeros_like(benefit), where=spread != 0)
+        weighted_regrets = regrets * self.weight_vector(weights)
+
+        group_utility = weighted_regrets.sum(axis=1)
+        individual_regret = weighted_regrets.max(axis=1)
+
+        q = (self.strategy_weight * self._rescale(group_utility)
+             + (1 - self.strategy_weight) * self._rescale(individual_regret))
+        return 1.0 - q
+
+    def _rescale(self, values: np.ndarray) -> np.ndarray:
+        """Rescale onto [0, 1] from the minimum (constant values map to 0)."""
+        low = values.min()
+        spread = values.max() - low
+        return (values - low) / spread if spread > 0 else np.zeros_like(values)
+
+
+class PROMETHEEEngine(MCDMEngine):
+    """
+    PROMETHEE II net outranking flow.
+
+    Uses the linear preference function with indifference threshold ``q``
+    and preference threshold ``p`` (PROMETHEE type V), both in units of
+    each criterion's standard deviation: a difference ``d`` is preferred
+    ``0`` up to ``q``, linearly up to ``p`` and fully beyond.
+
+    The pairwise preference sums are evaluated per criterion over the
+    sorted column with prefix sums: for each alternative, the others whose
+    difference lies in ``(q, p]`` contribute linearly and those beyond
+    ``p`` contribute one. This gives exactly the O(n^2) pairwise sums in
+    O(n log n) time and O(n) memory, without any n x n matrix, so tens of
+    thousands of alternatives rank in milliseconds.
+    """
+
+    name = "promethee"
+    description = "PROMETHEE II net flow (linear preference with indifference)"
+
+    def __init__(self, indifference: float = 0.0, preference: float = 1.0):
+        """
+        Args:
+            indifference: Indifference threshold ``q`` in standard deviations
+            preference: Preference threshold ``p`` in standard deviations
+        """
+        super().__init__()
+        self.indifference = indifference
+        self.preference = preference
+
+    def _preference_sums(self, values: np.ndarray, q: float, p: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sum the preference of each alternative over all others and of all others over it.
+
+        Args:
+            values: One criterion column (higher is better)
+            q: Indifference threshold
+            p: Preference threshold
+
+        Returns:
+            Tuple of (leaving, entering) preference sums per alternative
+        """
+        ordered = np.sort(values)
+        prefix = np.concatenate([[0.0], np.cumsum(ordered)])
+        n = len(values)
+
+        # Others worse by more than q: x_j < x_i - q
+        strict_low = np.searchsorted(ordered, values - p, side="left")
+        partial_high = np.searchsorted(ordered, values - q, side="left")
+        # Others better by more than q: x_j > x_i + q
+        partial_low = np.searchsorted(ordered, values + q, side="right")
+        strict_high = np.searchsorted(ordered, values + p, side="right")
+
+        leaving = strict_low.astype(np.float64)
+        entering = (n - strict_high).astype(np.float64)
+        if p > q:
+            count = partial_high - strict_low
+            leaving += (count * (values - q) - (prefix[partial_high] - prefix[strict_low])) / (p - q)
+            count = strict_high - partial_low
+            entering += ((prefix[strict_high] - prefix[partial_low]) - count * (values + q)) / (p - q)
+        return leaving, entering
+
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        n = len(decision_matrix)
+        if n < 2:
+            return np.zeros(n)
+
+        benefit = self.benefit_matrix(decision_matrix)
+        deviations = benefit.std(axis=0)
+        net_flow = np.zeros(n)
+        for column, weight in enumerate(self.weight_vector(weights)):
+            if weight == 0:
+                continue
+            leaving, entering = self._preference_sums(
+                benefit[:, column],
+                self.indifference * deviations[column],
+                self.preference * deviations[column]
+            )
+            net_flow += weight * (leaving - entering)
+        return net_flow / (n - 1)
+
+
+class ELECTREEngine(MCDMEngine):
+    """
+    ELECTRE net concordance / net discordance ranking.
+
+    ``C(i, j)`` is the total weight of the criteria on which ``i`` is at least
+    as good as ``j``, and ``D(i, j)`` the largest range-normalized amount by
+    which ``j`` beats ``i`` on any criterion. An alternative scores its net
+    concordance minus its net discordance, averaged over the others.
+
+    Net concordance is computed per criterion from the sorted column. The
+    discordance maximum does not decompose by criterion, so it is evaluated
+    pairwise in blocks of rows bounded to ``_PAIRWISE_CHUNK_ELEMENTS``
+    elements; its O(n^2) cost limits this engine to
+    ``MCDM_PAIRWISE_MAX_ALTERNATIVES`` candidates.
+    """
+
+    name = "electre"
+    description = "ELECTRE net concordance minus net discordance"
+
+    def __init__(self, max_alternatives: Optional[int] = None):
+        super().__init__()
+        self.max_alternatives = max_alternatives or settings.MCDM_PAIRWISE_MAX_ALTERNATIVES
+
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        n = len(decision_matrix)
+        if n > self.max_alternatives:
+            raise EngineCapacityError(
+                f"The {self.name} engine ranks at most {self.max_alternatives} alternatives, got {n}"
+            )
+        if n < 2:
+            return np.zeros(n)
+
+        benefit = self.benefit_matrix(decision_matrix)
+        weight_vector = self.weight_vector(weights)
+
+        # Net concordance: sum_j C(i, j) - C(j, i), counting ties on both sides
+        net_concordance = np.zeros(n)
+        for column, weight in enumerate(weight_vector):
+            ordered = np.sort(benefit[:, column])
+            at_most = np.searchsorted(ordered, benefit[:, column], side="right")
+            at_least = n - np.searchsorted(ordered, benefit[:, column], side="left")
+            net_concordance += weight * (at_most - at_least)
+
+        # Net discordance: sum_j D(i, j) - D(j, i), in blocks of rows
+        spread = benefit.max(axis=0) - benefit.min(axis=0)
+        scaled = np.divide(benefit, spread, out=np.zeros_like(benefit), where=spread != 0)
+        discordance_out = np.empty(n)
+        discordance_in = np.zeros(n)
+        chunk_size = max(1, _PAIRWISE_CHUNK_ELEMENTS // n)
+        for start in range(0, n, chunk_size):
+            rows = scaled[start:start + chunk_size]
+            block = np.zeros((len(rows), n))
+            difference = np.empty_like(block)
+            for column in range(scaled.shape[1]):
+                np.subtract(scaled[np.newaxis, :, column], rows[:, column, np.newaxis], out=difference)
+                np.maximum(block, difference, out=block)
+            discordance_out[start:start + chunk_size] = block.sum(axis=1)
+            discordance_in += block.sum(axis=0)
+
+        return (net_concordance - (discordance_out - discordance_in)) / (n - 1)
+
+
+_ENGINES: Dict[str, MCDMEngine] = {}
+
+
+def register_engine(engine: MCDMEngine):
+    """Make an engine selectable by its name."""
+    _ENGINES[engine.name] = engine
+
+
+def get_engine(name: str) -> MCDMEngine:
+    """
+    Look up a registered engine.
+
+    Raises:
+        KeyError: If no engine is registered under the name
+    """
+    return _ENGINES[name]
+
+
+def available_engines() -> Dict[str, str]:
+    """Get the registered engine names and descriptions."""
+    return {name: engine.description for name, engine in _ENGINES.items()}
+
+
+for _engine in (TOPSISEngine(), VIKOREngine(), PROMETHEEEngine(), WSMEngine(), WPMEngine(),
+                SAWEngine(), ELECTREEngine()):
+    register_engine(_engine)
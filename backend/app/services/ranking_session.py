@@ -0,0 +1,278 @@
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from app.models.destination import UserFilters
+from app.services.catalog import Catalog
+from app.services.topsis_service import TOPSISService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _catalog_key(catalog: Catalog) -> str:
+    """Identify a catalog across worker processes (by content digest where available)."""
+    return catalog.digest or f"v{catalog.version}"
+
+
+def make_session_id(catalog: Catalog, filters: UserFilters) -> str:
+    """
+    Build the ID of the ranking session of a filter set on a catalog.
+
+    The ID encodes the filters and the catalog's content digest, so any
+    worker serving the same catalog can rebuild the session from the ID
+    alone, and the same filters always map to the same session.
+    """
+    token = json.dumps(
+        {"catalog": _catalog_key(catalog), "filters": filters.model_dump(mode="json", exclude_none=True)},
+        sort_keys=True, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+
+
+def parse_session_id(session_id: str) -> Tuple[str, UserFilters]:
+    """
+    Decode a session ID built by ``make_session_id``.
+
+    Returns:
+        Tuple of (catalog key, filters)
+
+    Raises:
+        ValueError: If the ID is malformed
+    """
+    try:
+        token = json.loads(base64.urlsafe_b64decode(session_id + "=" * (-len(session_id) % 4)))
+        return str(token["catalog"]), UserFilters.model_validate(token["filters"])
+    except Exception as e:
+        raise ValueError(f"Invalid ranking session ID: {e}") from e
+
+
+class RankingSession:
+    """
+    Cached ranking state of one filtered candidate set.
+
+    Holds the squared deviations of the normalized candidate matrix from its
+    ideal solutions (see ``TOPSISService.ideal_deviations``), so re-ranking
+    with new weights, e.g. while a user drags a weight slider, is a
+    matrix-vector product plus a top-k selection.
+    """
+
+    def __init__(self, catalog: Catalog, filters: UserFilters, topsis_service: TOPSISService):
+        """
+        Filter the catalog and precompute the weight-independent ranking state.
+
+        Args:
+            catalog: Catalog version to rank
+            filters: User filter preferences defining the candidates
+            topsis_service: Service providing the TOPSIS steps
+        """
+        self.catalog = catalog
+        self.filters = filters
+        self.session_id = make_session_id(catalog, filters)
+        self.topsis_service = topsis_service
+        self.candidate_rows = catalog.filter_indices(filters)
+
+        if len(self.candidate_rows):
+            self.positive_deviations, self.negative_deviations = topsis_service.ideal_deviations(
+                catalog.decision_matrix[self.candidate_rows]
+            )
+        else:
+            self.positive_deviations = self.negative_deviations = np.empty((0, len(topsis_service.criteria)))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the session."""
+        return (self.candidate_rows.nbytes + self.positive_deviations.nbytes
+                + self.negative_deviations.nbytes)
+
+    def rank(self, k: int, weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank the candidates with the given weights and keep only the k best.
+
+        Args:
+            k: Number of rows to return
+            weights: Optional custom weights for criteria
+
+        Returns:
+            Tuple of (catalog rows, scores) for the top k rows in ranking order
+        """
+        if len(self.candidate_rows) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        scores = self.topsis_service.score_deviations(
+            self.positive_deviations, self.negative_deviations, weights
+        )
+        top_rows = self.topsis_service.select_top_k(scores, k)
+        return self.candidate_rows[top_rows], scores[top_rows]
+
+
+class RankingSessionStore:
+    """
+    In-process LRU/TTL cache of ranking sessions.
+
+    Sessions expire after ``ttl_seconds`` without use and are bounded by
+    count and by the memory their cached matrices hold. Since session IDs
+    are derived from the filters and the catalog, a session missing from
+    this worker's store can be rebuilt from its ID (see
+    ``get_or_rebuild``), so requests need no sticky routing. Sessions of
+    older catalog versions are dropped by ``invalidate`` when a new catalog
+    is swapped in, releasing the old catalog, and on lookup otherwise.
+    """
+
+    def __init__(self, max_sessions: int, max_bytes: int, ttl_seconds: float):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # session ID -> (expiry timestamp, session)
+        self._sessions: "OrderedDict[str, Tuple[float, RankingSession]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+
+        self.created = 0
+        self.rebuilt = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _remove(self, session_id: str) -> RankingSession:
+        _, session = self._sessions.pop(session_id)
+        self._current_bytes -= session.nbytes
+        return session
+
+    def add(self, session: RankingSession) -> str:
+        """
+        Store a session, evicting least recently used sessions as needed.
+
+        A session already stored under the same ID is replaced.
+
+        Args:
+            session: Session to store
+
+        Returns:
+            The session ID
+        """
+        session_id = session.session_id
+        with self._lock:
+            if session_id in self._sessions:
+                self._remove(session_id)
+            self._sessions[session_id] = (time.monotonic() + self.ttl_seconds, session)
+            self._current_bytes += session.nbytes
+            self.created += 1
+
+            # Always keep the new session, even if it alone exceeds the budget
+            while len(self._sessions) > 1 and (
+                len(self._sessions) > self.max_sessions or self._current_bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._sessions)))
+                self.evictions += 1
+
+        logger.info(f"Created ranking session with {len(session.candidate_rows)} candidates")
+        return session_id
+
+    def get(self, session_id: str, catalog_version: int) -> Optional[RankingSession]:
+        """
+        Look up a cached session and extend its lifetime.
+
+        Args:
+            session_id: Session ID
+            catalog_version: Version of the currently loaded catalog
+
+        Returns:
+            The session, or None if it is not cached, expired or stale
+        """
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+
+            expires_at, session = entry
+            if expires_at <= time.monotonic():
+                self._remove(session_id)
+                self.expirations += 1
+                return None
+            if session.catalog.version != catalog_version:
+                self._remove(session_id)
+                self.invalidations += 1
+                return None
+
+            self._sessions[session_id] = (time.monotonic() + self.ttl_seconds, session)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_rebuild(self, session_id: str, catalog: Catalog,
+                       topsis_service: TOPSISService) -> Optional[RankingSession]:
+        """
+        Look up a session, rebuilding it from its ID if this worker has not cached it.
+
+        Rebuilding filters and normalizes the candidates again, so call this
+        off the event loop.
+
+        Args:
+            session_id: Session ID
+            catalog: Currently loaded catalog
+            topsis_service: Service providing the TOPSIS steps
+
+        Returns:
+            The session, or None if the ID is malformed or was issued for
+            another catalog version
+        """
+        session = self.get(session_id, catalog.version)
+        if session is not None:
+            return session
+
+        try:
+            catalog_key, filters = parse_session_id(session_id)
+        except ValueError:
+            return None
+        if catalog_key != _catalog_key(catalog):
+            return None
+
+        session = RankingSession(catalog, filters, topsis_service)
+        self.add(session)
+        with self._lock:
+            self.rebuilt += 1
+        return session
+
+    def invalidate(self, catalog_version: int):
+        """Drop every session built from a catalog version other than ``catalog_version``."""
+        with self._lock:
+            stale = [session_id for session_id, (_, session) in self._sessions.items()
+                     if session.catalog.version != catalog_version]
+            for session_id in stale:
+                self._remove(session_id)
+            self.invalidations += len(stale)
+        if stale:
+            logger.info(f"Dropped {len(stale)} ranking sessions of older catalog versions")
+
+    def delete(self, session_id: str) -> bool:
+        """
+        Remove a cached session.
+
+        Returns:
+            True if the session was cached
+        """
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._remove(session_id)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Get session counters and occupancy."""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._current_bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "created": self.created,
+                "rebuilt": self.rebuilt,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.models.destination import RecommendationRequest, RecommendationResponse, TOPSISWeights
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationCache:
+    """
+    In-process LRU/TTL cache of recommendation responses.
+
+    Entries are keyed by a canonical hash of the request, so requests that
+    differ only in list ordering or float noise share an entry. Each entry
+    keeps the response together with its encoded JSON body, so a hit can be
+    served without serializing again. The cache is bounded both by entry
+    count and by the size of those bodies, and it empties itself as soon as
+    it sees a newer catalog version than the one its entries were computed
+    from.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float,
+                 float_quantum: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.float_quantum = float_quantum
+
+        # key -> (expiry timestamp, response, encoded response body)
+        self._entries: "OrderedDict[str, Tuple[float, RecommendationResponse, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._catalog_version: Optional[int] = None
+        self._current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _quantise(self, value: float) -> int:
+        """Map a float onto the quantisation grid."""
+        return round(value / self.float_quantum)
+
+    def make_key(self, request: RecommendationRequest) -> str:
+        """
+        Build the canonical cache key of a recommendation request.
+
+        List filters are order-insensitive and de-duplicated, empty lists are
+        treated like missing filters, missing weights like the defaults, and
+        floats are quantised to ``float_quantum``.
+
+        Args:
+            request: Recommendation request
+
+        Returns:
+            Hex digest identifying the request
+        """
+        filters: Dict[str, Any] = {}
+        for name, value in request.filters.model_dump(mode="json").items():
+            if value is None or value == []:
+                continue
+            if isinstance(value, list):
+                filters[name] = sorted(set(value))
+            else:
+                filters[name] = self._quantise(value)
+
+        weights = (request.weights or TOPSISWeights()).model_dump()
+        payload = {
+            "filters": filters,
+            "weights": {name: self._quantise(value) for name, value in weights.items()},
+            "max_results": request.max_results,
+            "engine": request.engine,
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _check_version(self, catalog_version: int):
+        """Drop every entry if the catalog changed since they were stored."""
+        if self._catalog_version != catalog_version:
+            if self._entries:
+                self.invalidations += 1
+                logger.info(f"Catalog version changed, dropping {len(self._entries)} cached recommendations")
+            self._entries.clear()
+            self._current_bytes = 0
+            self._catalog_version = catalog_version
+
+    def get(self, key: str, catalog_version: int) -> Optional[Tuple[RecommendationResponse, bytes]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from ``make_key``
+            catalog_version: Version of the currently loaded catalog
+
+        Returns:
+            Tuple of (response, encoded JSON body), or None on a miss
+        """
+        with self._lock:
+            self._check_version(catalog_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, response, body = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._current_bytes -= len(body)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response, body
+
+    def put(self, key: str, catalog_version: int, response: RecommendationResponse, body: bytes):
+        """
+        Store a response, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key from ``make_key``
+            catalog_version: Catalog version the response was computed from
+            response: Response to cache
+            body: The response already encoded as JSON, as sent to the client
+        """
+        if self.max_entries <= 0:
+            return
+
+        size = len(body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._check_version(catalog_version)
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= len(previous[2])
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, response, body)
+            self._current_bytes += size
+
+            while len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes:
+                _, (_, _, evicted_body) = self._entries.popitem(last=False)
+                self._current_bytes -= len(evicted_body)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "catalog_version": self._catalog_version,
+            }
@@ -0,0 +1,143 @@
+import asyncio
+import contextvars
+import functools
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict
+from app.core.metrics import observe_stage
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class ScoringQueueFullError(Exception):
+    """Raised when too many scoring jobs are already waiting for a worker."""
+
+
+class ScoringExecutor:
+    """
+    Runs CPU-bound scoring jobs off the asyncio event loop.
+
+    At most ``max_workers`` jobs run at once; further jobs wait for a free
+    slot on the event loop (without occupying a worker), and once
+    ``max_queue`` jobs are waiting new ones are rejected. Cheap routes
+    served by the same worker therefore never queue behind rankings.
+
+    With the ``process`` kind, the function and its arguments are pickled
+    to the worker processes, so pass module-level functions or bound methods
+    of picklable objects, and only the data the job needs. Thread jobs run
+    in a copy of the caller's context, so their metrics spans are recorded;
+    spans inside process jobs are not.
+
+    Must be created and used on the event loop thread.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 0):
+        """
+        Args:
+            kind: "thread" or "process"
+            max_workers: Maximum number of jobs running at once
+            max_queue: Maximum number of waiting jobs (0 for unbounded)
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown scoring executor kind {kind!r}, expected one of {EXECUTOR_KINDS}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers) if kind == "process"
+            else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scoring")
+        )
+        self._slots = asyncio.Semaphore(max_workers)
+
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold one worker slot for the duration of the block.
+
+        Applies the same queue limit, counters and ``queue_wait`` metric as
+        ``run``, for scoring work that runs elsewhere (e.g. on the process
+        pool of ``ShardedRanker``) but must still count against the limits.
+
+        Raises:
+            ScoringQueueFullError: If ``max_queue`` jobs are already waiting
+        """
+        if self.max_queue and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise ScoringQueueFullError(f"{self.queued} scoring jobs already waiting")
+
+        enqueued = time.perf_counter()
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        started = time.perf_counter()
+        self.wait_seconds += started - enqueued
+        observe_stage("queue_wait", started - enqueued)
+        self.running += 1
+        try:
+            yield
+            self.completed += 1
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self.run_seconds += time.perf_counter() - started
+            self._slots.release()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``fn(*args)`` on a worker and wait for its result.
+
+        Args:
+            fn: Function to run
+            *args: Positional arguments for ``fn``
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            ScoringQueueFullError: If ``max_queue`` jobs are already waiting
+        """
+        async with self.admit():
+            job = functools.partial(fn, *args)
+            if self.kind == "thread":
+                job = functools.partial(contextvars.copy_context().run, job)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get executor configuration, queue depth and job counters."""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "running": self.running,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_seconds": round(self.wait_seconds, 6),
+            "run_seconds": round(self.run_seconds, 6),
+        }
+
+    def shutdown(self):
+        """Stop the workers after the running jobs finish."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,179 @@
+import re
+import numpy as np
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from app.models.destination import Destination
+
+# Searchable fields and the relevance weight of a match in each of them
+SEARCH_FIELDS: Dict[str, float] = {
+    "name": 4.0,
+    "country": 3.0,
+    "description": 1.0,
+    "best_time_to_visit": 0.5,
+}
+
+# Relevance multiplier by how a query term matches an indexed token
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+INFIX_MATCH = 0.4
+
+# Length of the character n-grams used for infix matching
+NGRAM_SIZE = 2
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _ngrams(token: str) -> Iterator[str]:
+    """Yield the character n-grams of a token."""
+    for start in range(len(token) - NGRAM_SIZE + 1):
+        yield token[start:start + NGRAM_SIZE]
+
+
+class SearchIndex:
+    """
+    Inverted full-text index over the searchable destination fields.
+
+    Every token maps to the rows containing it together with the weight of
+    the best field it appears in. Query terms match tokens exactly, by prefix
+    (through the sorted vocabulary, for type-ahead) or anywhere inside a token
+    (through an n-gram index over the vocabulary), so a query only touches
+    the postings of the tokens it matches rather than the whole catalog.
+
+    Postings are stored CSR-style: the postings of ``vocabulary[i]`` are
+    ``rows[offsets[i]:offsets[i + 1]]`` with the matching ``weights``.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], offsets: np.ndarray,
+                 rows: np.ndarray, weights: np.ndarray):
+        """
+        Wrap prebuilt postings (see ``from_destinations`` to build them).
+
+        Args:
+            vocabulary: Sorted indexed tokens
+            offsets: Start of each token's postings (one extra trailing entry)
+            rows: Concatenated posting rows, ascending within each token
+            weights: Field weight of each posting
+        """
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.rows = rows
+        self.weights = weights
+        self._ngram_tokens: Optional[Dict[str, Set[int]]] = None
+
+    @classmethod
+    def from_destinations(cls, destinations: Sequence[Destination]) -> "SearchIndex":
+        """Build the index from a list of destination objects."""
+        token_rows: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for row, destination in enumerate(destinations):
+            for field, weight in SEARCH_FIELDS.items():
+                for token in tokenize(getattr(destination, field)):
+                    rows = token_rows[token]
+                    if rows.get(row, 0.0) < weight:
+                        rows[row] = weight
+
+        vocabulary = sorted(token_rows)
+        lengths = np.fromiter((len(token_rows[token]) for token in vocabulary),
+                              dtype=np.int64, count=len(vocabulary))
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        rows = np.empty(offsets[-1], dtype=np.int64)
+        weights = np.empty(offsets[-1], dtype=np.float64)
+        for position, token in enumerate(vocabulary):
+            postings = token_rows[token]
+            start, stop = offsets[position], offsets[position + 1]
+            rows[start:stop] = list(postings.keys())
+            weights[start:stop] = list(postings.values())
+
+        return cls(vocabulary, offsets, rows, weights)
+
+    @property
+    def ngram_tokens(self) -> Dict[str, Set[int]]:
+        """N-gram -> vocabulary positions of the tokens containing it (built on first use)."""
+        if self._ngram_tokens is None:
+            ngram_tokens: Dict[str, Set[int]] = defaultdict(set)
+            for position, token in enumerate(self.vocabulary):
+                for ngram in _ngrams(token):
+                    ngram_tokens[ngram].add(position)
+            self._ngram_tokens = dict(ngram_tokens)
+        return self._ngram_tokens
+
+    def _expand(self, term: str) -> Iterator[Tuple[int, float]]:
+        """Yield the vocabulary positions matching a query term and their match quality."""
+        position = bisect_left(self.vocabulary, term)
+        while position < len(self.vocabulary):
+            token = self.vocabulary[position]
+            if not token.startswith(term):
+                break
+            yield position, EXACT_MATCH if token == term else PREFIX_MATCH
+            position += 1
+
+        if len(term) < NGRAM_SIZE:
+            return
+
+        ngram_tokens = self.ngram_tokens
+        candidates: Optional[Set[int]] = None
+        for ngram in set(_ngrams(term)):
+            positions = ngram_tokens.get(ngram)
+            if not positions:
+                return
+            candidates = set(positions) if candidates is None else candidates & positions
+        for position in sorted(candidates):
+            token = self.vocabulary[position]
+            if term in token and not token.startswith(term):
+                yield position, INFIX_MATCH
+
+    def _match_term(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the sorted rows matching a term and each row's best term score."""
+        row_parts, score_parts = [], []
+        for position, quality in self._expand(term):
+            start, stop = self.offsets[position], self.offsets[position + 1]
+            row_parts.append(self.rows[start:stop])
+            score_parts.append(self.weights[start:stop] * quality)
+
+        if not row_parts:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        rows = np.concatenate(row_parts)
+        scores = np.concatenate(score_parts)
+        order = np.lexsort((-scores, rows))
+        rows, scores = rows[order], scores[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        return rows[first], scores[first]
+
+    def search(self, query: str, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows matching every term of a query.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of rows to return, or None for all
+
+        Returns:
+            Tuple of (rows, relevance scores), most relevant first
+        """
+        rows, scores = None, None
+        for term in dict.fromkeys(tokenize(query)):
+            term_rows, term_scores = self._match_term(term)
+            if rows is None:
+                rows, scores = term_rows, term_scores
+            else:
+                rows, left, right = np.intersect1d(
+                    rows, term_rows, assume_unique=True, return_indices=True
+                )
+                scores = scores[left] + term_scores[right]
+            if len(rows) == 0:
+                break
+
+        if rows is None:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        order = np.lexsort((rows, -scores))[:limit]
+        return rows[order], scores[order]
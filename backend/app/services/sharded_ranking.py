@@ -0,0 +1,170 @@
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.services.catalog import Catalog
+from app.services.topsis_service import TOPSISService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prefer tmpfs so the shared matrix lives in memory rather than on disk
+_SHARED_DIRECTORY = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Worker-process state: path of the mapped matrix file -> the mapping
+_worker_matrices: Dict[str, np.ndarray] = {}
+_worker_topsis = TOPSISService()
+
+
+def _shared_matrix(path: str) -> np.ndarray:
+    """Map a shared decision matrix in a worker, dropping older mappings."""
+    matrix = _worker_matrices.get(path)
+    if matrix is None:
+        _worker_matrices.clear()
+        matrix = _worker_matrices[path] = np.load(path, mmap_mode="r")
+    return matrix
+
+
+def _shard_statistics(path: str, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First pass: per-column sum of squares, minimum and maximum of a shard."""
+    shard = _shared_matrix(path)[rows]
+    return np.sum(shard ** 2, axis=0), shard.min(axis=0), shard.max(axis=0)
+
+
+def _shard_top_k(path: str, rows: np.ndarray, norms: np.ndarray, weights: np.ndarray,
+                 positive_ideal: np.ndarray, negative_ideal: np.ndarray,
+                 k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Second pass: score a shard against the global ideals and keep its top k."""
+    weighted_matrix = (_shared_matrix(path)[rows] / norms) * weights
+    positive_distances, negative_distances = _worker_topsis.calculate_distances(
+        weighted_matrix, positive_ideal, negative_ideal
+    )
+    scores = _worker_topsis.calculate_relative_closeness(positive_distances, negative_distances)
+    top_rows = _worker_topsis.select_top_k(scores, k)
+    return top_rows, scores[top_rows]
+
+
+class ShardedRanker:
+    """
+    TOPSIS top-k ranking of large candidate sets across a process pool.
+
+    The decision matrix of the current catalog version is published once to
+    a memory-mapped file (on tmpfs where available) that every worker maps,
+    so only row numbers and a handful of per-column vectors cross process
+    boundaries. Ranking makes two passes over equal contiguous shards of
+    the candidate rows:
+
+    1. Each shard returns its per-column sum of squares, minimum and maximum.
+       The parent combines them into the global vector normalisation and,
+       scaling the extremes by ``weight / norm``, the ideal solutions.
+    2. Each shard scores its rows against the global values and returns its
+       local top k; the parent merges them into the global top k.
+
+    Scores match single-process TOPSIS up to floating-point summation order
+    of the normalisation, and ties are broken by candidate order as well.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: Number of worker processes and shards (defaults to the CPU count)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.topsis_service = TOPSISService()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        # catalog version -> [matrix file path, rankings in progress]
+        self._published: Dict[int, list] = {}
+        self._current_version: Optional[int] = None
+
+    def _acquire(self, catalog: Catalog) -> str:
+        """Get the shared matrix file of a catalog version, publishing it on first use."""
+        if catalog.version not in self._published:
+            fd, path = tempfile.mkstemp(prefix="decision-matrix-", suffix=".npy", dir=_SHARED_DIRECTORY)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(catalog.decision_matrix, dtype=np.float64))
+            self._published[catalog.version] = [path, 0]
+            logger.info(f"Published decision matrix of catalog version {catalog.version} to {path}")
+
+            if self._current_version is None or catalog.version > self._current_version:
+                self._current_version = catalog.version
+
+        entry = self._published[catalog.version]
+        entry[1] += 1
+        return entry[0]
+
+    def _release(self, version: int):
+        """Drop a ranking's hold on a matrix file, removing superseded unused files."""
+        self._published[version][1] -= 1
+        for stale in [v for v, (_, in_use) in self._published.items()
+                      if v != self._current_version and in_use == 0]:
+            os.unlink(self._published.pop(stale)[0])
+
+    async def rank_top_k(self, catalog: Catalog, candidate_rows: np.ndarray, k: int,
+                         weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank candidate rows of a catalog and keep only the k best.
+
+        Args:
+            catalog: Catalog whose decision matrix holds the candidates
+            candidate_rows: Catalog rows to rank
+            k: Number of rows to return
+            weights: Optional custom weights for criteria
+
+        Returns:
+            Tuple of (positions in ``candidate_rows``, scores) for the top k
+            rows in ranking order, like ``TOPSISService.rank_top_k``
+        """
+        if len(candidate_rows) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        weight_vector = self.topsis_service.weight_vector(weights or self.topsis_service.default_weights)
+        bounds = np.linspace(0, len(candidate_rows), min(self.workers, len(candidate_rows)) + 1).astype(np.intp)
+        shards: List[np.ndarray] = [candidate_rows[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        loop = asyncio.get_running_loop()
+        path = self._acquire(catalog)
+        try:
+            statistics = await asyncio.gather(*[
+                loop.run_in_executor(self._executor, _shard_statistics, path, shard) for shard in shards
+            ])
+            norms = np.sqrt(np.sum([squares for squares, _, _ in statistics], axis=0))
+            column_min = np.min([low for _, low, _ in statistics], axis=0)
+            column_max = np.max([high for _, _, high in statistics], axis=0)
+
+            # Weighting is a positive scaling per column, so it maps the raw
+            # extremes onto the extremes of the weighted matrix
+            positive_ideal, negative_ideal = self.topsis_service.find_ideal_solutions(
+                (np.stack([column_min, column_max]) / norms) * weight_vector
+            )
+
+            shard_results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    self._executor, _shard_top_k, path, shard, norms, weight_vector,
+                    positive_ideal, negative_ideal, k
+                )
+                for shard in shards
+            ])
+        finally:
+            self._release(catalog.version)
+
+        # Merge the local winners in candidate order so ties resolve as in one pass
+        positions = np.concatenate([top_rows + start for (top_rows, _), start in zip(shard_results, bounds)])
+        scores = np.concatenate([shard_scores for _, shard_scores in shard_results])
+        order = np.argsort(positions, kind="stable")
+        positions, scores = positions[order], scores[order]
+        top = self.topsis_service.select_top_k(scores, k)
+
+        logger.info(
+            f"Ranked {len(candidate_rows)} destinations using TOPSIS across {len(shards)} shards (top {k})"
+        )
+        return positions[top], scores[top]
+
+    def shutdown(self):
+        """Stop the worker processes and remove the shared matrix files."""
+        self._executor.shutdown(wait=True)
+        for path, _ in self._published.values():
+            os.unlink(path)
+        self._published.clear()
@@ -3,19 +3,34 @@ import pandas as pd
 from typing import List, Dict, Tuple, Optional
 from app.models.destination import Destination, UserFilters, TOPSISWeights
 from app.core.config import settings
+from app.core.metrics import span
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the elements of one stacked (profiles x alternatives x criteria)
+# block in batch scoring, to keep its temporaries around 64 MB
+_BATCH_CHUNK_ELEMENTS = 1 << 23
+
+# For most criteria, higher is better (benefit criteria)
+# For budget, lower is better (cost criteria)
+BENEFIT_CRITERIA = ['popularity_score', 'climate_score', 'activity_score',
+                    'terrain_score', 'safety_score', 'accessibility_score']
+
 class TOPSISService:
     """
     Implementation of TOPSIS (Technique for Order Preference by Similarity to an Ideal Solution)
     algorithm for multi-criteria decision making in travel destination ranking.
+    
+    The service is stateless: weights are passed to every ranking call and no
+    method mutates the instance, so a single instance can be shared across
+    concurrent requests and thread pools without locking.
     """
     
     def __init__(self):
-        self.weights = settings.DEFAULT_WEIGHTS
-        self.criteria = list(self.weights.keys())
+        self.default_weights: Dict[str, float] = dict(settings.DEFAULT_WEIGHTS)
+        self.criteria = list(self.default_weights.keys())
+        self.is_cost = np.array([criteria not in BENEFIT_CRITERIA for criteria in self.criteria])
     
     def normalize_matrix(self, decision_matrix: np.ndarray) -> np.ndarray:
         """
@@ -32,6 +47,18 @@ class TOPSISService:
         normalized_matrix = decision_matrix / np.sqrt(squared_sum)
         return normalized_matrix
     
+    def weight_vector(self, weights: Dict[str, float]) -> np.ndarray:
+        """
+        Convert a weights dictionary to a vector in criteria order.
+        
+        Args:
+            weights: Dictionary of criteria weights
+            
+        Returns:
+            Weight vector aligned with the decision matrix columns
+        """
+        return np.array([weights[criteria] for criteria in self.criteria], dtype=np.float64)
+    
     def apply_weights(self, normalized_matrix: np.ndarray, weights: Dict[str, float]) -> np.ndarray:
         """
         Apply weights to the normalized decision matrix.
@@ -43,7 +70,7 @@ class TOPSISService:
         Returns:
             Weighted normalized matrix
         """
-        weight_vector = np.array([weights[criteria] for criteria in self.criteria])
+        weight_vector = self.weight_vector(weights)
         weighted_matrix = normalized_matrix * weight_vector
         return weighted_matrix
     
@@ -52,27 +79,17 @@ class TOPSISService:
         Find positive and negative ideal solutions.
         
         Args:
-            weighted_matrix: Weighted normalized matrix
+            weighted_matrix: Weighted normalized matrix (alternatives x criteria),
+                or a stack of them (profiles x alternatives x criteria)
             
         Returns:
-            Tuple of (positive_ideal, negative_ideal)
+            Tuple of (positive_ideal, negative_ideal), one row per stacked matrix
         """
-        # For most criteria, higher is better (benefit criteria)
-        # For budget, lower is better (cost criteria)
-        benefit_criteria = ['popularity_score', 'climate_score', 'activity_score', 
-                          'terrain_score', 'safety_score', 'accessibility_score']
-        cost_criteria = ['budget_score']
+        column_max = np.max(weighted_matrix, axis=-2)
+        column_min = np.min(weighted_matrix, axis=-2)
         
-        positive_ideal = np.zeros(weighted_matrix.shape[1])
-        negative_ideal = np.zeros(weighted_matrix.shape[1])
-        
-        for i, criteria in enumerate(self.criteria):
-            if criteria in benefit_criteria:
-                positive_ideal[i] = np.max(weighted_matrix[:, i])
-                negative_ideal[i] = np.min(weighted_matrix[:, i])
-            else:  # cost criteria
-                positive_ideal[i] = np.min(weighted_matrix[:, i])
-                negative_ideal[i] = np.max(weighted_matrix[:, i])
+        positive_ideal = np.where(self.is_cost, column_min, column_max)
+        negative_ideal = np.where(self.is_cost, column_max, column_min)
         
         return positive_ideal, negative_ideal
     
@@ -83,15 +100,17 @@ class TOPSISService:
         Calculate distances to positive and negative ideal solutions.
         
         Args:
-            weighted_matrix: Weighted normalized matrix
+            weighted_matrix: Weighted normalized matrix, optionally stacked
             positive_ideal: Positive ideal solution
             negative_ideal: Negative ideal solution
             
         Returns:
             Tuple of (positive_distances, negative_distances)
         """
-        positive_distances = np.sqrt(np.sum((weighted_matrix - positive_ideal) ** 2, axis=1))
-        negative_distances = np.sqrt(np.sum((weighted_matrix - negative_ideal) ** 2, axis=1))
+        positive_ideal = np.expand_dims(positive_ideal, -2)
+        negative_ideal = np.expand_dims(negative_ideal, -2)
+        positive_distances = np.sqrt(np.sum((weighted_matrix - positive_ideal) ** 2, axis=-1))
+        negative_distances = np.sqrt(np.sum((weighted_matrix - negative_ideal) ** 2, axis=-1))
         
         return positive_distances, negative_distances
     
@@ -114,6 +133,52 @@ class TOPSISService:
         relative_closeness = negative_distances / denominator
         return relative_closeness
     
+    def ideal_deviations(self, decision_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Precompute the weight-independent part of the TOPSIS distances.
+        
+        Every weight scales one column of the normalized matrix, so the ideal
+        solutions of the weighted matrix are the weighted ideals of the
+        normalized one, and a squared distance to an ideal is
+        ``sum_j w_j ** 2 * (n_ij - ideal_j) ** 2``.
+        
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            
+        Returns:
+            Tuple of (positive_deviations, negative_deviations): the squared
+            per-criterion deviations of the normalized matrix from its
+            unweighted ideal solutions
+        """
+        with span("normalize"):
+            normalized_matrix = self.normalize_matrix(decision_matrix)
+        with span("ideal"):
+            positive_ideal, negative_ideal = self.find_ideal_solutions(normalized_matrix)
+        return (normalized_matrix - positive_ideal) ** 2, (normalized_matrix - negative_ideal) ** 2
+    
+    def score_deviations(self, positive_deviations: np.ndarray, negative_deviations: np.ndarray,
+                         weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Compute TOPSIS relative closeness from precomputed ideal deviations.
+        
+        Costs one matrix-vector product per ideal, so re-scoring the same
+        alternatives with new weights skips normalization and ideal search.
+        
+        Args:
+            positive_deviations: Squared deviations from the positive ideal
+            negative_deviations: Squared deviations from the negative ideal
+            weights: Optional custom weights for criteria
+            
+        Returns:
+            Relative closeness score per row (as from ``score_matrix``)
+        """
+        squared_weights = self.weight_vector(weights or self.default_weights) ** 2
+        with span("distance"):
+            positive_distances = np.sqrt(positive_deviations @ squared_weights)
+            negative_distances = np.sqrt(negative_deviations @ squared_weights)
+        with span("closeness"):
+            return self.calculate_relative_closeness(positive_distances, negative_distances)
+    
     def prepare_decision_matrix(self, destinations: List[Destination]) -> np.ndarray:
         """
         Prepare decision matrix from destination data.
@@ -122,7 +187,8 @@ class TOPSISService:
             destinations: List of destination objects
             
         Returns:
-            Decision matrix as numpy array
+            Decision matrix as a float64 numpy array with one row per destination
+            and one column per criterion (in ``self.criteria`` order)
         """
         matrix_data = []
         
@@ -144,7 +210,7 @@ class TOPSISService:
             ]
             matrix_data.append(row)
         
-        return np.array(matrix_data)
+        return np.array(matrix_data, dtype=np.float64).reshape(-1, len(self.criteria))
     
     def _budget_to_score(self, budget_range: str) -> float:
         """Convert budget range to numerical score (lower is better for budget)."""
@@ -200,55 +266,214 @@ class TOPSISService:
         }
         return terrain_scores.get(terrain, 6.0)
     
-    def rank_destinations(self, destinations: List[Destination], 
-                         weights: Optional[Dict[str, float]] = None) -> List[Tuple[Destination, float]]:
+    def score_matrix(self, decision_matrix: np.ndarray,
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
         """
-        Rank destinations using TOPSIS algorithm.
+        Compute TOPSIS relative closeness for every row of a decision matrix.
         
         Args:
-            destinations: List of destination objects
+            decision_matrix: Decision matrix (one row per alternative)
             weights: Optional custom weights for criteria
             
         Returns:
-            List of (destination, score) tuples sorted by score (descending)
+            Relative closeness score per row
         """
-        if not destinations:
-            return []
-        
         # Use custom weights if provided, otherwise use defaults
-        if weights:
-            self.weights = weights
-        
-        # Prepare decision matrix
-        decision_matrix = self.prepare_decision_matrix(destinations)
+        weights = weights or self.default_weights
         
         # Step 1: Normalize the decision matrix
-        normalized_matrix = self.normalize_matrix(decision_matrix)
+        with span("normalize"):
+            normalized_matrix = self.normalize_matrix(decision_matrix)
         
         # Step 2: Apply weights
-        weighted_matrix = self.apply_weights(normalized_matrix, self.weights)
+        with span("weight"):
+            weighted_matrix = self.apply_weights(normalized_matrix, weights)
         
         # Step 3: Find ideal solutions
-        positive_ideal, negative_ideal = self.find_ideal_solutions(weighted_matrix)
+        with span("ideal"):
+            positive_ideal, negative_ideal = self.find_ideal_solutions(weighted_matrix)
         
         # Step 4: Calculate distances
-        positive_distances, negative_distances = self.calculate_distances(
-            weighted_matrix, positive_ideal, negative_ideal
-        )
+        with span("distance"):
+            positive_distances, negative_distances = self.calculate_distances(
+                weighted_matrix, positive_ideal, negative_ideal
+            )
         
         # Step 5: Calculate relative closeness
-        relative_closeness = self.calculate_relative_closeness(
-            positive_distances, negative_distances
+        with span("closeness"):
+            return self.calculate_relative_closeness(
+                positive_distances, negative_distances
+            )
+    
+    def score_matrix_batch(self, decision_matrix: np.ndarray,
+                           weight_matrix: np.ndarray) -> np.ndarray:
+        """
+        Compute TOPSIS relative closeness for many weight profiles at once.
+        
+        The decision matrix is normalized a single time and the weighted
+        matrices of all profiles are stacked into one
+        profiles x alternatives x criteria computation, processed in
+        memory-bounded chunks of profiles.
+        
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            weight_matrix: One row of criteria weights per profile
+            
+        Returns:
+            Relative closeness scores (profiles x alternatives)
+        """
+        with span("normalize"):
+            normalized_matrix = self.normalize_matrix(decision_matrix)
+        n_alternatives, n_criteria = normalized_matrix.shape
+        chunk_size = max(1, _BATCH_CHUNK_ELEMENTS // max(1, n_alternatives * n_criteria))
+        
+        relative_closeness = np.empty((len(weight_matrix), n_alternatives))
+        for start in range(0, len(weight_matrix), chunk_size):
+            weights = weight_matrix[start:start + chunk_size]
+            with span("weight"):
+                weighted_matrix = normalized_matrix[np.newaxis, :, :] * weights[:, np.newaxis, :]
+            with span("ideal"):
+                positive_ideal, negative_ideal = self.find_ideal_solutions(weighted_matrix)
+            with span("distance"):
+                positive_distances, negative_distances = self.calculate_distances(
+                    weighted_matrix, positive_ideal, negative_ideal
+                )
+            with span("closeness"):
+                relative_closeness[start:start + chunk_size] = self.calculate_relative_closeness(
+                    positive_distances, negative_distances
+                )
+        
+        logger.info(
+            f"Scored {n_alternatives} destinations for {len(weight_matrix)} weight profiles using TOPSIS"
         )
+        return relative_closeness
+    
+    def rank_matrix(self, decision_matrix: np.ndarray,
+                    weights: Optional[Dict[str, float]] = None) -> List[Tuple[int, float]]:
+        """
+        Rank the rows of a precomputed decision matrix using TOPSIS.
         
-        # Step 6: Rank destinations
-        ranked_destinations = list(zip(destinations, relative_closeness))
-        ranked_destinations.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            weights: Optional custom weights for criteria
+            
+        Returns:
+            List of (row index, score) tuples sorted by score (descending)
+        """
+        if len(decision_matrix) == 0:
+            return []
+        
+        relative_closeness = self.score_matrix(decision_matrix, weights)
+        
+        # Step 6: Rank rows (stable, so ties keep their original order)
+        with span("sort"):
+            order = np.argsort(-relative_closeness, kind="stable")
+        
+        logger.info(f"Ranked {len(decision_matrix)} destinations using TOPSIS")
+        
+        return [(int(row), float(relative_closeness[row])) for row in order]
+    
+    def select_top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Select the rows with the k highest scores, best first.
+        
+        Uses an O(n) ``np.argpartition`` selection instead of a full sort. Ties
+        are broken by row index, matching a stable descending sort.
+        
+        Args:
+            scores: Score per row
+            k: Number of rows to select
+            
+        Returns:
+            Row indices of the top k scores in ranking order
+        """
+        if k >= len(scores):
+            return np.argsort(-scores, kind="stable")
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        
+        threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        if np.isnan(threshold):
+            return np.argsort(-scores, kind="stable")[:k]
+        
+        # argpartition may keep any of the rows tied with the k-th score,
+        # so take those with the lowest row index explicitly
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+        selected = np.concatenate([above, tied])
+        
+        return selected[np.lexsort((selected, -scores[selected]))]
+    
+    def rank_top_k(self, decision_matrix: np.ndarray, k: int,
+                   weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank the rows of a decision matrix and keep only the k best.
+        
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            k: Number of rows to return
+            weights: Optional custom weights for criteria
+            
+        Returns:
+            Tuple of (row indices, scores) for the top k rows in ranking order
+        """
+        if len(decision_matrix) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
         
-        logger.info(f"Ranked {len(destinations)} destinations using TOPSIS")
+        relative_closeness = self.score_matrix(decision_matrix, weights)
+        with span("sort"):
+            top_rows = self.select_top_k(relative_closeness, k)
+        
+        logger.info(f"Ranked {len(decision_matrix)} destinations using TOPSIS (top {k})")
+        
+        return top_rows, relative_closeness[top_rows]
+    
+    def rank_top_k_batch(self, decision_matrix: np.ndarray, weight_matrix: np.ndarray,
+                         ks: List[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Rank the rows of one decision matrix for many weight profiles.
+        
+        Args:
+            decision_matrix: Decision matrix (one row per alternative)
+            weight_matrix: One row of criteria weights per profile
+            ks: Number of rows to return for each profile
+            
+        Returns:
+            One (row indices, scores) tuple per profile, as from ``rank_top_k``
+        """
+        if len(decision_matrix) == 0:
+            return [(np.empty(0, dtype=np.intp), np.empty(0)) for _ in ks]
+        
+        scores = self.score_matrix_batch(decision_matrix, weight_matrix)
+        results = []
+        with span("sort"):
+            for profile, k in enumerate(ks):
+                top_rows = self.select_top_k(scores[profile], k)
+                results.append((top_rows, scores[profile, top_rows]))
+        return results
+    
+    def rank_destinations(self, destinations: List[Destination], 
+                         weights: Optional[Dict[str, float]] = None) -> List[Tuple[Destination, float]]:
+        """
+        Rank destinations using TOPSIS algorithm.
+        
+        Args:
+            destinations: List of destination objects
+            weights: Optional custom weights for criteria
+            
+        Returns:
+            List of (destination, score) tuples sorted by score (descending)
+        """
+        if not destinations:
+            return []
+        
+        # Prepare decision matrix
+        with span("matrix_build"):
+            decision_matrix = self.prepare_decision_matrix(destinations)
         
-        return ranked_destinations
+        ranked_rows = self.rank_matrix(decision_matrix, weights)
+        return [(destinations[row], score) for row, score in ranked_rows]
     
     def get_weights_summary(self) -> Dict[str, float]:
-        """Get current weights configuration."""
-        return self.weights.copy() 
\ No newline at end of file
+        """Get default weights configuration."""
+        return self.default_weights.copy() 
\ No newline at end of file
@@ -0,0 +1,178 @@
+import gzip
+import hashlib
+import json
+from itertools import islice
+from typing import Any, Dict, Iterator, List, TextIO
+from pydantic import TypeAdapter, ValidationError
+from app.models.destination import Destination
+import logging
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Characters read from the catalog file per refill of the parse buffer
+READ_SIZE = 1 << 16
+
+_WHITESPACE = " \t\r\n"
+
+# Bytes of the BLAKE2b content digests identifying catalog versions
+DIGEST_SIZE = 16
+
+_destination_list = TypeAdapter(List[Destination])
+
+
+def file_digest(path: str) -> str:
+    """Hash the bytes of a catalog file, so identical copies get the same digest on any host."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def open_catalog(path: str) -> TextIO:
+    """Open a catalog file as text, transparently decompressing gzip."""
+    with open(path, "rb") as f:
+        magic = f.read(len(GZIP_MAGIC))
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+class _Buffer:
+    """Sliding window over a text stream for incremental JSON decoding."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read more text, dropping what was already consumed. Returns False at EOF."""
+        chunk = self.stream.read(READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+
+def _iter_json_array(buffer: _Buffer) -> Iterator[Dict[str, Any]]:
+    """Yield the elements of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    buffer.pos += 1  # opening bracket
+
+    if buffer.peek() == "]":
+        return
+
+    while True:
+        buffer.peek()
+        try:
+            record, end = decoder.raw_decode(buffer.text, buffer.pos)
+            complete = end < len(buffer.text) or buffer.eof
+        except json.JSONDecodeError:
+            if buffer.eof:
+                raise
+            complete = False
+
+        if not complete:
+            # The element may continue past the buffered text
+            buffer.fill()
+            continue
+
+        buffer.pos = end
+        yield record
+
+        separator = buffer.peek()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+        buffer.pos += 1
+
+
+def _iter_ndjson(buffer: _Buffer) -> Iterator[Dict[str, Any]]:
+    """Yield one record per non-empty line."""
+    pending = buffer.text[buffer.pos:]
+    while True:
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        chunk = buffer.stream.read(READ_SIZE)
+        if not chunk:
+            break
+        pending += chunk
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def iter_catalog_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream raw destination records from a catalog file.
+
+    Accepts a JSON array or newline-delimited JSON, optionally gzip
+    compressed, and never holds more than one buffer of raw text.
+
+    Args:
+        path: Catalog file path
+
+    Yields:
+        One record dictionary at a time
+    """
+    with open_catalog(path) as stream:
+        buffer = _Buffer(stream)
+        if buffer.peek() == "[":
+            yield from _iter_json_array(buffer)
+        else:
+            yield from _iter_ndjson(buffer)
+
+
+def _validate_chunk(records: List[Dict[str, Any]], first_record: int) -> List[Destination]:
+    """Validate a chunk of records, skipping (and logging) invalid ones."""
+    try:
+        return _destination_list.validate_python(records)
+    except ValidationError:
+        destinations = []
+        for offset, record in enumerate(records):
+            try:
+                destinations.append(Destination.model_validate(record))
+            except ValidationError as e:
+                logger.warning(f"Skipping invalid destination record #{first_record + offset}: {e}")
+        return destinations
+
+
+def load_destinations(path: str, chunk_size: int) -> List[Destination]:
+    """
+    Load and validate destinations from a catalog file in bounded chunks.
+
+    Args:
+        path: Catalog file path (JSON array or NDJSON, optionally gzip compressed)
+        chunk_size: Number of raw records validated at a time
+
+    Returns:
+        The valid destinations, in file order
+    """
+    destinations: List[Destination] = []
+    records = iter_catalog_records(path)
+    first_record = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return destinations
+        destinations.extend(_validate_chunk(chunk, first_record))
+        first_record += len(chunk)
@@ -0,0 +1,368 @@
+import argparse
+import gzip
+import json
+from typing import Any, Dict, Iterator, List, Sequence, TextIO
+import numpy as np
+from pydantic import TypeAdapter
+from app.models.destination import (
+    ActivityType, BudgetRange, ClimateType, Continent, Destination, PackageType, TerrainType
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Records generated from one random stream; fixed so the output for a seed
+# does not depend on how many records are requested or how they are consumed
+GENERATION_CHUNK_SIZE = 1 << 14
+
+OUTPUT_FORMATS = ("json", "ndjson", "snapshot")
+
+CONTINENT_WEIGHTS: Dict[Continent, float] = {
+    Continent.EUROPE: 0.28,
+    Continent.ASIA: 0.27,
+    Continent.NORTH_AMERICA: 0.14,
+    Continent.AFRICA: 0.12,
+    Continent.SOUTH_AMERICA: 0.10,
+    Continent.OCEANIA: 0.08,
+    Continent.ANTARCTICA: 0.01,
+}
+
+CLIMATE_WEIGHTS: Dict[Continent, Dict[ClimateType, float]] = {
+    Continent.EUROPE: {ClimateType.TEMPERATE: 0.5, ClimateType.SUNNY: 0.25, ClimateType.SNOWY: 0.15,
+                       ClimateType.RAINY: 0.1},
+    Continent.ASIA: {ClimateType.TROPICAL: 0.35, ClimateType.TEMPERATE: 0.3, ClimateType.DESERT: 0.1,
+                     ClimateType.SNOWY: 0.1, ClimateType.RAINY: 0.1, ClimateType.SUNNY: 0.05},
+    Continent.NORTH_AMERICA: {ClimateType.TEMPERATE: 0.4, ClimateType.SUNNY: 0.25, ClimateType.SNOWY: 0.15,
+                              ClimateType.DESERT: 0.1, ClimateType.TROPICAL: 0.1},
+    Continent.AFRICA: {ClimateType.DESERT: 0.35, ClimateType.TROPICAL: 0.35, ClimateType.SUNNY: 0.25,
+                       ClimateType.TEMPERATE: 0.05},
+    Continent.SOUTH_AMERICA: {ClimateType.TROPICAL: 0.5, ClimateType.TEMPERATE: 0.25, ClimateType.RAINY: 0.1,
+                              ClimateType.SNOWY: 0.05, ClimateType.DESERT: 0.1},
+    Continent.OCEANIA: {ClimateType.SUNNY: 0.4, ClimateType.TROPICAL: 0.35, ClimateType.TEMPERATE: 0.2,
+                        ClimateType.DESERT: 0.05},
+    Continent.ANTARCTICA: {ClimateType.SNOWY: 1.0},
+}
+
+TERRAIN_WEIGHTS: Dict[ClimateType, Dict[TerrainType, float]] = {
+    ClimateType.SUNNY: {TerrainType.BEACH: 0.4, TerrainType.URBAN: 0.3, TerrainType.ISLAND: 0.2,
+                        TerrainType.MOUNTAIN: 0.1},
+    ClimateType.SNOWY: {TerrainType.MOUNTAIN: 0.7, TerrainType.FOREST: 0.2, TerrainType.URBAN: 0.1},
+    ClimateType.RAINY: {TerrainType.FOREST: 0.5, TerrainType.URBAN: 0.3, TerrainType.MOUNTAIN: 0.2},
+    ClimateType.TEMPERATE: {TerrainType.URBAN: 0.5, TerrainType.MOUNTAIN: 0.2, TerrainType.FOREST: 0.2,
+                            TerrainType.BEACH: 0.1},
+    ClimateType.TROPICAL: {TerrainType.BEACH: 0.35, TerrainType.ISLAND: 0.35, TerrainType.FOREST: 0.2,
+                           TerrainType.URBAN: 0.1},
+    ClimateType.DESERT: {TerrainType.DESERT: 0.75, TerrainType.URBAN: 0.15, TerrainType.MOUNTAIN: 0.1},
+}
+
+# Relative appeal of each activity by terrain (unlisted pairs weigh 1)
+ACTIVITY_AFFINITY: Dict[TerrainType, Dict[ActivityType, float]] = {
+    TerrainType.BEACH: {ActivityType.BEACH: 12, ActivityType.RELAXATION: 6, ActivityType.NIGHTLIFE: 3},
+    TerrainType.ISLAND: {ActivityType.BEACH: 10, ActivityType.RELAXATION: 8, ActivityType.ADVENTURE: 3},
+    TerrainType.MOUNTAIN: {ActivityType.HIKING: 12, ActivityType.ADVENTURE: 8, ActivityType.ROAD_TRIP: 3},
+    TerrainType.FOREST: {ActivityType.HIKING: 10, ActivityType.ADVENTURE: 6, ActivityType.RELAXATION: 3},
+    TerrainType.URBAN: {ActivityType.CULTURAL: 10, ActivityType.FOOD: 8, ActivityType.SHOPPING: 8,
+                        ActivityType.NIGHTLIFE: 6},
+    TerrainType.DESERT: {ActivityType.ADVENTURE: 10, ActivityType.ROAD_TRIP: 8, ActivityType.CULTURAL: 3},
+}
+
+# Reported weather by climate; weather_type is free text, usually but not always the climate
+WEATHER_WEIGHTS: Dict[ClimateType, Dict[str, float]] = {
+    ClimateType.SUNNY: {"sunny": 0.6, "dry": 0.2, "windy": 0.1, "mild": 0.1},
+    ClimateType.SNOWY: {"snowy": 0.6, "cold": 0.25, "windy": 0.1, "mild": 0.05},
+    ClimateType.RAINY: {"rainy": 0.55, "humid": 0.2, "mild": 0.15, "windy": 0.1},
+    ClimateType.TEMPERATE: {"temperate": 0.5, "mild": 0.25, "rainy": 0.15, "sunny": 0.1},
+    ClimateType.TROPICAL: {"tropical": 0.55, "humid": 0.3, "rainy": 0.15},
+    ClimateType.DESERT: {"desert": 0.55, "dry": 0.3, "sunny": 0.1, "windy": 0.05},
+}
+
+# Number of image URLs per destination (the bundled catalog has two each)
+IMAGE_COUNT_WEIGHTS: Dict[int, float] = {1: 0.15, 2: 0.35, 3: 0.3, 4: 0.15, 5: 0.05}
+
+BUDGET_WEIGHTS: Dict[BudgetRange, float] = {
+    BudgetRange.LOW: 0.25,
+    BudgetRange.MEDIUM: 0.4,
+    BudgetRange.HIGH: 0.25,
+    BudgetRange.LUXURY: 0.1,
+}
+
+PACKAGE_WEIGHTS: Dict[PackageType, float] = {
+    PackageType.FAMILY: 0.3,
+    PackageType.SOLO: 0.25,
+    PackageType.HONEYMOON: 0.2,
+    PackageType.GROUP: 0.15,
+    PackageType.BUSINESS: 0.1,
+}
+
+# (south, north, west, east) bounds of the generated coordinates
+CONTINENT_BOUNDS: Dict[Continent, tuple] = {
+    Continent.EUROPE: (36.0, 70.0, -10.0, 40.0),
+    Continent.ASIA: (-10.0, 55.0, 60.0, 145.0),
+    Continent.NORTH_AMERICA: (15.0, 65.0, -130.0, -60.0),
+    Continent.AFRICA: (-35.0, 35.0, -17.0, 50.0),
+    Continent.SOUTH_AMERICA: (-55.0, 10.0, -80.0, -35.0),
+    Continent.OCEANIA: (-45.0, -5.0, 110.0, 180.0),
+    Continent.ANTARCTICA: (-85.0, -65.0, -180.0, 180.0),
+}
+
+SEASONS = ["March to May", "June to September", "October to April", "April to June, September to October",
+           "November to April", "December to March", "Year round"]
+
+_SYLLABLES = ["ba", "ka", "lo", "mi", "ra", "to", "sen", "dor", "val", "ri", "na", "por", "sa", "le",
+              "mon", "ta", "vi", "gra", "chi", "an", "el", "os", "ku", "zan"]
+
+COUNTRIES_PER_CONTINENT = 40
+
+_destination_list = TypeAdapter(List[Destination])
+
+
+def _choice(rng: np.random.Generator, weights: Dict[Any, float], size: int) -> np.ndarray:
+    """Draw indices into ``list(weights)`` with the given relative weights."""
+    p = np.array(list(weights.values()), dtype=np.float64)
+    return rng.choice(len(p), size=size, p=p / p.sum())
+
+
+def _conditional_choice(rng: np.random.Generator, parents: np.ndarray, parent_values: Sequence,
+                        table: Dict[Any, Dict[Any, float]], values: Sequence) -> np.ndarray:
+    """Draw one of ``values`` per row from the weights conditioned on the row's parent value."""
+    result = np.empty(len(parents), dtype=np.intp)
+    position = {value: index for index, value in enumerate(values)}
+    for parent_index, parent in enumerate(parent_values):
+        rows = np.flatnonzero(parents == parent_index)
+        if len(rows):
+            weights = table[parent]
+            lookup = np.array([position[value] for value in weights])
+            result[rows] = lookup[_choice(rng, weights, len(rows))]
+    return result
+
+
+def _weighted_samples(rng: np.random.Generator, weights: np.ndarray, counts: np.ndarray) -> List[np.ndarray]:
+    """
+    Draw ``counts[i]`` distinct items per row, favouring heavier items.
+
+    Uses the Gumbel top-k trick: adding Gumbel noise to the log-weights and
+    keeping the k largest samples k items without replacement in one
+    vectorized step.
+    """
+    keys = np.log(weights) + rng.gumbel(size=weights.shape)
+    order = np.argsort(-keys, axis=1)
+    return [order[row, :count] for row, count in enumerate(counts)]
+
+
+def _place_name(rng: np.random.Generator, size: int) -> List[str]:
+    """Build pronounceable place names from random syllables."""
+    syllables = rng.integers(0, len(_SYLLABLES), size=(size, 3))
+    lengths = rng.integers(2, 4, size=size)
+    return ["".join(_SYLLABLES[s] for s in row[:length]).capitalize()
+            for row, length in zip(syllables, lengths)]
+
+
+def _generate_chunk(seed: int, chunk: int, count: int) -> List[Dict[str, Any]]:
+    """
+    Generate the first ``count`` records of one chunk from its own random stream.
+
+    Attributes are always drawn for the whole chunk, so a truncated chunk
+    holds the same records as the start of a complete one.
+    """
+    rng = np.random.default_rng([seed, chunk])
+    first = chunk * GENERATION_CHUNK_SIZE
+    size = GENERATION_CHUNK_SIZE
+
+    continents = list(CONTINENT_WEIGHTS)
+    climates, terrains, activities = list(ClimateType), list(TerrainType), list(ActivityType)
+    budgets, packages = list(BUDGET_WEIGHTS), list(PACKAGE_WEIGHTS)
+
+    continent = _choice(rng, CONTINENT_WEIGHTS, size)
+    climate = _conditional_choice(rng, continent, continents, CLIMATE_WEIGHTS, climates)
+    terrain = _conditional_choice(rng, climate, climates, TERRAIN_WEIGHTS, terrains)
+    budget = _choice(rng, BUDGET_WEIGHTS, size)
+    country = rng.integers(0, COUNTRIES_PER_CONTINENT, size=size)
+
+    affinity = np.ones((len(terrains), len(activities)))
+    for terrain_index, terrain_type in enumerate(terrains):
+        for activity, weight in ACTIVITY_AFFINITY.get(terrain_type, {}).items():
+            affinity[terrain_index, activities.index(activity)] = weight
+    activity_sets = _weighted_samples(rng, affinity[terrain], rng.integers(1, 6, size=size))
+
+    package_weights = np.tile(list(PACKAGE_WEIGHTS.values()), (size, 1))
+    package_sets = _weighted_samples(rng, package_weights, rng.integers(1, 4, size=size))
+
+    # Popularity has a long tail of famous places; accessibility follows popularity
+    popularity = np.clip(10 * rng.beta(2.0, 3.0, size=size) + 1.5 * rng.random(size), 0, 10)
+    safety = np.clip(rng.normal(7.2, 1.5, size=size), 0, 10)
+    accessibility = np.clip(0.6 * popularity + rng.normal(3.0, 1.2, size=size), 0, 10)
+
+    bounds = np.array([CONTINENT_BOUNDS[c] for c in continents])[continent]
+    latitude = bounds[:, 0] + (bounds[:, 1] - bounds[:, 0]) * rng.random(size)
+    longitude = bounds[:, 2] + (bounds[:, 3] - bounds[:, 2]) * rng.random(size)
+    season = rng.integers(0, len(SEASONS), size=size)
+    names = _place_name(rng, size)
+
+    # Drawn last, so the other attributes of a seed stay as they were
+    weathers = list(dict.fromkeys(w for table in WEATHER_WEIGHTS.values() for w in table))
+    weather = _conditional_choice(rng, climate, climates, WEATHER_WEIGHTS, weathers)
+    image_counts = np.array(list(IMAGE_COUNT_WEIGHTS))[_choice(rng, IMAGE_COUNT_WEIGHTS, size)]
+    photo_times = rng.integers(1_400_000_000_000, 1_700_000_000_000, size=(size, max(IMAGE_COUNT_WEIGHTS)))
+    photo_ids = rng.integers(0, 1 << 48, size=(size, max(IMAGE_COUNT_WEIGHTS)))
+
+    records = []
+    for row in range(count):
+        index = first + row
+        continent_value = continents[continent[row]].value
+        climate_value = climates[climate[row]].value
+        terrain_value = terrains[terrain[row]].value
+        country_name = f"{continent_value.replace('_', ' ').title()} {country[row] + 1}"
+        records.append({
+            "id": f"dest-{index:09d}",
+            "name": names[row],
+            "country": country_name,
+            "continent": continent_value,
+            "climate": climate_value,
+            "terrain": terrain_value,
+            "activities": [activities[a].value for a in activity_sets[row]],
+            "budget_range": budgets[budget[row]].value,
+            "popularity_score": round(float(popularity[row]), 1),
+            "safety_score": round(float(safety[row]), 1),
+            "accessibility_score": round(float(accessibility[row]), 1),
+            "weather_type": weathers[weather[row]],
+            "package_type": [packages[p].value for p in package_sets[row]],
+            "images": [
+                f"https://images.unsplash.com/photo-{photo_times[row, i]}-{photo_ids[row, i]:012x}?w=800"
+                for i in range(image_counts[row])
+            ],
+            "booking_url": f"https://example.com/destinations/dest-{index:09d}",
+            "latitude": round(float(latitude[row]), 4),
+            "longitude": round(float(longitude[row]), 4),
+            "description": f"A {climate_value} {terrain_value} destination in {country_name}.",
+            "best_time_to_visit": SEASONS[season[row]],
+        })
+    return records
+
+
+def generate_records(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate synthetic destination records.
+
+    Records are valid ``Destination`` data with correlated, skewed
+    distributions: climates depend on the continent, terrains and weather
+    on the climate, activities on the terrain, and accessibility on
+    popularity. Each record carries one to five image URLs, like the
+    bundled catalog.
+    Output is identical for the same seed, and the first n records of a
+    longer run equal a run of n records. Records are produced in chunks of
+    ``GENERATION_CHUNK_SIZE``, so memory use does not grow with ``count``.
+
+    Args:
+        count: Number of records
+        seed: Random seed
+
+    Yields:
+        One record dictionary at a time
+    """
+    for chunk in range((count + GENERATION_CHUNK_SIZE - 1) // GENERATION_CHUNK_SIZE):
+        size = min(GENERATION_CHUNK_SIZE, count - chunk * GENERATION_CHUNK_SIZE)
+        yield from _generate_chunk(seed, chunk, size)
+
+
+def generate_destinations(count: int, seed: int = 0) -> List[Destination]:
+    """Generate validated synthetic destinations (see ``generate_records``)."""
+    destinations: List[Destination] = []
+    batch: List[Dict[str, Any]] = []
+    for record in generate_records(count, seed):
+        batch.append(record)
+        if len(batch) == GENERATION_CHUNK_SIZE:
+            destinations.extend(_destination_list.validate_python(batch))
+            batch = []
+    destinations.extend(_destination_list.validate_python(batch))
+    return destinations
+
+
+def _open_output(path: str) -> TextIO:
+    """Open an output file, gzip-compressed if its name ends in ``.gz``."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def write_json(path: str, records: Iterator[Dict[str, Any]]) -> int:
+    """
+    Stream records to a JSON array file.
+
+    Returns:
+        Number of written records
+    """
+    written = 0
+    with _open_output(path) as f:
+        f.write("[")
+        for record in records:
+            if written:
+                f.write(",\n")
+            f.write(json.dumps(record))
+            written += 1
+        f.write("]\n")
+    return written
+
+
+def write_ndjson(path: str, records: Iterator[Dict[str, Any]]) -> int:
+    """
+    Stream records to a newline-delimited JSON file.
+
+    Returns:
+        Number of written records
+    """
+    written = 0
+    with _open_output(path) as f:
+        for record in records:
+            f.write(json.dumps(record))
+            f.write("\n")
+            written += 1
+    return written
+
+
+def write_catalog(path: str, output_format: str, count: int, seed: int = 0) -> int:
+    """
+    Write a synthetic catalog.
+
+    ``json`` and ``ndjson`` are streamed with bounded memory at any size
+    (append ``.gz`` to the path to compress). ``snapshot`` builds the
+    catalog and its indexes in memory and writes a snapshot directory
+    (see ``CatalogSnapshot``); for catalogs larger than memory, write
+    NDJSON instead.
+
+    Args:
+        path: Output file (or directory for snapshots)
+        output_format: One of ``OUTPUT_FORMATS``
+        count: Number of destinations
+        seed: Random seed
+
+    Returns:
+        Number of written destinations
+    """
+    if output_format == "json":
+        return write_json(path, generate_records(count, seed))
+    if output_format == "ndjson":
+        return write_ndjson(path, generate_records(count, seed))
+    if output_format == "snapshot":
+        # Imported here: the service layer depends on this utilities package
+        from app.services.catalog import Catalog
+        from app.services.catalog_snapshot import write_snapshot
+
+        destinations = generate_destinations(count, seed)
+        catalog = Catalog.build(destinations, 0)
+        write_snapshot(path, destinations, catalog.decision_matrix,
+                       catalog.filter_index, catalog.search_index)
+        return len(destinations)
+    raise ValueError(f"Unknown output format {output_format!r}, expected one of {OUTPUT_FORMATS}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic destination catalog.")
+    parser.add_argument("output", help="Output file (.gz to compress) or snapshot directory")
+    parser.add_argument("--count", type=int, required=True, help="Number of destinations")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="ndjson", help="Output format")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    written = write_catalog(args.output, args.format, args.count, args.seed)
+    logger.info(f"Wrote {written} synthetic destinations to {args.output}")
@@ -0,0 +1,63 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, Tuple
+
+
+def _index(report: Dict[str, Any]) -> Dict[Tuple[str, str, int], Dict[str, Any]]:
+    """Key benchmark results by (stage, variant, size)."""
+    return {
+        (result["stage"], result["variant"] or "", result["size"]): result
+        for result in report["results"]
+    }
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], metric: str,
+            threshold: float) -> int:
+    """
+    Print the change of a latency metric between two benchmark reports.
+
+    Args:
+        baseline: Report of the reference commit
+        candidate: Report of the commit under test
+        metric: Result field to compare (e.g. "p50_ms")
+        threshold: Relative slowdown that counts as a regression (0.1 = 10%)
+
+    Returns:
+        Number of regressions
+    """
+    baseline_results, candidate_results = _index(baseline), _index(candidate)
+    regressions = 0
+    print(f"{'stage':<24} {'variant':<8} {'size':>9} {'baseline':>12} {'candidate':>12} {'change':>8}")
+    for key in sorted(baseline_results.keys() & candidate_results.keys(), key=lambda k: (k[2], k[0], k[1])):
+        before, after = baseline_results[key][metric], candidate_results[key][metric]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        stage, variant, size = key
+        print(f"{stage:<24} {variant:<8} {size:>9} {before:>12.3f} {after:>12.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two hot-path benchmark reports.")
+    parser.add_argument("baseline", help="JSON report of the reference commit")
+    parser.add_argument("candidate", help="JSON report of the commit under test")
+    parser.add_argument("--metric", default="p50_ms", help="Latency field to compare (default: p50_ms)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown reported as a regression (default: 0.1)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    if compare(baseline, candidate, args.metric, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.destination import UserFilters
+from app.services.catalog_snapshot import write_snapshot
+from app.services.destination_service import DestinationService
+from app.services.topsis_service import TOPSISService
+from app.utils.synthetic_catalog import write_catalog
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+BACKEND_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Filters of decreasing selectivity (share of the catalog they keep)
+FILTER_CASES: Dict[str, Dict[str, Any]] = {
+    "all": {},
+    "broad": {"budget_ranges": ["low", "medium"]},
+    "medium": {"continents": ["asia", "europe"], "climates": ["sunny", "temperate"]},
+    "narrow": {"continents": ["asia"], "climates": ["sunny"], "terrains": ["beach"], "min_safety": 7.0},
+}
+
+STAGES = [
+    "load_json", "load_snapshot", "filter_destinations", "prepare_decision_matrix",
+    "rank_destinations", "rank_top_k", "recommendations",
+]
+
+
+def _peak_rss_mb() -> float:
+    """Process high-water mark of resident memory, over the whole run so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Resident memory right now, or None where ``/proc`` is not available."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _measure(stage: str, size: int, fn: Callable[[], Any], repeat: int,
+             variant: Optional[str] = None, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Time repeated calls of ``fn`` and summarize their latency distribution.
+
+    ``rss_delta_mb`` is the change in resident memory across the stage,
+    i.e. what the stage keeps allocated; the process-wide peak is reported
+    once per catalog size instead, since it cannot be attributed to a stage.
+    """
+    rss_before = _current_rss_mb()
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    rss_after = _current_rss_mb()
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    result = {
+        "stage": stage,
+        "variant": variant,
+        "size": size,
+        "iterations": repeat,
+        "mean_ms": round(float(np.mean(latencies)), 4),
+        "min_ms": round(min(latencies), 4),
+        "p50_ms": round(float(p50), 4),
+        "p90_ms": round(float(p90), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(max(latencies), 4),
+        "rss_delta_mb": None if rss_before is None else round(rss_after - rss_before, 1),
+    }
+    print(f"{stage:<24} {variant or '':<8} {size:>9} p50={result['p50_ms']:.3f}ms "
+          f"p99={result['p99_ms']:.3f}ms", file=sys.stderr)
+    return result
+
+
+def run_size(size: int, repeat: int, stages: List[str], seed: int) -> List[Dict[str, Any]]:
+    """
+    Benchmark every selected stage on a synthetic catalog of one size.
+
+    Args:
+        size: Number of destinations
+        repeat: Timed iterations for the fast stages (slow ones use fewer)
+        stages: Stages to run
+        seed: Synthetic catalog seed
+
+    Returns:
+        One result dictionary per stage and variant
+    """
+    # Slow whole-catalog stages get fewer iterations on large catalogs
+    heavy_repeat = max(1, min(repeat, 1_000_000 // max(size, 1) * 3))
+    results: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory(prefix="travel-bench-") as directory:
+        catalog_path = os.path.join(directory, "destinations.json")
+        snapshot_path = os.path.join(directory, "snapshot")
+        write_catalog(catalog_path, "json", size, seed)
+
+        settings.DATA_FILE_PATH = catalog_path
+        settings.CATALOG_SNAPSHOT_PATH = ""
+        if "load_json" in stages:
+            results.append(_measure("load_json", size, DestinationService, heavy_repeat, warmup=0))
+
+        destination_service = DestinationService()
+        catalog = destination_service.catalog
+        destinations = list(catalog.destinations)
+        topsis_service = TOPSISService()
+
+        if "load_snapshot" in stages:
+            write_snapshot(snapshot_path, destinations, catalog.decision_matrix,
+                           catalog.filter_index, catalog.search_index)
+            settings.CATALOG_SNAPSHOT_PATH = snapshot_path
+            results.append(_measure("load_snapshot", size, DestinationService, repeat))
+            settings.CATALOG_SNAPSHOT_PATH = ""
+
+        if "filter_destinations" in stages:
+            for variant, filters in FILTER_CASES.items():
+                user_filters = UserFilters(**filters)
+                result = _measure(
+                    "filter_destinations", size,
+                    lambda: destination_service.filter_destinations(user_filters), repeat, variant
+                )
+                result["candidates"] = len(catalog.filter_indices(user_filters))
+                results.append(result)
+
+        if "prepare_decision_matrix" in stages:
+            results.append(_measure(
+                "prepare_decision_matrix", size,
+                lambda: topsis_service.prepare_decision_matrix(destinations), heavy_repeat
+            ))
+
+        if "rank_destinations" in stages:
+            results.append(_measure(
+                "rank_destinations", size,
+                lambda: topsis_service.rank_destinations(destinations), heavy_repeat
+            ))
+
+        if "rank_top_k" in stages:
+            results.append(_measure(
+                "rank_top_k", size,
+                lambda: topsis_service.rank_top_k(catalog.decision_matrix, 20), repeat
+            ))
+
+        if "recommendations" in stages:
+            results.extend(_measure_recommendations(size, repeat, destination_service))
+
+    return results
+
+
+def _measure_recommendations(size: int, repeat: int,
+                             destination_service: DestinationService) -> List[Dict[str, Any]]:
+    """
+    Time the full recommendation round trip through the FastAPI test client.
+
+    The app is wired to the benchmark's own service instead of running its
+    lifespan, which would load a second copy of the catalog and inflate the
+    peak RSS of the run.
+    """
+    from fastapi.testclient import TestClient
+    from app.api.routes.topsis import recommendation_cache
+    from app.main import app
+    from app.repositories.destination_repository import InMemoryDestinationRepository
+    from app.services.scoring_executor import ScoringExecutor
+    from app.services.sharded_ranking import ShardedRanker
+
+    app.state.destination_service = destination_service
+    app.state.destination_repository = InMemoryDestinationRepository(destination_service)
+    app.state.scoring_executor = ScoringExecutor(
+        settings.SCORING_EXECUTOR, settings.SCORING_MAX_WORKERS, settings.SCORING_MAX_QUEUE
+    )
+    app.state.sharded_ranker = None
+    if settings.SHARDED_RANKING_MIN_ROWS > 0:
+        app.state.sharded_ranker = ShardedRanker(settings.SHARDED_RANKING_WORKERS or None)
+
+    results = []
+    # Used without a ``with`` block, the test client does not run the lifespan
+    client = TestClient(app)
+    try:
+        for variant, filters in FILTER_CASES.items():
+            def round_trip():
+                # Measure ranking, not the result cache
+                recommendation_cache.clear()
+                response = client.post(
+                    f"{settings.API_V1_STR}/topsis/recommendations",
+                    json={"filters": filters, "max_results": 20}
+                )
+                response.raise_for_status()
+
+            results.append(_measure("recommendations", size, round_trip, repeat, variant))
+    finally:
+        client.close()
+        app.state.scoring_executor.shutdown()
+        if app.state.sharded_ranker is not None:
+            app.state.sharded_ranker.shutdown()
+    return results
+
+
+def _metadata(seed: int, repeat: int) -> Dict[str, Any]:
+    """Describe the environment so results from different commits can be compared."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIRECTORY,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the filter-and-rank hot path.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Synthetic catalog sizes (default: 1k, 100k, 1M)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES,
+                        help="Stages to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed iterations per stage")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic catalog seed")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.child:
+        results = run_size(args.sizes[0], args.repeat, args.stages, args.seed)
+        json.dump({"results": results, "peak_rss_mb": round(_peak_rss_mb(), 1)}, sys.stdout)
+        return
+
+    # One process per size, so peak RSS is measured per catalog size
+    results, peak_rss_mb = [], {}
+    for size in args.sizes:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.hot_path", "--child", "--sizes", str(size),
+             "--repeat", str(args.repeat), "--seed", str(args.seed), "--stages", *args.stages],
+            cwd=BACKEND_DIRECTORY, stdout=subprocess.PIPE, check=True
+        )
+        child = json.loads(completed.stdout)
+        results.extend(child["results"])
+        peak_rss_mb[str(size)] = child["peak_rss_mb"]
+
+    report = json.dumps({
+        "metadata": _metadata(args.seed, args.repeat),
+        "peak_rss_mb": peak_rss_mb,
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
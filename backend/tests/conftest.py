@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.http_cache import get_catalog_etag, set_catalog_etag
+from app.services.catalog import Catalog
+from app.utils.synthetic_catalog import generate_destinations, write_catalog
+
+# Large enough for every filter value to occur, small enough for brute-force checks
+CATALOG_SIZE = 2000
+CATALOG_SEED = 7
+
+
+@pytest.fixture(scope="session")
+def destinations():
+    return generate_destinations(CATALOG_SIZE, CATALOG_SEED)
+
+
+@pytest.fixture(scope="session")
+def catalog(destinations):
+    return Catalog.build(destinations, 1)
+
+
+@pytest.fixture(scope="session")
+def catalog_file(tmp_path_factory):
+    """JSON catalog file holding the same destinations as ``destinations``."""
+    path = str(tmp_path_factory.mktemp("catalog") / "destinations.json")
+    write_catalog(path, "json", CATALOG_SIZE, CATALOG_SEED)
+    return path
+
+
+@pytest.fixture(scope="session")
+def client(catalog_file):
+    """API test client over the synthetic catalog, with the app lifespan running."""
+    from app.main import app
+
+    saved = settings.DATA_FILE_PATH, settings.CATALOG_SNAPSHOT_PATH, settings.CATALOG_RELOAD_INTERVAL_SECONDS
+    settings.DATA_FILE_PATH = catalog_file
+    settings.CATALOG_SNAPSHOT_PATH = ""
+    settings.CATALOG_RELOAD_INTERVAL_SECONDS = 0
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        settings.DATA_FILE_PATH, settings.CATALOG_SNAPSHOT_PATH, settings.CATALOG_RELOAD_INTERVAL_SECONDS = saved
+
+
+@pytest.fixture
+def restore_catalog_etag():
+    """Restore the published catalog ETag after a test creates its own DestinationService."""
+    etag = get_catalog_etag()
+    yield
+    set_catalog_etag(etag)
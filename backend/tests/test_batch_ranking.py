@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from app.models.destination import Continent, UserFilters
+from app.services.mcdm_engines import get_engine
+from app.services.topsis_service import TOPSISService
+
+
+def _weight_profiles(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.0, 1.0, size=(count, len(TOPSISService().criteria)))
+
+
+@pytest.mark.parametrize("engine_name", ["topsis", "vikor", "wsm", "saw"])
+def test_batch_matches_single_rankings(catalog, engine_name):
+    engine = get_engine(engine_name)
+    criteria = engine.topsis_service.criteria
+    matrix = catalog.decision_matrix[catalog.filter_indices(UserFilters(continents=[Continent.ASIA]))]
+    profiles = _weight_profiles(8)
+    ks = [1, 5, 20, 50, 100, len(matrix), len(matrix) + 10, 3]
+
+    batch = engine.rank_top_k_batch(matrix, profiles, ks)
+
+    assert len(batch) == len(profiles)
+    for (batch_rows, batch_scores), weights, k in zip(batch, profiles, ks):
+        single_rows, single_scores = engine.rank_top_k(matrix, k, dict(zip(criteria, weights)))
+        assert batch_rows.tolist() == single_rows.tolist()
+        np.testing.assert_allclose(batch_scores, single_scores, rtol=1e-12, atol=1e-12)
+
+
+def test_batch_of_empty_candidate_set():
+    topsis_service = TOPSISService()
+    empty = np.empty((0, len(topsis_service.criteria)))
+    results = topsis_service.rank_top_k_batch(empty, _weight_profiles(3), [5, 5, 5])
+    assert [(rows.tolist(), scores.tolist()) for rows, scores in results] == [([], [])] * 3
+
+
+def test_batch_endpoint_matches_single_requests(client):
+    requests = [
+        {"filters": {}, "max_results": 10},
+        {"filters": {"continents": ["asia"]}, "max_results": 5,
+         "weights": {"popularity_score": 0.9, "safety_score": 0.1}},
+        {"filters": {"continents": ["asia"]}, "max_results": 7},
+        {"filters": {"budget_ranges": ["low"]}, "max_results": 3, "engine": "vikor"},
+        {"filters": {"countries": ["Nowhere"]}, "max_results": 5},
+    ]
+    response = client.post("/api/v1/topsis/recommendations/batch", json={"requests": requests})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert len(results) == len(requests)
+    for item, result in zip(requests, results):
+        single = client.post("/api/v1/topsis/recommendations", json=item)
+        assert single.status_code == 200
+        expected = single.json()
+        assert [d["id"] for d in result["destinations"]] == [d["id"] for d in expected["destinations"]]
+        np.testing.assert_allclose(result["scores"], expected["scores"], rtol=1e-12, atol=1e-12)
+        assert result["engine"] == expected["engine"]
@@ -0,0 +1,101 @@
+import gzip
+import json
+import pytest
+from app.models.destination import Destination
+from app.utils import catalog_loader
+from app.utils.catalog_loader import file_digest, iter_catalog_records, load_destinations
+
+# Strings that break a naive splitter: brackets, commas, quotes, escapes and non-ASCII text
+TRICKY_TEXT = [
+    'Commas, "quotes" and [brackets] {braces}',
+    "Back\\slash \\\\ and \\\" escaped",
+    "Line\nbreaks\tand tabs\r\n",
+    "Ünïcödé – 東京 – é \U0001f30d",
+    "]}, {\"id\": \"fake\"",
+]
+
+
+@pytest.fixture(scope="module")
+def records(destinations):
+    records = [destination.model_dump(mode="json") for destination in destinations[:40]]
+    for position, record in enumerate(records):
+        record["description"] = TRICKY_TEXT[position % len(TRICKY_TEXT)]
+    return records
+
+
+def _write(path, text: str, compress: bool):
+    if compress:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return str(path)
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 17, 4096])
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("layout", ["compact", "indented", "ascii"])
+def test_json_array_matches_json_load(tmp_path, monkeypatch, records, read_size, compress, layout):
+    monkeypatch.setattr(catalog_loader, "READ_SIZE", read_size)
+    text = {
+        "compact": json.dumps(records, ensure_ascii=False, separators=(",", ":")),
+        "indented": "\n  " + json.dumps(records, ensure_ascii=False, indent=2) + "\n\n",
+        "ascii": json.dumps(records),
+    }[layout]
+    path = _write(tmp_path / "catalog.json", text, compress)
+
+    with catalog_loader.open_catalog(path) as f:
+        expected = json.load(f)
+    assert list(iter_catalog_records(path)) == expected == records
+
+
+@pytest.mark.parametrize("read_size", [1, 5, 4096])
+@pytest.mark.parametrize("compress", [False, True])
+def test_ndjson_matches_json_loads(tmp_path, monkeypatch, records, read_size, compress):
+    monkeypatch.setattr(catalog_loader, "READ_SIZE", read_size)
+    # Blank lines are skipped and the last line need not end with a newline
+    text = "\n".join(json.dumps(record, ensure_ascii=False) for record in records[:20])
+    text = "\n" + text.replace("\n", "\n\n", 3)
+    path = _write(tmp_path / "catalog.ndjson", text, compress)
+
+    expected = [json.loads(line) for line in text.splitlines() if line.strip()]
+    assert list(iter_catalog_records(path)) == expected == records[:20]
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ \n ]  ", ""])
+def test_empty_catalogs(tmp_path, monkeypatch, text):
+    monkeypatch.setattr(catalog_loader, "READ_SIZE", 1)
+    path = _write(tmp_path / "catalog.json", text, False)
+    assert list(iter_catalog_records(path)) == []
+
+
+@pytest.mark.parametrize("text", ['[{"id": "a"}', '[{"id": "a"} {"id": "b"}]', '[{"id": "a",}]'])
+def test_malformed_arrays_raise(tmp_path, monkeypatch, text):
+    monkeypatch.setattr(catalog_loader, "READ_SIZE", 2)
+    path = _write(tmp_path / "catalog.json", text, False)
+    with pytest.raises(ValueError):
+        list(iter_catalog_records(path))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_invalid_records_are_skipped(tmp_path, monkeypatch, records, chunk_size):
+    monkeypatch.setattr(catalog_loader, "READ_SIZE", 13)
+    mixed = []
+    for position, record in enumerate(records):
+        mixed.append(record)
+        if position % 6 == 0:
+            mixed.append({**record, "latitude": "north"})
+        if position % 9 == 0:
+            mixed.append({"id": f"partial-{position}"})
+    path = _write(tmp_path / "catalog.json.gz", json.dumps(mixed), True)
+
+    destinations = load_destinations(path, chunk_size)
+    assert destinations == [Destination.model_validate(record) for record in records]
+
+
+def test_file_digest_depends_on_content_only(tmp_path, records):
+    first = _write(tmp_path / "a.json", json.dumps(records), False)
+    second = _write(tmp_path / "b.json", json.dumps(records), False)
+    third = _write(tmp_path / "c.json", json.dumps(records[1:]), False)
+    assert file_digest(first) == file_digest(second) != file_digest(third)
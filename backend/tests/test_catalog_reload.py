@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+import pytest
+from app.core.config import settings
+from app.core.http_cache import get_catalog_etag, make_catalog_etag
+from app.models.destination import Continent, UserFilters
+from app.services.destination_service import DestinationService
+from app.utils.synthetic_catalog import write_catalog
+
+FILTERS = UserFilters(continents=[Continent.ASIA])
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, restore_catalog_etag):
+    path = str(tmp_path / "destinations.json")
+    write_catalog(path, "json", 100, 1)
+    monkeypatch.setattr(settings, "DATA_FILE_PATH", path)
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_PATH", "")
+    service = DestinationService()
+    yield service
+    service.stop_watcher()
+
+
+def test_reload_publishes_new_catalog_and_etag(service):
+    old = service.catalog
+    assert get_catalog_etag() == make_catalog_etag(old.digest)
+
+    write_catalog(service.data_file_path, "json", 150, 2)
+    assert service.reload()
+
+    new = service.catalog
+    assert new is not old
+    assert len(new) == 150 and new.version > old.version
+    assert new.digest != old.digest
+    assert get_catalog_etag() == make_catalog_etag(new.digest)
+
+
+def test_reload_of_unchanged_content_keeps_etag(service):
+    etag = get_catalog_etag()
+    write_catalog(service.data_file_path, "json", 100, 1)
+    assert service.reload()
+    assert get_catalog_etag() == etag
+
+
+def test_in_flight_reader_keeps_old_catalog(service):
+    catalog = service.catalog
+    rows = catalog.filter_indices(FILTERS).tolist()
+    body = catalog.rows_to_json(rows)
+
+    write_catalog(service.data_file_path, "json", 150, 2)
+    assert service.reload()
+
+    assert service.catalog is not catalog
+    assert len(catalog) == 100
+    assert catalog.filter_indices(FILTERS).tolist() == rows
+    assert catalog.rows_to_json(rows) == body
+
+
+def test_concurrent_readers_never_see_a_mixed_catalog(service):
+    sizes = {100: 1, 150: 2}
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            catalog = service.catalog
+            if not (len(catalog) == len(catalog.decision_matrix) == catalog.filter_index.size in sizes):
+                errors.append(len(catalog))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for count in (150, 100, 150, 100):
+            write_catalog(service.data_file_path, "json", count, sizes[count])
+            assert service.reload()
+            assert len(service.catalog) == count
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+    assert errors == []
+
+
+@pytest.mark.parametrize("text", [
+    '[{"id": "truncated"',
+    "not json at all",
+    '[{"id": "a"} {"id": "b"}]',
+    '[{"id": "a"}, {"id": "b"}]',  # no valid destinations
+    "",  # truncated by a writer that has not written yet
+])
+def test_invalid_file_keeps_current_catalog(service, text):
+    catalog, etag = service.catalog, get_catalog_etag()
+    with open(service.data_file_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    assert not service.reload()
+    assert service.catalog is catalog
+    assert get_catalog_etag() == etag
+
+
+def test_watcher_reloads_changed_file(service):
+    assert not service.check_for_changes()
+    version = service.version
+
+    service.start_watcher(0.01)
+    # Replace the file in one step, as a deployment should
+    staging = f"{service.data_file_path}.tmp"
+    write_catalog(staging, "json", 150, 2)
+    os.replace(staging, service.data_file_path)
+    deadline = time.monotonic() + 5
+    while service.version == version and time.monotonic() < deadline:
+        time.sleep(0.01)
+    service.stop_watcher()
+
+    assert service.version == version + 1 and len(service.catalog) == 150
+
+
+def test_watcher_never_swaps_in_a_partly_written_file(service):
+    sizes = set()
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            sizes.add(len(service.catalog))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    service.start_watcher(0.001)
+    try:
+        # Rewritten in place: the watcher may catch the file empty or truncated
+        for _ in range(5):
+            write_catalog(service.data_file_path, "json", 150, 2)
+            write_catalog(service.data_file_path, "json", 100, 1)
+    finally:
+        service.stop_watcher()
+        stop.set()
+        reader.join()
+
+    assert sizes <= {100, 150}
+    service.check_for_changes()
+    assert len(service.catalog) == 100
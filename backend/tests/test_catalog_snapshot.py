@@ -0,0 +1,112 @@
+import json
+import os
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.models.destination import ActivityType, Continent, UserFilters
+from app.services import catalog_snapshot
+from app.services.catalog import Catalog
+from app.services.catalog_snapshot import MANIFEST_FILE, CatalogSnapshot, compile_snapshot
+from app.services.destination_service import DestinationService
+from app.utils.catalog_loader import load_destinations
+
+FILTERS = [
+    UserFilters(),
+    UserFilters(continents=[Continent.ASIA, Continent.EUROPE]),
+    UserFilters(activities=[ActivityType.BEACH], min_safety=7.5),
+    UserFilters(countries=["Nowhere"]),
+]
+QUERIES = ["an", "urban", "south america", "zzqx"]
+
+
+@pytest.fixture(scope="module")
+def json_catalog(catalog_file):
+    return Catalog.build(load_destinations(catalog_file, 500), 1)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, catalog_file):
+    path = str(tmp_path / "snapshot")
+    compile_snapshot(catalog_file, path)
+    return path
+
+
+def test_snapshot_round_trip_matches_json_catalog(json_catalog, snapshot_path):
+    snapshot = Catalog.from_snapshot(CatalogSnapshot(snapshot_path), 2)
+
+    assert len(snapshot) == len(json_catalog)
+    assert [d.model_dump() for d in snapshot.destinations] == [d.model_dump() for d in json_catalog.destinations]
+    np.testing.assert_array_equal(snapshot.decision_matrix, json_catalog.decision_matrix)
+    assert snapshot.get_filter_options() == json_catalog.get_filter_options()
+    for filters in FILTERS:
+        assert snapshot.filter_indices(filters).tolist() == json_catalog.filter_indices(filters).tolist()
+        assert snapshot.get_facet_counts(filters) == json_catalog.get_facet_counts(filters)
+    for query in QUERIES:
+        assert snapshot.search_rows(query).tolist() == json_catalog.search_rows(query).tolist()
+    for destination in json_catalog.destinations[::97]:
+        assert snapshot.get_destination_by_id(destination.id) == destination
+    assert snapshot.get_destination_by_id("missing") is None
+    rows = list(range(0, len(json_catalog), 13))
+    assert snapshot.rows_to_json(rows) == json_catalog.rows_to_json(rows)
+
+
+def test_recompiling_keeps_the_digest(catalog_file, snapshot_path):
+    digest = CatalogSnapshot(snapshot_path).digest
+    compile_snapshot(catalog_file, snapshot_path)
+    assert digest is not None and CatalogSnapshot(snapshot_path).digest == digest
+
+
+def test_swap_never_leaves_the_path_missing(catalog_file, snapshot_path, monkeypatch):
+    replace = os.replace
+
+    def checked_replace(source, destination):
+        assert os.path.exists(os.path.join(destination, MANIFEST_FILE))
+        replace(source, destination)
+        assert os.path.exists(os.path.join(destination, MANIFEST_FILE))
+
+    monkeypatch.setattr(catalog_snapshot.os, "replace", checked_replace)
+    first = os.path.realpath(snapshot_path)
+    compile_snapshot(catalog_file, snapshot_path)
+    second = os.path.realpath(snapshot_path)
+    compile_snapshot(catalog_file, snapshot_path)
+    third = os.path.realpath(snapshot_path)
+
+    assert os.path.islink(snapshot_path)
+    assert len({first, second, third}) == 3
+    # The previous version stays for readers still opening it, older ones go
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
+    assert sorted(os.listdir(os.path.dirname(snapshot_path))) == sorted(
+        ["snapshot", os.path.basename(second), os.path.basename(third)]
+    )
+
+
+def test_plain_snapshot_directory_is_converted(catalog_file, snapshot_path):
+    parent = os.path.dirname(snapshot_path)
+    legacy = os.path.join(parent, "legacy")
+    os.rename(os.path.realpath(snapshot_path), legacy)
+    os.remove(snapshot_path)
+    os.rename(legacy, snapshot_path)
+
+    compile_snapshot(catalog_file, snapshot_path)
+    assert os.path.islink(snapshot_path)
+    assert len(CatalogSnapshot(snapshot_path).destinations) == len(load_destinations(catalog_file, 500))
+
+
+def test_snapshot_with_other_criteria_is_rejected(snapshot_path, catalog_file, monkeypatch, restore_catalog_etag):
+    manifest_path = os.path.join(snapshot_path, MANIFEST_FILE)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["criteria"] = list(reversed(manifest["criteria"]))
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError, match="criteria"):
+        CatalogSnapshot(snapshot_path)
+
+    # The service falls back to the catalog file instead of misreading the columns
+    monkeypatch.setattr(settings, "DATA_FILE_PATH", catalog_file)
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_PATH", snapshot_path)
+    service = DestinationService()
+    assert not isinstance(service.catalog.destinations, catalog_snapshot.SnapshotDestinations)
+    assert len(service.catalog) == len(load_destinations(catalog_file, 500))
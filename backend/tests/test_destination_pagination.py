@@ -0,0 +1,93 @@
+import pytest
+from fastapi import HTTPException
+from app.api.routes.destinations import NEXT_CURSOR_HEADER, _decode_cursor, _encode_cursor, _paginate
+from app.services.catalog import Catalog
+
+
+def _walk(client, path, limit, **params):
+    """Follow the cursors of a paginated listing and collect every page."""
+    items, cursor, pages = [], None, 0
+    while True:
+        query = {"limit": limit, **params, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=query)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= limit
+        items.extend(page)
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return items, pages
+
+
+@pytest.fixture(scope="module")
+def sample(client):
+    first = client.get("/api/v1/destinations/", params={"limit": 1}).json()[0]
+    return first["continent"], first["country"]
+
+
+@pytest.mark.parametrize("limit", [3, 7, 250, 5000])
+@pytest.mark.parametrize("listing", ["all", "continent", "country"])
+def test_cursor_walk_reproduces_full_listing(client, sample, listing, limit):
+    path = {
+        "all": "/api/v1/destinations/",
+        "continent": f"/api/v1/destinations/continent/{sample[0]}",
+        "country": f"/api/v1/destinations/country/{sample[1]}",
+    }[listing]
+
+    full = client.get(path)
+    assert NEXT_CURSOR_HEADER not in full.headers
+    items, pages = _walk(client, path, limit)
+    assert items == full.json()
+    assert pages == max(1, -(-len(items) // limit))
+
+
+def test_fields_projection(client):
+    full = client.get("/api/v1/destinations/", params={"limit": 20}).json()
+    projected = client.get("/api/v1/destinations/", params={"limit": 20, "fields": "id, latitude,longitude"})
+    assert projected.status_code == 200
+    assert projected.json() == [
+        {"id": d["id"], "latitude": d["latitude"], "longitude": d["longitude"]} for d in full
+    ]
+
+    items, _ = _walk(client, "/api/v1/destinations/", 500, fields="id")
+    assert [item["id"] for item in items] == [d["id"] for d in client.get("/api/v1/destinations/").json()]
+
+
+def test_unknown_fields_are_rejected(client):
+    response = client.get("/api/v1/destinations/", params={"fields": "id,nope"})
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage",
+    "!!",
+    "MTIzNDU2Nzg5OmZvbw",  # "123456789:foo", row out of range
+    "LTE6eA",  # "-1:x"
+])
+def test_bad_cursors_are_rejected(client, cursor):
+    response = client.get("/api/v1/destinations/", params={"limit": 5, "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_cursor_expires_when_row_changes(destinations):
+    old = Catalog.build(destinations[:50], 1)
+    new = Catalog.build(list(reversed(destinations[:50])), 2)
+    cursor = _encode_cursor(old, 10)
+    assert _decode_cursor(old, cursor) == 10
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(new, cursor)
+    assert error.value.status_code == 400
+
+
+def test_duplicate_ids_do_not_loop(destinations):
+    duplicated = [d.model_copy(update={"id": "same"}) for d in destinations[:30]]
+    catalog = Catalog.build(duplicated, 1)
+    rows, cursor, seen = range(len(catalog)), None, []
+    for _ in range(len(catalog) + 1):
+        page, cursor = _paginate(catalog, rows, cursor, 4)
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert seen == list(rows)
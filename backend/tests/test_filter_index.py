@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+from app.models.destination import (
+    ActivityType, BudgetRange, ClimateType, Continent, PackageType, TerrainType, UserFilters
+)
+from app.services.filter_index import CATEGORICAL_FILTERS, FilterIndex, value_key
+
+
+def _matches(destination, filters: UserFilters) -> bool:
+    """Reference semantics: the linear scan the bitmap index replaced."""
+    if filters.continents and destination.continent not in filters.continents:
+        return False
+    if filters.countries and destination.country not in filters.countries:
+        return False
+    if filters.climates and destination.climate not in filters.climates:
+        return False
+    if filters.terrains and destination.terrain not in filters.terrains:
+        return False
+    if filters.activities and not any(a in destination.activities for a in filters.activities):
+        return False
+    if filters.budget_ranges and destination.budget_range not in filters.budget_ranges:
+        return False
+    if filters.package_types and not any(p in destination.package_type for p in filters.package_types):
+        return False
+    if filters.weather_types and destination.weather_type not in filters.weather_types:
+        return False
+    if filters.min_popularity is not None and destination.popularity_score < filters.min_popularity:
+        return False
+    if filters.max_popularity is not None and destination.popularity_score > filters.max_popularity:
+        return False
+    if filters.min_safety is not None and destination.safety_score < filters.min_safety:
+        return False
+    if filters.max_safety is not None and destination.safety_score > filters.max_safety:
+        return False
+    return True
+
+
+def _expected_rows(destinations, filters: UserFilters):
+    return [row for row, destination in enumerate(destinations) if _matches(destination, filters)]
+
+
+def _random_filters(rng: np.random.Generator, destinations) -> UserFilters:
+    """Draw a random combination of filters, reusing values present in the catalog."""
+    def some(values):
+        values = list(values)
+        return [values[i] for i in rng.choice(len(values), size=rng.integers(1, 4), replace=False)]
+
+    fields = {}
+    if rng.random() < 0.5:
+        fields["continents"] = some(Continent)
+    if rng.random() < 0.2:
+        fields["countries"] = some({d.country for d in destinations[:50]})
+    if rng.random() < 0.4:
+        fields["climates"] = some(ClimateType)
+    if rng.random() < 0.4:
+        fields["terrains"] = some(TerrainType)
+    if rng.random() < 0.4:
+        fields["activities"] = some(ActivityType)
+    if rng.random() < 0.4:
+        fields["budget_ranges"] = some(BudgetRange)
+    if rng.random() < 0.3:
+        fields["package_types"] = some(PackageType)
+    if rng.random() < 0.2:
+        fields["weather_types"] = some({d.weather_type for d in destinations})
+    # Bounds taken from the data exercise the inclusive comparisons
+    if rng.random() < 0.3:
+        fields["min_popularity"] = destinations[int(rng.integers(len(destinations)))].popularity_score
+    if rng.random() < 0.3:
+        fields["max_popularity"] = destinations[int(rng.integers(len(destinations)))].popularity_score
+    if rng.random() < 0.3:
+        fields["min_safety"] = destinations[int(rng.integers(len(destinations)))].safety_score
+    if rng.random() < 0.3:
+        fields["max_safety"] = destinations[int(rng.integers(len(destinations)))].safety_score
+    return UserFilters(**fields)
+
+
+@pytest.mark.parametrize("filters", [
+    UserFilters(),
+    UserFilters(continents=[Continent.ASIA]),
+    UserFilters(continents=[Continent.ASIA, Continent.EUROPE], climates=[ClimateType.SUNNY]),
+    UserFilters(activities=[ActivityType.BEACH, ActivityType.HIKING]),
+    UserFilters(package_types=[PackageType.HONEYMOON], budget_ranges=[BudgetRange.LUXURY]),
+    UserFilters(min_popularity=5.0, max_popularity=5.0),
+    UserFilters(min_safety=9.5, terrains=[TerrainType.ISLAND]),
+    UserFilters(countries=["Nowhere"]),
+    UserFilters(weather_types=["not-a-weather"]),
+])
+def test_indices_match_linear_scan(catalog, destinations, filters):
+    assert catalog.filter_indices(filters).tolist() == _expected_rows(destinations, filters)
+
+
+def test_random_filter_combinations_match_linear_scan(catalog, destinations):
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        filters = _random_filters(rng, destinations)
+        assert catalog.filter_indices(filters).tolist() == _expected_rows(destinations, filters), filters
+
+
+def test_empty_catalog_matches_nothing():
+    index = FilterIndex.from_destinations([])
+    assert index.indices(UserFilters()).tolist() == []
+    assert index.indices(UserFilters(continents=[Continent.ASIA], min_safety=1.0)).tolist() == []
+
+
+def test_count_matches_indices(catalog, destinations):
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        filters = _random_filters(rng, destinations)
+        index = catalog.filter_index
+        assert index.count(index.resolve(filters)) == len(index.indices(filters))
+
+
+def _expected_facets(destinations, filters: UserFilters):
+    """Brute-force disjunctive facets: each field counted under every filter but its own."""
+    counts = {}
+    for filter_name, field in CATEGORICAL_FILTERS.items():
+        others = filters.model_copy(update={filter_name: None})
+        field_counts = {}
+        for destination in destinations:
+            if not _matches(destination, others):
+                continue
+            values = getattr(destination, field)
+            for value in set(values if isinstance(values, list) else [values]):
+                field_counts[value_key(value)] = field_counts.get(value_key(value), 0) + 1
+        counts[filter_name] = field_counts
+    return counts
+
+
+def _nonzero(counts):
+    return {name: {value: count for value, count in values.items() if count} for name, values in counts.items()}
+
+
+@pytest.mark.parametrize("filters", [
+    UserFilters(),
+    UserFilters(continents=[Continent.ASIA]),
+    UserFilters(continents=[Continent.ASIA, Continent.EUROPE], climates=[ClimateType.SUNNY]),
+    UserFilters(activities=[ActivityType.BEACH], package_types=[PackageType.HONEYMOON, PackageType.FAMILY]),
+    UserFilters(min_popularity=7.0, max_safety=9.0),
+    UserFilters(terrains=[TerrainType.ISLAND], budget_ranges=[BudgetRange.LUXURY], min_safety=8.0),
+    UserFilters(countries=["Nowhere"]),
+])
+def test_facet_counts_match_brute_force(catalog, destinations, filters):
+    counts = catalog.filter_index.facet_counts(filters)
+    assert _nonzero(counts) == _expected_facets(destinations, filters)
+
+
+def test_random_facet_counts_match_brute_force(catalog, destinations):
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        filters = _random_filters(rng, destinations)
+        assert _nonzero(catalog.filter_index.facet_counts(filters)) == _expected_facets(destinations, filters), filters
+
+
+def test_facets_endpoint(client, destinations):
+    filters = UserFilters(continents=[Continent.EUROPE], activities=[ActivityType.HIKING])
+    response = client.post("/api/v1/filters/facets", json=filters.model_dump(mode="json"))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == len(_expected_rows(destinations, filters))
+    assert _nonzero(body["counts"]) == _expected_facets(destinations, filters)
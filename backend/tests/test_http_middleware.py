@@ -0,0 +1,73 @@
+import pytest
+from app.core.compression import negotiate_encoding
+from app.core.http_cache import make_catalog_etag, match_etag
+
+pytest.importorskip("brotli")
+
+
+@pytest.mark.parametrize("accept_encoding,expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("identity", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ("br", "gzip")) == expected
+
+
+def test_match_etag():
+    etag = make_catalog_etag("abc")
+    assert etag == '"abc"'
+    assert make_catalog_etag(None) is None
+    assert match_etag('"abc"', etag) == '"abc"'
+    assert match_etag('W/"abc"', etag) == '"abc"'
+    assert match_etag('"old", "abc-br"', etag) == '"abc-br"'
+    assert match_etag("*", etag) == etag
+    assert match_etag('"old"', etag) is None
+    assert match_etag(None, etag) is None
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_compressed_bodies_decode_to_the_original(client, encoding):
+    plain = client.get("/api/v1/destinations/", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/v1/destinations/", headers={"Accept-Encoding": encoding})
+    assert compressed.headers["content-encoding"] == encoding
+    assert compressed.headers["etag"] == plain.headers["etag"][:-1] + f'-{encoding}"'
+    # httpx decodes the body according to Content-Encoding
+    assert compressed.content == plain.content
+
+
+def test_small_bodies_are_not_compressed(client):
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_revalidation_returns_not_modified(client):
+    path = "/api/v1/destinations/"
+    first = client.get(path, params={"limit": 3}, headers={"Accept-Encoding": "br"})
+    etag = first.headers["etag"]
+
+    revalidated = client.get(path, params={"limit": 3}, headers={"Accept-Encoding": "br", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+
+    stale = client.get(path, params={"limit": 3}, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_conditional_get_ignores_other_methods(client):
+    etag = client.get("/api/v1/destinations/", params={"limit": 1}).headers["etag"]
+    response = client.post("/api/v1/destinations/bulk", json=[], headers={"If-None-Match": etag})
+    assert response.status_code != 304
+
+
+def test_not_modified_responses_are_labelled_with_their_route(client):
+    etag = client.get("/api/v1/filters/options").headers["etag"]
+    assert client.get("/api/v1/filters/options", headers={"If-None-Match": etag}).status_code == 304
+    metrics = client.get("/metrics").text
+    assert 'route="/api/v1/filters/options",status="304"' in metrics
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from app.models.destination import TOPSISWeights
+from app.services import mcdm_engines
+from app.services.catalog import Catalog
+from app.services.mcdm_engines import (
+    ELECTREEngine, EngineCapacityError, MCDMEngine, PROMETHEEEngine, available_engines, get_engine
+)
+
+WEIGHT_PROFILES = [
+    None,
+    TOPSISWeights(popularity_score=0.9, safety_score=0.05).model_dump(),
+    TOPSISWeights(budget_score=1.0, climate_score=0.0, terrain_score=0.0).model_dump(),
+]
+
+
+def _brute_force_promethee(engine, decision_matrix, weights):
+    """PROMETHEE II net flow from the full pairwise preference matrices."""
+    benefit = engine.benefit_matrix(decision_matrix)
+    n = len(benefit)
+    deviations = benefit.std(axis=0)
+    net_flow = np.zeros(n)
+    for column, weight in enumerate(engine.weight_vector(weights)):
+        q = engine.indifference * deviations[column]
+        p = engine.preference * deviations[column]
+        difference = benefit[:, column, np.newaxis] - benefit[np.newaxis, :, column]
+        if p > q:
+            preference = np.clip((difference - q) / (p - q), 0.0, 1.0)
+        else:
+            preference = (difference > q).astype(np.float64)
+        net_flow += weight * (preference.sum(axis=1) - preference.sum(axis=0))
+    return net_flow / (n - 1)
+
+
+def _brute_force_electre(engine, decision_matrix, weights):
+    """ELECTRE net concordance minus net discordance from the full pairwise matrices."""
+    benefit = engine.benefit_matrix(decision_matrix)
+    n = len(benefit)
+    weight_vector = engine.weight_vector(weights)
+    spread = benefit.max(axis=0) - benefit.min(axis=0)
+    scaled = np.divide(benefit, spread, out=np.zeros_like(benefit), where=spread != 0)
+
+    concordance = np.zeros((n, n))
+    discordance = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            concordance[i, j] = weight_vector[benefit[i] >= benefit[j]].sum()
+            discordance[i, j] = max(0.0, (scaled[j] - scaled[i]).max())
+    net_concordance = concordance.sum(axis=1) - concordance.sum(axis=0)
+    net_discordance = discordance.sum(axis=1) - discordance.sum(axis=0)
+    return (net_concordance - net_discordance) / (n - 1)
+
+
+@pytest.fixture(scope="module")
+def matrices(destinations):
+    decision_matrix = Catalog.build(destinations[:150], 1).decision_matrix
+    # Rounding creates many ties, which both fast paths must count on both sides
+    return {"catalog": decision_matrix, "ties": np.round(decision_matrix, 1)}
+
+
+@pytest.mark.parametrize("matrix_name", ["catalog", "ties"])
+@pytest.mark.parametrize("indifference,preference", [(0.0, 1.0), (0.25, 0.75), (0.5, 0.5), (0.0, 0.0)])
+def test_promethee_matches_brute_force(matrices, matrix_name, indifference, preference):
+    engine = PROMETHEEEngine(indifference, preference)
+    for weights in WEIGHT_PROFILES:
+        np.testing.assert_allclose(
+            engine.score_matrix(matrices[matrix_name], weights),
+            _brute_force_promethee(engine, matrices[matrix_name], weights),
+            rtol=1e-9, atol=1e-9
+        )
+
+
+@pytest.mark.parametrize("matrix_name", ["catalog", "ties"])
+def test_electre_matches_brute_force(matrices, matrix_name, monkeypatch):
+    # Force several row blocks so the blocked discordance sums are exercised
+    monkeypatch.setattr(mcdm_engines, "_PAIRWISE_CHUNK_ELEMENTS", 1000)
+    engine = ELECTREEngine()
+    for weights in WEIGHT_PROFILES:
+        np.testing.assert_allclose(
+            engine.score_matrix(matrices[matrix_name], weights),
+            _brute_force_electre(engine, matrices[matrix_name], weights),
+            rtol=1e-9, atol=1e-9
+        )
+
+
+@pytest.mark.parametrize("name", ["promethee", "electre"])
+def test_pairwise_engines_with_fewer_than_two_rows(matrices, name):
+    engine = get_engine(name)
+    assert engine.score_matrix(matrices["catalog"][:1]).tolist() == [0.0]
+    rows, scores = engine.rank_top_k(matrices["catalog"][:0], 5)
+    assert rows.tolist() == [] and scores.tolist() == []
+
+
+def test_electre_rejects_too_many_alternatives(matrices):
+    with pytest.raises(EngineCapacityError):
+        ELECTREEngine(max_alternatives=100).score_matrix(matrices["catalog"])
+
+
+def test_engines_implement_the_interface():
+    with pytest.raises(TypeError):
+        MCDMEngine()
+    for name in available_engines():
+        assert isinstance(get_engine(name), MCDMEngine)
@@ -0,0 +1,176 @@
+import gc
+import weakref
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.models.destination import TOPSISWeights, UserFilters
+from app.services.catalog import Catalog
+from app.services.destination_service import DestinationService
+from app.services import ranking_session as session_module
+from app.services.ranking_session import RankingSession, RankingSessionStore, parse_session_id
+from app.services.topsis_service import TOPSISService
+from app.utils.synthetic_catalog import write_catalog
+
+WEIGHT_PROFILES = [
+    None,
+    TOPSISWeights(popularity_score=0.9, safety_score=0.05).model_dump(),
+    TOPSISWeights(budget_score=1.0, climate_score=0.0, terrain_score=0.0).model_dump(),
+    dict(zip(TOPSISService().criteria, np.random.default_rng(3).random(len(TOPSISService().criteria)))),
+]
+
+
+@pytest.mark.parametrize("filters", [
+    UserFilters(),
+    UserFilters(continents=["asia", "europe"]),
+    UserFilters(activities=["beach"], budget_ranges=["low", "medium"]),
+])
+@pytest.mark.parametrize("k", [1, 20, 5000])
+def test_session_matches_full_rescore(catalog, filters, k):
+    topsis_service = TOPSISService()
+    session = RankingSession(catalog, filters, topsis_service)
+    candidate_rows = catalog.filter_indices(filters)
+
+    for weights in WEIGHT_PROFILES:
+        positions, expected_scores = topsis_service.rank_top_k(catalog.decision_matrix[candidate_rows], k, weights)
+        rows, scores = session.rank(k, weights)
+        assert rows.tolist() == candidate_rows[positions].tolist()
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-12, atol=1e-12)
+
+
+def test_session_without_candidates(catalog):
+    session = RankingSession(catalog, UserFilters(countries=["Nowhere"]), TOPSISService())
+    rows, scores = session.rank(10)
+    assert rows.tolist() == [] and scores.tolist() == []
+
+
+def test_store_drops_sessions_of_older_catalog_versions(catalog):
+    store = RankingSessionStore(max_sessions=4, max_bytes=1 << 30, ttl_seconds=60.0)
+    session_id = store.add(RankingSession(catalog, UserFilters(), TOPSISService()))
+    assert store.get(session_id, catalog.version) is not None
+    assert store.get(session_id, catalog.version + 1) is None
+    assert store.get(session_id, catalog.version) is None
+    assert store.stats()["invalidations"] == 1
+
+
+def test_store_evicts_least_recently_used(catalog):
+    store = RankingSessionStore(max_sessions=2, max_bytes=1 << 30, ttl_seconds=60.0)
+    sessions = [RankingSession(catalog, UserFilters(continents=[continent]), TOPSISService())
+                for continent in ("asia", "europe", "africa")]
+    ids = [store.add(session) for session in sessions[:2]]
+    store.get(ids[0], catalog.version)
+    ids.append(store.add(sessions[2]))
+    assert store.get(ids[1], catalog.version) is None
+    assert store.get(ids[0], catalog.version) is not None
+    assert store.get(ids[2], catalog.version) is not None
+
+
+def test_session_id_is_derived_from_filters_and_catalog(catalog, destinations):
+    filters = UserFilters(continents=["asia"], activities=["beach"], min_safety=6.5)
+    session = RankingSession(catalog, filters, TOPSISService())
+    assert RankingSession(catalog, filters, TOPSISService()).session_id == session.session_id
+    assert parse_session_id(session.session_id) == (catalog.digest or f"v{catalog.version}", filters)
+
+    other_catalog = Catalog.build(destinations[:500], catalog.version + 1, "other")
+    assert RankingSession(other_catalog, filters, TOPSISService()).session_id != session.session_id
+    with pytest.raises(ValueError):
+        parse_session_id("not-a-session")
+
+
+def test_other_worker_rebuilds_session_from_its_id(catalog, destinations):
+    filters = UserFilters(continents=["europe"])
+    creating = RankingSessionStore(max_sessions=4, max_bytes=1 << 30, ttl_seconds=60.0)
+    session_id = creating.add(RankingSession(catalog, filters, TOPSISService()))
+
+    other_worker = RankingSessionStore(max_sessions=4, max_bytes=1 << 30, ttl_seconds=60.0)
+    rebuilt = other_worker.get_or_rebuild(session_id, catalog, TOPSISService())
+    assert rebuilt is not None and rebuilt.session_id == session_id
+    for weights in WEIGHT_PROFILES:
+        expected_rows, expected_scores = creating.get(session_id, catalog.version).rank(10, weights)
+        rows, scores = rebuilt.rank(10, weights)
+        assert rows.tolist() == expected_rows.tolist()
+        np.testing.assert_allclose(scores, expected_scores)
+    assert other_worker.get_or_rebuild(session_id, catalog, TOPSISService()) is rebuilt
+    assert other_worker.stats()["rebuilt"] == 1
+
+    # Sessions of another catalog are not rebuilt on this one
+    reloaded = Catalog.build(destinations[:500], catalog.version + 1, "reloaded")
+    assert other_worker.get_or_rebuild(session_id, reloaded, TOPSISService()) is None
+    assert other_worker.get_or_rebuild("not-a-session", catalog, TOPSISService()) is None
+
+
+def test_invalidate_releases_old_catalogs(destinations):
+    store = RankingSessionStore(max_sessions=4, max_bytes=1 << 30, ttl_seconds=60.0)
+    old = Catalog.build(destinations[:300], 1, "old")
+    new = Catalog.build(destinations[:300], 2, "new")
+    store.add(RankingSession(old, UserFilters(), TOPSISService()))
+    kept = store.add(RankingSession(new, UserFilters(), TOPSISService()))
+    old_ref = weakref.ref(old)
+    del old
+
+    store.invalidate(2)
+    gc.collect()
+    assert old_ref() is None
+    assert store.stats()["sessions"] == 1 and store.stats()["invalidations"] == 1
+    assert store.get(kept, 2) is not None
+
+
+def test_catalog_swap_drops_sessions(tmp_path, monkeypatch, restore_catalog_etag):
+    path = str(tmp_path / "destinations.json")
+    write_catalog(path, "json", 200, 1)
+    monkeypatch.setattr(settings, "DATA_FILE_PATH", path)
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_PATH", "")
+    service = DestinationService()
+    store = RankingSessionStore(max_sessions=4, max_bytes=1 << 30, ttl_seconds=60.0)
+    service.add_swap_listener(lambda catalog: store.invalidate(catalog.version))
+
+    store.add(RankingSession(service.catalog, UserFilters(), TOPSISService()))
+    old_ref = weakref.ref(service.catalog)
+    write_catalog(path, "json", 300, 2)
+    assert service.reload()
+    gc.collect()
+
+    assert store.stats()["sessions"] == 0
+    assert old_ref() is None
+
+
+def test_store_expires_idle_sessions(catalog, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_module.time, "monotonic", lambda: now[0])
+    store = RankingSessionStore(max_sessions=4, max_bytes=1 << 30, ttl_seconds=10.0)
+    session_id = store.add(RankingSession(catalog, UserFilters(), TOPSISService()))
+    now[0] += 8.0
+    assert store.get(session_id, catalog.version) is not None
+    now[0] += 8.0
+    assert store.get(session_id, catalog.version) is not None
+    now[0] += 10.0
+    assert store.get(session_id, catalog.version) is None
+    assert store.stats()["expirations"] == 1
+
+
+def test_session_endpoints_match_recommendations(client):
+    created = client.post("/api/v1/topsis/sessions", json={"filters": {"continents": ["asia"]}, "max_results": 10})
+    assert created.status_code == 200
+    session_id = created.json()["session_id"]
+
+    weights = {"popularity_score": 0.8, "safety_score": 0.2}
+    reranked = client.post(f"/api/v1/topsis/sessions/{session_id}/rank", json={"weights": weights, "max_results": 10})
+    expected = client.post(
+        "/api/v1/topsis/recommendations",
+        json={"filters": {"continents": ["asia"]}, "weights": weights, "max_results": 10}
+    )
+    assert reranked.status_code == 200
+    assert [d["id"] for d in reranked.json()["destinations"]] == [d["id"] for d in expected.json()["destinations"]]
+    np.testing.assert_allclose(reranked.json()["scores"], expected.json()["scores"], rtol=1e-12, atol=1e-12)
+
+    # Deleting frees the cached state; the ID still works and rebuilds the session
+    assert client.delete(f"/api/v1/topsis/sessions/{session_id}").status_code == 200
+    assert client.delete(f"/api/v1/topsis/sessions/{session_id}").status_code == 404
+    rebuilt = client.post(f"/api/v1/topsis/sessions/{session_id}/rank", json={"weights": weights, "max_results": 10})
+    assert rebuilt.json() == reranked.json()
+
+    assert client.post("/api/v1/topsis/sessions/not-a-session/rank", json={}).status_code == 404
+
+
+def test_session_endpoint_rejects_other_engines(client):
+    response = client.post("/api/v1/topsis/sessions", json={"filters": {}, "engine": "vikor"})
+    assert response.status_code == 400
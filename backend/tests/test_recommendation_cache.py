@@ -0,0 +1,94 @@
+from app.models.destination import RecommendationRequest, RecommendationResponse, TOPSISWeights, UserFilters
+from app.services import recommendation_cache as cache_module
+from app.services.recommendation_cache import RecommendationCache
+
+
+def _cache(**overrides) -> RecommendationCache:
+    options = dict(max_entries=10, max_bytes=1 << 20, ttl_seconds=60.0, float_quantum=1e-6)
+    options.update(overrides)
+    return RecommendationCache(**options)
+
+
+def _response(total: int = 0) -> RecommendationResponse:
+    return RecommendationResponse(
+        destinations=[], scores=[], total_results=total, filters_applied=UserFilters(),
+        weights_used=TOPSISWeights(), engine="topsis"
+    )
+
+
+def test_equivalent_requests_share_a_key():
+    cache = _cache()
+    key = cache.make_key(RecommendationRequest(filters=UserFilters(continents=["asia", "europe"])))
+    assert key == cache.make_key(RecommendationRequest(filters=UserFilters(continents=["europe", "asia"])))
+    assert key == cache.make_key(RecommendationRequest(
+        filters=UserFilters(continents=["europe", "asia", "asia"], countries=[]),
+        weights=TOPSISWeights(popularity_score=0.2 + 1e-9)
+    ))
+    assert key != cache.make_key(RecommendationRequest(filters=UserFilters(continents=["asia"])))
+    assert key != cache.make_key(RecommendationRequest(
+        filters=UserFilters(continents=["asia", "europe"]), max_results=3
+    ))
+
+
+def test_hit_returns_the_stored_body():
+    cache = _cache()
+    response = _response()
+    cache.put("key", 1, response, b"encoded")
+    assert cache.get("key", 1) == (response, b"encoded")
+    assert cache.get("other", 1) is None
+    assert cache.stats()["bytes"] == len(b"encoded")
+
+
+def test_evicts_least_recently_used_by_count_and_size():
+    cache = _cache(max_entries=2, max_bytes=10)
+    cache.put("a", 1, _response(), b"aaaa")
+    cache.put("b", 1, _response(), b"bbbb")
+    cache.get("a", 1)
+    cache.put("c", 1, _response(), b"cccc")
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None and cache.get("c", 1) is not None
+
+    cache.put("d", 1, _response(), b"dddddddd")
+    assert cache.stats()["bytes"] <= 10
+    assert cache.get("d", 1) is not None
+
+    cache.put("huge", 1, _response(), b"x" * 11)
+    assert cache.get("huge", 1) is None
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = _cache(ttl_seconds=5.0)
+    cache.put("key", 1, _response(), b"body")
+    now[0] += 4.0
+    assert cache.get("key", 1) is not None
+    now[0] += 2.0
+    assert cache.get("key", 1) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["bytes"] == 0
+
+
+def test_new_catalog_version_drops_entries():
+    cache = _cache()
+    cache.put("key", 1, _response(), b"body")
+    assert cache.get("key", 2) is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.get("key", 1) is None
+
+
+def test_endpoint_serves_cached_body(client):
+    request = {"filters": {"continents": ["asia", "europe"]}, "max_results": 5}
+    first = client.post("/api/v1/topsis/recommendations", json=request)
+    hits = client.get("/api/v1/topsis/cache/stats").json()["hits"]
+    second = client.post("/api/v1/topsis/recommendations", json=request)
+
+    assert second.content == first.content
+    assert client.get("/api/v1/topsis/cache/stats").json()["hits"] == hits + 1
+
+    # An equivalent request shares the entry but echoes its own filters
+    reordered = client.post(
+        "/api/v1/topsis/recommendations", json={**request, "filters": {"continents": ["europe", "asia"]}}
+    )
+    assert reordered.json()["filters_applied"]["continents"] == ["europe", "asia"]
+    assert reordered.json()["destinations"] == first.json()["destinations"]
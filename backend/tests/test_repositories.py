@@ -0,0 +1,84 @@
+import asyncio
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.models.destination import UserFilters
+from app.repositories.destination_repository import DestinationRepository, InMemoryDestinationRepository
+from app.services.destination_service import DestinationService
+from app.utils.synthetic_catalog import write_catalog
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+from app.repositories.mongo_destination_repository import MongoDestinationRepository  # noqa: E402
+
+# mongomock evaluates queries in Python, so keep this catalog small
+REPOSITORY_CATALOG_SIZE = 500
+
+FILTER_CASES = [
+    UserFilters(),
+    UserFilters(continents=["asia", "europe"]),
+    UserFilters(activities=["beach", "hiking"], budget_ranges=["low"]),
+    UserFilters(package_types=["honeymoon"], min_safety=6.0, max_popularity=8.0),
+    UserFilters(min_popularity=5.0, max_popularity=5.0),
+    UserFilters(countries=["Nowhere"]),
+]
+
+
+@pytest.fixture(scope="module")
+def destination_service(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("repository") / "destinations.json")
+    write_catalog(path, "json", REPOSITORY_CATALOG_SIZE, 11)
+    saved = settings.DATA_FILE_PATH, settings.CATALOG_SNAPSHOT_PATH
+    settings.DATA_FILE_PATH, settings.CATALOG_SNAPSHOT_PATH = path, ""
+    try:
+        yield DestinationService()
+    finally:
+        settings.DATA_FILE_PATH, settings.CATALOG_SNAPSHOT_PATH = saved
+
+
+def _compare(destination_service, check):
+    """Run ``check(memory, mongo)`` against in-memory and MongoDB repositories of the same catalog."""
+    async def main():
+        memory = InMemoryDestinationRepository(destination_service)
+        mongo = MongoDestinationRepository(mongomock_motor.AsyncMongoMockClient()["travel"]["destinations"], 128)
+        await mongo.ensure_indexes()
+        await mongo.insert_destinations(destination_service.destinations)
+        await check(memory, mongo)
+    asyncio.run(main())
+
+
+def test_repository_interface_is_abstract():
+    class Incomplete(DestinationRepository):
+        async def get_by_id(self, destination_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_mongo_matches_memory_for_filters(destination_service):
+    async def check(memory, mongo):
+        for filters in FILTER_CASES:
+            memory_ids, memory_matrix = await memory.scoring_candidates(filters)
+            mongo_ids, mongo_matrix = await mongo.scoring_candidates(filters)
+            assert mongo_ids == memory_ids, filters
+            assert mongo_matrix.shape == memory_matrix.shape
+            np.testing.assert_array_equal(mongo_matrix, memory_matrix)
+
+            assert await mongo.count(filters) == await memory.count(filters) == len(memory_ids)
+            assert [d.id for d in await mongo.find(filters, 25)] == [d.id for d in await memory.find(filters, 25)]
+
+    _compare(destination_service, check)
+
+
+def test_mongo_matches_memory_for_lookups(destination_service):
+    ids = [destination.id for destination in destination_service.destinations[:5]]
+
+    async def check(memory, mongo):
+        assert await mongo.get_by_id(ids[0]) == await memory.get_by_id(ids[0])
+        assert await mongo.get_by_id("unknown") is None
+
+        request = [ids[3], "unknown", ids[0], ids[4]]
+        assert await mongo.get_many(request) == await memory.get_many(request)
+        assert [d.id for d in await mongo.get_many(request)] == [ids[3], ids[0], ids[4]]
+
+    _compare(destination_service, check)
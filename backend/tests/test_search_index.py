@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from app.services.search_index import (
+    EXACT_MATCH, INFIX_MATCH, NGRAM_SIZE, PREFIX_MATCH, SEARCH_FIELDS, SearchIndex, tokenize
+)
+
+
+def _scan(destinations, query):
+    """
+    Reference semantics: a substring scan over every searchable word.
+
+    A row matches when each query term occurs inside some word of its
+    searchable fields (terms shorter than the n-gram size only as a prefix),
+    and scores the best field weight times match quality summed over terms.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return [], []
+    results = []
+    for row, destination in enumerate(destinations):
+        total = 0.0
+        for term in terms:
+            best = 0.0
+            for field, weight in SEARCH_FIELDS.items():
+                for token in tokenize(getattr(destination, field)):
+                    if token == term:
+                        quality = EXACT_MATCH
+                    elif token.startswith(term):
+                        quality = PREFIX_MATCH
+                    elif len(term) >= NGRAM_SIZE and term in token:
+                        quality = INFIX_MATCH
+                    else:
+                        continue
+                    best = max(best, weight * quality)
+            if best == 0.0:
+                break
+            total += best
+        else:
+            results.append((-total, row))
+    results.sort()
+    return [row for _, row in results], [-score for score, _ in results]
+
+
+@pytest.fixture(scope="module")
+def index(destinations):
+    return SearchIndex.from_destinations(destinations)
+
+
+def _queries(destinations):
+    name, country = destinations[0].name, destinations[1].country
+    country_word = tokenize(country)[0]
+    return [
+        name,                           # exact word
+        name.upper(),                   # case
+        name[:3].lower(),               # prefix
+        name[1:4],                      # infix
+        name[0],                        # single-character prefix
+        country,                        # multi-token
+        f"{country_word} destination",  # words across fields
+        f"{name[:2]} {country_word[1:4].upper()}",
+        "urban urban",                  # repeated term
+        "sunny urban",
+        "to",
+        "ear",
+        "zzqx",                         # no match
+        "  ,;  ",                       # no terms
+    ]
+
+
+def test_search_matches_substring_scan(destinations, index):
+    for query in _queries(destinations):
+        expected_rows, expected_scores = _scan(destinations, query)
+        rows, scores = index.search(query)
+        assert rows.tolist() == expected_rows, query
+        np.testing.assert_allclose(scores, expected_scores, err_msg=query)
+
+
+def test_search_limit_keeps_the_most_relevant(destinations, index):
+    for query in _queries(destinations):
+        rows, scores = index.search(query)
+        limited_rows, limited_scores = index.search(query, 5)
+        assert limited_rows.tolist() == rows[:5].tolist()
+        assert limited_scores.tolist() == scores[:5].tolist()
+
+
+def test_empty_index():
+    rows, scores = SearchIndex.from_destinations([]).search("paris")
+    assert rows.tolist() == [] and scores.tolist() == []
@@ -0,0 +1,72 @@
+import asyncio
+import numpy as np
+import pytest
+from app.api.routes.topsis import _rank_candidates
+from app.core.config import settings
+from app.models.destination import RecommendationRequest, TOPSISWeights, UserFilters
+from app.services.mcdm_engines import get_engine
+from app.services.scoring_executor import ScoringExecutor, ScoringQueueFullError
+from app.services.sharded_ranking import ShardedRanker
+from app.services.topsis_service import TOPSISService
+
+
+@pytest.fixture(scope="module")
+def sharded_ranker():
+    ranker = ShardedRanker(workers=3)
+    yield ranker
+    ranker.shutdown()
+
+
+@pytest.mark.parametrize("filters, k, weights", [
+    (UserFilters(), 20, None),
+    (UserFilters(), 2000, None),
+    (UserFilters(continents=["asia", "europe"]), 50, TOPSISWeights(popularity_score=0.7, safety_score=0.4).model_dump()),
+    (UserFilters(budget_ranges=["low"], activities=["beach"]), 5, None),
+    (UserFilters(min_popularity=5.0, max_popularity=5.0), 10, None),
+])
+def test_sharded_matches_single_process(catalog, sharded_ranker, filters, k, weights):
+    candidate_rows = catalog.filter_indices(filters)
+    expected_rows, expected_scores = TOPSISService().rank_top_k(
+        catalog.decision_matrix[candidate_rows], k, weights
+    )
+
+    rows, scores = asyncio.run(sharded_ranker.rank_top_k(catalog, candidate_rows, k, weights))
+
+    assert rows.tolist() == expected_rows.tolist()
+    np.testing.assert_allclose(scores, expected_scores, rtol=1e-12, atol=1e-12)
+
+
+def test_sharded_with_fewer_candidates_than_workers(catalog, sharded_ranker):
+    candidate_rows = catalog.filter_indices(UserFilters())[:2]
+    expected_rows, _ = TOPSISService().rank_top_k(catalog.decision_matrix[candidate_rows], 5)
+    rows, _ = asyncio.run(sharded_ranker.rank_top_k(catalog, candidate_rows, 5))
+    assert rows.tolist() == expected_rows.tolist()
+
+
+def test_sharded_with_no_candidates(catalog, sharded_ranker):
+    rows, scores = asyncio.run(sharded_ranker.rank_top_k(catalog, np.empty(0, dtype=np.intp), 5))
+    assert rows.tolist() == [] and scores.tolist() == []
+
+
+def test_sharded_rankings_go_through_admission_control(catalog, sharded_ranker, monkeypatch):
+    monkeypatch.setattr(settings, "SHARDED_RANKING_MIN_ROWS", 1)
+    request = RecommendationRequest(filters=UserFilters(), max_results=10)
+
+    async def rank_concurrently():
+        executor = ScoringExecutor("thread", max_workers=1, max_queue=1)
+        try:
+            results = await asyncio.gather(*[
+                _rank_candidates(request, catalog, get_engine("topsis"), executor, sharded_ranker)
+                for _ in range(3)
+            ], return_exceptions=True)
+            return results, executor.stats()
+        finally:
+            executor.shutdown()
+
+    results, stats = asyncio.run(rank_concurrently())
+
+    # One ranking runs, one waits for the slot and the third is turned away
+    assert [type(result) for result in results[:2]] == [tuple, tuple]
+    assert isinstance(results[2], ScoringQueueFullError)
+    assert results[0][0].tolist() == results[1][0].tolist()
+    assert stats["completed"] == 2 and stats["rejected"] == 1 and stats["peak_queued"] == 1
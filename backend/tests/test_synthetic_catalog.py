@@ -0,0 +1,17 @@
+from app.utils.synthetic_catalog import GENERATION_CHUNK_SIZE, IMAGE_COUNT_WEIGHTS, generate_records
+
+
+def test_same_seed_gives_same_records():
+    count = GENERATION_CHUNK_SIZE + 10
+    records = list(generate_records(count, 3))
+    assert records == list(generate_records(count, 3))
+    assert records[:25] == list(generate_records(25, 3))
+    assert records != list(generate_records(count, 4))
+
+
+def test_records_carry_images_and_their_own_weather(destinations):
+    image_counts = {len(destination.images) for destination in destinations}
+    assert image_counts == set(IMAGE_COUNT_WEIGHTS)
+    assert all(url.startswith("https://") for destination in destinations for url in destination.images)
+    assert any(destination.weather_type != destination.climate.value for destination in destinations)
+    assert len({destination.weather_type for destination in destinations}) > len({d.climate for d in destinations})
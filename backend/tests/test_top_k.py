@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from app.services.topsis_service import TOPSISService
+
+
+def _full_sort(scores: np.ndarray, k: int) -> list:
+    """Reference: stable descending sort, truncated to k."""
+    return np.argsort(-scores, kind="stable")[:max(k, 0)].tolist()
+
+
+@pytest.mark.parametrize("k", [0, 1, 2, 7, 50, 999, 1000, 1500])
+def test_select_top_k_matches_stable_sort_with_ties(k):
+    # Few distinct values, so most selections cut through a run of ties
+    scores = np.random.default_rng(k).integers(0, 20, size=1000).astype(np.float64)
+    assert TOPSISService().select_top_k(scores, k).tolist() == _full_sort(scores, k)
+
+
+def test_select_top_k_matches_stable_sort_on_random_inputs():
+    topsis_service = TOPSISService()
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        size = int(rng.integers(1, 300))
+        scores = np.round(rng.random(size), int(rng.integers(1, 4)))
+        k = int(rng.integers(0, size + 5))
+        assert topsis_service.select_top_k(scores, k).tolist() == _full_sort(scores, k)
+
+
+def test_select_top_k_with_nan_scores():
+    scores = np.array([0.5, np.nan, 0.9, 0.5, np.nan, 0.1])
+    for k in range(len(scores) + 1):
+        assert TOPSISService().select_top_k(scores, k).tolist() == _full_sort(scores, k)
+
+
+def test_select_top_k_of_no_scores():
+    assert TOPSISService().select_top_k(np.empty(0), 5).tolist() == []
+
+
+@pytest.mark.parametrize("k", [1, 10, 100, 2000])
+def test_rank_top_k_is_a_prefix_of_the_full_ranking(catalog, k):
+    topsis_service = TOPSISService()
+    full = topsis_service.rank_matrix(catalog.decision_matrix)
+    rows, scores = topsis_service.rank_top_k(catalog.decision_matrix, k)
+
+    assert rows.tolist() == [row for row, _ in full[:k]]
+    np.testing.assert_array_equal(scores, [score for _, score in full[:k]])